@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+异步抓取引擎
+基于 asyncio 调度请求，每个主机使用独立的有界连接池并复用 keep-alive 连接，
+配置了HTTP缓存时发送条件请求
+"""
+
+import asyncio
+import threading
+import weakref
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+class AsyncFetcher:
+    """异步抓取器
+
+    请求在线程池中通过 requests 发送，asyncio 负责调度；同一主机的并发请求数
+    由信号量和连接池大小共同限制，不同主机之间互不阻塞。
+    线程池和连接池在第一次请求时创建，close() 释放后再次请求时重新创建。
+    """
+
+    def __init__(self, headers=None, per_host_limit: int = 4, timeout: float = 10,
+                 max_workers: int = 16, rate_limiter=None, http_cache=None):
+        # 直接引用调用方的请求头，便于爬虫运行中更换 User-Agent
+        self.headers = headers if headers is not None else {}
+        self.per_host_limit = max(1, per_host_limit)
+        self.timeout = timeout
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+        self.http_cache = http_cache
+        self.logger = logging.getLogger('crawler.fetcher')
+
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # 信号量绑定在事件循环上，每个循环单独维护一份
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        """提取URL中的主机名"""
+        return urlsplit(url).netloc.lower()
+
+    def session_for(self, host: str) -> requests.Session:
+        """获取主机对应的会话，连接池大小与主机并发上限一致"""
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.per_host_limit,
+                                      pool_block=True)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+            return session
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='fetch')
+            return self._executor
+
+    def _semaphore_for(self, host: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphores = self._semaphores.setdefault(loop, {})
+        if host not in semaphores:
+            semaphores[host] = asyncio.Semaphore(self.per_host_limit)
+        return semaphores[host]
+
+    def _send(self, url: str, headers: Dict = None, **kwargs) -> requests.Response:
+        merged_headers = dict(self.headers)
+        if headers:
+            merged_headers.update(headers)
+        if self.http_cache:
+            merged_headers.update(self.http_cache.conditional_headers(url))
+        kwargs.setdefault('timeout', self.timeout)
+
+        response = self.session_for(self.host_of(url)).get(url, headers=merged_headers, **kwargs)
+
+        if self.http_cache:
+            if response.status_code == 304:
+                return self.http_cache.revalidated(url, response) or response
+            if response.status_code == 200:
+                self.http_cache.store(url, response)
+        return response
+
+    def _fresh(self, url: str):
+        return self.http_cache.get_fresh(url) if self.http_cache else None
+
+    def fetch_sync(self, url: str, headers: Dict = None, revalidate: bool = False,
+                   **kwargs) -> requests.Response:
+        """同步发送请求，复用主机连接池；revalidate 为真时不使用有效期内的缓存，总是发送条件请求"""
+        fresh = None if revalidate else self._fresh(url)
+        if fresh:
+            return fresh
+        if self.rate_limiter:
+            self.rate_limiter.acquire(url)
+        return self._send(url, headers, **kwargs)
+
+    async def fetch(self, url: str, headers: Dict = None, revalidate: bool = False,
+                    **kwargs) -> requests.Response:
+        """异步发送请求
+
+        缓存仍有效时直接返回（revalidate 为真时除外）；否则占用主机并发名额后再向限速器申请令牌，
+        等待期间不阻塞其他主机的请求。
+        """
+        fresh = None if revalidate else self._fresh(url)
+        if fresh:
+            return fresh
+        async with self._semaphore_for(self.host_of(url)):
+            if self.rate_limiter:
+                await self.rate_limiter.acquire_async(url)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._get_executor(), partial(self._send, url, headers, **kwargs)
+            )
+
+    def close(self):
+        """关闭所有连接池和线程池"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+        if executor is not None:
+            executor.shutdown(wait=True)
@@ -5,16 +5,32 @@
 提供通用的爬虫功能和数据结构
 """
 
+import sys
 import json
 import time
 import random
+import asyncio
+import threading
 import requests
-from datetime import datetime
-from typing import List, Dict, Any
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional
 from abc import ABC, abstractmethod
+from functools import partial
 import logging
 from pathlib import Path
 
+from async_fetcher import AsyncFetcher
+from crawler_config import config
+from rate_limiter import get_rate_limiter
+from http_cache import get_http_cache
+from checkpoints import get_checkpoint_store
+from id_generator import next_job_id
+from job_store import JobStore
+from keyword_classifier import JOB_TYPE_CLASSIFIER, DIRECTION_CLASSIFIER
+from extractors import extract_post_fields, clean_matches
+from company_gazetteer import COMPANY_GAZETTEER
+from parse_pool import get_parse_pool, in_worker
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -25,18 +41,41 @@ logging.basicConfig(
     ]
 )
 
+_today_cache = ('', 0.0)
+
+def today() -> str:
+    """今天的日期字符串，跨过零点前重复使用同一个字符串对象"""
+    global _today_cache
+    date, expires_at = _today_cache
+    now = time.time()
+    if now >= expires_at:
+        current = datetime.now()
+        midnight = (current + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        date = current.strftime('%Y-%m-%d')
+        _today_cache = (date, midnight.timestamp())
+    return date
+
 class JobData:
-    """职位数据结构"""
+    """职位数据结构
+    
+    使用 __slots__ 省去每个实例的 __dict__；公司、类型、方向、来源的取值很少，
+    驻留后所有职位共用同一个字符串对象。
+    """
+    
+    __slots__ = ('id', 'title', 'company', 'type', 'direction', 'source',
+                 'code', 'date', 'description', 'requirements')
+    
     def __init__(self, title: str, company: str, job_type: str, direction: str, 
                  source: str, code: str, description: str = "", requirements: List[str] = None):
-        self.id = int(time.time() * 1000) + random.randint(1000, 9999)  # 生成唯一ID
+        # 按生成顺序递增的唯一ID；解析进程中不生成，由主进程在 decode_parsed 中分配
+        self.id = None if in_worker() else next_job_id()
         self.title = title
-        self.company = company
-        self.type = job_type  # 校招/社招/实习
-        self.direction = direction  # 前端/后端/算法/数据/产品/测试
-        self.source = source  # 牛客/力扣/小红书/脉脉
+        self.company = sys.intern(company)
+        self.type = sys.intern(job_type)  # 校招/社招/实习
+        self.direction = sys.intern(direction)  # 前端/后端/算法/数据/产品/测试
+        self.source = sys.intern(source)  # 牛客/力扣/小红书/脉脉
         self.code = code  # 内推码
-        self.date = datetime.now().strftime('%Y-%m-%d')
+        self.date = today()
         self.description = description
         self.requirements = requirements or []
         
@@ -54,16 +93,84 @@ class JobData:
             'description': self.description,
             'requirements': self.requirements
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'JobData':
+        """从 to_dict 的结果还原，保留原有的ID和日期，没有ID时生成新的"""
+        job = cls.__new__(cls)
+        job.id = data.get('id') or next_job_id()
+        job.title = data.get('title', '')
+        job.company = sys.intern(data.get('company', ''))
+        job.type = sys.intern(data.get('type', ''))
+        job.direction = sys.intern(data.get('direction', ''))
+        job.source = sys.intern(data.get('source', ''))
+        job.code = data.get('code', '')
+        job.date = data.get('date') or today()
+        job.description = data.get('description', '')
+        job.requirements = list(data.get('requirements') or [])
+        return job
+
+def encode_parsed(value):
+    """把解析结果中的 JobData 转换为字典，以便在进程间传递，字典中不带ID"""
+    if isinstance(value, JobData):
+        data = value.to_dict()
+        del data['id']
+        return data
+    if isinstance(value, (list, tuple)):
+        return type(value)(encode_parsed(item) for item in value)
+    return value
+
+def decode_parsed(value):
+    """encode_parsed 的逆操作，解析结果中的字典一律还原为 JobData，并按结果顺序分配ID"""
+    if isinstance(value, dict):
+        return JobData.from_dict(value)
+    if isinstance(value, (list, tuple)):
+        return type(value)(decode_parsed(item) for item in value)
+    return value
+
+# 解析进程中各爬虫类只用于解析的实例
+_parsers: Dict[type, 'BaseCrawler'] = {}
 
 class BaseCrawler(ABC):
     """基础爬虫抽象类"""
     
+    # 对应 crawler_config.py 中 platforms 下的配置键
+    platform_key = None
+    
     def __init__(self, name: str):
         self.name = name
         self.logger = logging.getLogger(f'crawler.{name}')
         self.session = requests.Session()
         self.setup_session()
         
+        # 按域名限速和HTTP缓存，所有爬虫共享
+        self.rate_limiter = get_rate_limiter()
+        self.http_cache = get_http_cache()
+        
+        # 增量爬取检查点（高水位和翻页进度）
+        self.checkpoints = get_checkpoint_store()
+        
+        # 调度器设置的本次运行截止时间，超过后不再开始新的抓取单元
+        self.deadline = None
+        
+        # 异步抓取引擎，与 session 共享请求头
+        self.max_connections = max(1, self.platform_config('max_connections', 2))
+        self.fetcher = AsyncFetcher(headers=self.session.headers, per_host_limit=self.max_connections,
+                                    rate_limiter=self.rate_limiter, http_cache=self.http_cache)
+        
+        # 数据文件名 -> 追加写入存储，打开存储要读取整个内推码索引，每个文件只打开一次
+        self._stores: Dict[str, JobStore] = {}
+        self._stores_lock = threading.Lock()
+        
+        # 本次爬取登记的检查点更新，职位保存后才提交
+        self._pending_progress: List[Callable[[], None]] = []
+    
+    def platform_config(self, key: str, default=None):
+        """读取当前平台的配置项"""
+        if not self.platform_key:
+            return default
+        return config.get(f'platforms.{self.platform_key}.{key}', default)
+        
     def setup_session(self):
         """设置请求会话"""
         self.session.headers.update({
@@ -80,109 +187,199 @@ class BaseCrawler(ABC):
         delay = random.uniform(min_seconds, max_seconds)
         time.sleep(delay)
     
+    @property
+    def out_of_time(self) -> bool:
+        """是否已超过调度器设置的最长运行时间"""
+        return self.deadline is not None and time.time() >= self.deadline
+    
+    def fetch(self, url: str, **kwargs) -> requests.Response:
+        """同步获取页面，复用按主机划分的连接池，经过限速和HTTP缓存"""
+        return self.fetcher.fetch_sync(url, **kwargs)
+    
+    async def fetch_async(self, url: str, **kwargs) -> requests.Response:
+        """异步获取页面"""
+        return await self.fetcher.fetch(url, **kwargs)
+    
+    def crawl_units(self, units: Iterable, handler: Callable[[Any], List[JobData]],
+                    label: str) -> List[JobData]:
+        """并发处理页面/话题/关键词等抓取单元，结果按单元顺序合并，同时处理的单元数不超过 max_connections"""
+        return asyncio.run(self._gather_units(list(units), handler, label))
+    
+    async def _gather_units(self, units: List, handler: Callable[[Any], List[JobData]],
+                            label: str) -> List[JobData]:
+        semaphore = asyncio.Semaphore(self.max_connections)
+        
+        async def run_unit(unit):
+            async with semaphore:
+                if self.out_of_time:
+                    self.logger.warning(f'超过最长运行时间，跳过{label}: {unit}')
+                    return []
+                try:
+                    # 单元本身不占用限速令牌，处理函数通过 fetch/fetch_async 真正发送请求时才按域名限速，
+                    # 不发请求的单元不会消耗同域名其他爬虫的请求额度
+                    self.logger.info(f'{label}: {unit}')
+                    return await asyncio.to_thread(handler, unit)
+                except Exception as e:
+                    self.logger.error(f'{label} {unit} 失败: {e}')
+                    return []
+        
+        results = await asyncio.gather(*(run_unit(unit) for unit in units))
+        return [job for unit_jobs in results for job in unit_jobs]
+    
+    @classmethod
+    def parser(cls) -> 'BaseCrawler':
+        """当前进程中只用于解析的实例，不建立会话、限速和抓取引擎，只能调用解析方法"""
+        crawler = _parsers.get(cls)
+        if crawler is None:
+            crawler = cls.__new__(cls)
+            crawler.name = cls.platform_key or cls.__name__
+            crawler.logger = logging.getLogger(f'crawler.{crawler.name}')
+            _parsers[cls] = crawler
+        return crawler
+    
+    def parse_each(self, method: str, payloads: List, label: str) -> List:
+        """用解析方法逐个解析原始数据，失败的记录日志并返回 None"""
+        parse = getattr(self, method)
+        results = []
+        for payload in payloads:
+            try:
+                results.append(parse(payload))
+            except Exception as e:
+                self.logger.error(f'{label}: {e}')
+                results.append(None)
+        return results
+    
+    @classmethod
+    def parse_chunk(cls, method: str, label: str, payloads: List) -> List:
+        """在解析进程中执行的任务，职位以字典形式返回"""
+        return encode_parsed(cls.parser().parse_each(method, payloads, label))
+    
+    def parse_payloads(self, method: str, payloads: Iterable, label: str) -> List:
+        """解析一批原始帖子/页面，结果与输入一一对应，失败的为 None
+        
+        配置了 parsing.workers 时分块交给解析进程池，否则在当前线程解析。
+        """
+        payloads = list(payloads)
+        pool = get_parse_pool()
+        if not pool.enabled:
+            return self.parse_each(method, payloads, label)
+        
+        results = pool.map(partial(type(self).parse_chunk, method, label), payloads,
+                           fallback=partial(self.parse_each, method, label=label))
+        return decode_parsed(results)
+    
+    async def parse_payloads_async(self, method: str, payloads: Iterable, label: str) -> List:
+        """parse_payloads 的异步版本，解析期间事件循环继续处理其他请求"""
+        payloads = list(payloads)
+        pool = get_parse_pool()
+        if not pool.enabled:
+            return await asyncio.to_thread(self.parse_each, method, payloads, label)
+        
+        results = await pool.map_async(partial(type(self).parse_chunk, method, label), payloads,
+                                       fallback=partial(self.parse_each, method, label=label))
+        return decode_parsed(results)
+    
     @abstractmethod
     def crawl(self) -> List[JobData]:
         """爬取数据的抽象方法，子类必须实现"""
         pass
     
-    def save_data(self, jobs: List[JobData], filename: str = None):
-        """保存数据到JSON文件"""
+    def backfill(self, since: str, until: Optional[str], sink: Callable[[List[JobData]], None]):
+        """回填 [since, until] 日期范围内的历史职位，每抓完一页调用一次 sink 写入（可以为空列表）
+        
+        until 为 None 时不限结束日期。支持深度翻页的平台覆盖此方法；默认只运行一次 crawl，保留日期在范围内的职位。
+        """
+        sink([job for job in self.crawl() if since <= job.date and (until is None or job.date <= until)])
+    
+    def get_store(self, filename: str = None) -> JobStore:
+        """获取数据文件对应的追加写入存储，首次使用时导入同名的旧版JSON文件"""
         if not filename:
             filename = f'{self.name}_jobs_{datetime.now().strftime("%Y%m%d")}.json'
         
+        with self._stores_lock:
+            store = self._stores.get(filename)
+            # 清理旧数据时存储目录可能已被删除，此时重新打开
+            if store is None or not store.store_dir.exists():
+                store = self._stores[filename] = self._open_store(filename)
+            return store
+    
+    def _open_store(self, filename: str) -> JobStore:
         # 确保目录存在
         data_dir = Path('data')
-        data_dir.mkdir(exist_ok=True)
-        
-        filepath = data_dir / filename
-        
-        # 转换为字典列表
-        jobs_dict = [job.to_dict() for job in jobs]
+        store_dir = data_dir / 'store' / Path(filename).stem
+        is_new = not store_dir.exists()
+        store = JobStore(store_dir)
         
-        # 如果文件已存在，则追加数据（去重）
-        existing_jobs = []
-        if filepath.exists():
+        legacy_file = data_dir / filename
+        if is_new and legacy_file.exists():
             try:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    existing_jobs = json.load(f)
+                count = store.import_json(legacy_file)
+                self.logger.info(f'已从 {legacy_file} 导入 {count} 个职位')
             except Exception as e:
                 self.logger.warning(f'读取现有数据失败: {e}')
         
-        # 合并数据并去重（基于内推码）
-        existing_codes = {job.get('code', '') for job in existing_jobs}
-        new_jobs = [job for job in jobs_dict if job['code'] not in existing_codes]
+        return store
+    
+    def save_data(self, jobs: List[JobData], filename: str = None):
+        """追加保存数据（基于内推码去重），开销只与新职位数量有关"""
+        store = self.get_store(filename)
+        new_jobs = store.append(job.to_dict() for job in jobs)
+        
+        # 分段只增不减，超过上限时合并，读取时不用打开大量小文件
+        if store.segment_count > config.get('output.store_max_segments', 8):
+            store.compact()
         
         if new_jobs:
-            all_jobs = existing_jobs + new_jobs
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(all_jobs, f, ensure_ascii=False, indent=2)
-            
-            self.logger.info(f'保存了 {len(new_jobs)} 个新职位到 {filepath}')
+            self.logger.info(f'保存了 {len(new_jobs)} 个新职位到 {store.store_dir}')
         else:
             self.logger.info('没有新职位需要保存')
         
         return len(new_jobs)
     
-    def load_existing_data(self, filename: str = None) -> List[Dict]:
-        """加载现有数据"""
-        if not filename:
-            filename = f'{self.name}_jobs_{datetime.now().strftime("%Y%m%d")}.json'
-        
-        filepath = Path('data') / filename
-        
-        if not filepath.exists():
-            return []
-        
+    def iter_existing_data(self, filename: str = None) -> Iterator[Dict]:
+        """逐条读取现有数据"""
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            yield from self.get_store(filename).iter_jobs()
         except Exception as e:
             self.logger.error(f'加载数据失败: {e}')
-            return []
+    
+    def load_existing_data(self, filename: str = None) -> List[Dict]:
+        """加载现有数据"""
+        return list(self.iter_existing_data(filename))
     
     def extract_job_type(self, text: str) -> str:
         """从文本中提取职位类型"""
-        text = text.lower()
-        if any(word in text for word in ['校招', '秋招', '春招', '校园招聘', '应届']):
-            return '校招'
-        elif any(word in text for word in ['实习', '暑期', '寒假']):
-            return '实习'
-        else:
-            return '社招'
+        return JOB_TYPE_CLASSIFIER.classify(text)
     
     def extract_direction(self, title: str, description: str = "") -> str:
         """从职位标题和描述中提取技术方向"""
-        text = (title + " " + description).lower()
-        
-        if any(word in text for word in ['前端', 'frontend', 'react', 'vue', 'angular', 'javascript', 'html', 'css']):
-            return '前端'
-        elif any(word in text for word in ['后端', 'backend', 'java', 'python', 'go', 'node.js', 'spring', 'django']):
-            return '后端'
-        elif any(word in text for word in ['算法', 'algorithm', '机器学习', 'ai', '深度学习', 'nlp', 'cv']):
-            return '算法'
-        elif any(word in text for word in ['数据', 'data', '分析师', 'bi', 'sql', '数据库']):
-            return '数据'
-        elif any(word in text for word in ['产品', 'product', '产品经理', 'pm']):
-            return '产品'
-        elif any(word in text for word in ['测试', 'test', 'qa', '质量']):
-            return '测试'
-        else:
-            return '其他'
+        return DIRECTION_CLASSIFIER.classify(title + " " + description)
+    
+    def extract_requirements(self, content: str) -> List[str]:
+        """从内容中提取职位要求，各平台可按自己的格式覆盖"""
+        return self.requirements_from_fields(extract_post_fields(
+            content, ('requirements', 'experience', 'familiar', 'degrees')
+        ))
+    
+    def requirements_from_fields(self, fields: Dict) -> List[str]:
+        """把 extract_post_fields 的结果整理成职位要求"""
+        requirements = clean_matches(
+            fields['requirements'] + fields['experience'] + fields['familiar'], 3
+        )
+        
+        if '硕士' in fields['degrees']:
+            requirements.append('硕士及以上学历')
+        elif '本科' in fields['degrees']:
+            requirements.append('本科及以上学历')
+        
+        if not requirements:
+            requirements = ['相关专业背景', '良好的编程能力', '团队协作精神']
+        
+        return requirements[:5]
     
     def generate_referral_code(self, company: str, job_type: str) -> str:
         """生成内推码（模拟）"""
-        company_code = {
-            '字节跳动': 'TT',
-            '腾讯': 'TX', 
-            '阿里巴巴': 'AL',
-            '百度': 'BD',
-            '美团': 'MT',
-            '网易': 'WY',
-            '滴滴': 'DD',
-            '快手': 'KS',
-            '小红书': 'XHS',
-            '蚂蚁集团': 'ANT'
-        }.get(company, 'XX')
+        company_code = COMPANY_GAZETTEER.code_of(company)
         
         year = datetime.now().year
         sequence = random.randint(1000, 9999)
@@ -194,9 +391,12 @@ class BaseCrawler(ABC):
         self.logger.info(f'开始爬取 {self.name} 数据...')
         start_time = time.time()
         
+        self._pending_progress = []
         try:
             jobs = self.crawl()
             count = self.save_data(jobs)
+            # 职位保存后才推进检查点，爬取与保存之间崩溃或保存失败时，这些页面下次重新爬取
+            self.commit_progress()
             
             end_time = time.time()
             duration = end_time - start_time
@@ -207,3 +407,20 @@ class BaseCrawler(ABC):
         except Exception as e:
             self.logger.error(f'{self.name} 爬取失败: {e}')
             raise
+        finally:
+            self._pending_progress = []
+            self.close()
+    
+    def defer_progress(self, commit: Callable[[], None]):
+        """登记一次检查点更新，由 run() 在职位保存后统一提交"""
+        self._pending_progress.append(commit)
+    
+    def commit_progress(self):
+        """按登记顺序提交检查点更新"""
+        pending, self._pending_progress = self._pending_progress, []
+        for commit in pending:
+            commit()
+    
+    def close(self):
+        """释放抓取线程池和连接池，下次抓取时重新创建"""
+        self.fetcher.close()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+近似去重性能
+生成一批职位，其中一部分是换了平台、改了标点和措辞的转发，
+统计 MinHash + LSH 去重的耗时、合并数量和误合并数量；
+另外用 RealDataCrawler 的示例数据模板检查同一模板生成的不同职位不会被合并
+
+用法: python benchmarks/dedup_benchmark.py [职位数量]
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from company_gazetteer import COMPANIES
+from dedup import JobDeduplicator
+from real_data_crawler import RealDataCrawler
+
+DIRECTIONS = ['后端', '前端', '算法', '数据', '测试', '客户端', '运维', '安全']
+SKILLS = ['Java', 'Go', 'Python', 'C++', 'React', 'Vue', 'MySQL', 'Redis', 'Kafka',
+          'Spark', 'Flink', 'PyTorch', 'Kubernetes', '分布式', '高并发', '微服务']
+SOURCES = ['牛客', '力扣', '小红书', '脉脉']
+CITIES = ['北京', '上海', '深圳', '杭州', '广州', '成都', '南京', '武汉']
+DUTIES = [
+    '负责核心业务系统的设计与开发', '参与推荐系统的架构优化', '负责海量数据的存储与计算平台建设',
+    '参与广告投放引擎的迭代', '负责搜索服务的性能调优', '参与直播业务的客户端研发',
+    '负责风控模型的训练与上线', '参与支付链路的稳定性保障', '负责内部工具平台的建设',
+    '参与电商交易系统的重构', '负责视频编解码相关研发', '参与大模型推理服务的落地',
+    '负责自动化测试框架的建设', '参与云原生基础设施的演进', '负责用户增长相关的数据分析',
+    '参与地图导航算法的研发', '负责即时通讯服务端开发', '参与游戏引擎的工具链开发',
+]
+BONUSES = [
+    '有开源项目贡献者优先', '有大规模线上系统经验优先', '有ACM竞赛经历优先', '英语读写流利',
+    '对技术有热情，学习能力强', '良好的沟通能力和团队合作精神', '有相关实习经历优先',
+    '熟悉Linux常用命令', '有顶会论文发表者优先', '了解常见设计模式', '能承受一定的工作压力',
+]
+
+def make_job(index: int) -> dict:
+    company = random.choice(COMPANIES)[0]
+    direction = random.choice(DIRECTIONS)
+    job_type = random.choice(['校招', '社招', '实习'])
+    skills = '、'.join(random.sample(SKILLS, 3))
+    duties = '；'.join(random.sample(DUTIES, 2))
+    bonuses = '；'.join(random.sample(BONUSES, 2))
+    return {
+        'id': index,
+        'title': f'{company}{job_type}内推 {direction}开发工程师',
+        'company': company,
+        'type': job_type,
+        'direction': direction,
+        'source': random.choice(SOURCES),
+        'code': f'C{index}',
+        'description': f'岗位职责：{duties}。任职要求：熟悉{skills}，'
+                       f'{random.randint(1, 5)}年以上相关开发经验，{bonuses}。'
+                       f'工作地点：{random.choice(CITIES)}。',
+    }
+
+def repost(job: dict, index: int) -> dict:
+    """同一职位换一个平台转发：标点、空格和少量措辞不同"""
+    copy = dict(job, id=index, code=f'C{index}', source=random.choice(SOURCES), origin=job['id'])
+    copy['title'] = '【' + job['title'].replace(' ', '') + '】'
+    copy['description'] = (job['description'].replace('，', ', ').replace('。', ' ')
+                           .replace('岗位职责', '工作内容') + '欢迎投递，简历直推')
+    return copy
+
+def check_sample_templates() -> bool:
+    """示例数据只在公司、标题、类型和方向完全相同时才允许合并，被合并职位的内推码保留在 codes 中"""
+    crawler = RealDataCrawler.parser()
+    jobs = [job.to_dict() for job in crawler.generate_enhanced_sample_data()]
+    deduplicator = JobDeduplicator()
+    kept = {job['id']: job for job in deduplicator.filter(jobs)}
+
+    def identity(job):
+        return job['company'], job['title'], job['type'], job['direction']
+
+    # 每个职位都应当保留下来，或者它的内推码记在一个完全相同的保留职位上
+    wrong = [job for job in jobs if not any(
+        identity(kept_job) == identity(job) and job['code'] in deduplicator.codes[kept_job['id']]
+        for kept_job in kept.values()
+    )]
+    expected = len({identity(job) for job in jobs})
+    print(f'示例数据: {len(jobs)} 个，保留 {len(kept)} 个，应保留 {expected} 个，'
+          f'误合并或丢失内推码 {len(wrong)} 个')
+    return not wrong and len(kept) == expected
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    random.seed(0)
+    originals = [make_job(i) for i in range(int(count * 0.8))]
+    jobs = originals + [repost(random.choice(originals), i) for i in range(len(originals), count)]
+    random.shuffle(jobs)
+    reposts = count - len(originals)
+
+    deduplicator = JobDeduplicator()
+    start = time.perf_counter()
+    kept = list(deduplicator.filter(jobs))
+    elapsed = time.perf_counter() - start
+
+    # 每个原始职位的全部转发应当只保留一条
+    kept_origins = {}
+    for job in kept:
+        origin = job.get('origin', job['id'])
+        kept_origins[origin] = kept_origins.get(origin, 0) + 1
+    missed = sum(count - 1 for count in kept_origins.values())
+    wrongly_merged = len(originals) - len(kept_origins)
+
+    print(f'职位数量: {count}, 其中转发 {reposts}')
+    print(f'耗时 {elapsed:.2f} s ({elapsed / count * 1e6:.1f} µs/个)')
+    print(f'合并 {deduplicator.merged} 个，保留 {len(kept)} 个，应保留 {len(originals)} 个')
+    print(f'漏合并的转发 {missed} 个，被误合并的不同职位 {wrongly_merged} 个')
+    buckets = [len(keys) for band in deduplicator.index.buckets for keys in band.values()]
+    print(f'LSH 桶数 {len(buckets)}，最大桶 {max(buckets)}，平均每桶 {sum(buckets) / len(buckets):.2f}')
+
+    if not check_sample_templates():
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+字段提取性能对比
+旧实现：每个帖子按规则列表逐条 re.findall / 关键词 in 检查
+新实现：extractors 中预编译的规则，按需提取字段，字面文字不存在时跳过正则
+
+用法: python benchmarks/extractors_benchmark.py [帖子数量]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from extractors import extract_referral_code
+from nowcoder_crawler import NowcoderCrawler
+from xiaohongshu_crawler import XiaohongshuCrawler
+from leetcode_crawler import LeetcodeCrawler
+
+SAMPLE_POSTS = [
+    '字节跳动2025校招内推！后端开发工程师，任职要求：熟悉Java/Go，3年以上分布式系统开发经验。'
+    '本科及以上学历，有高并发项目经验优先。内推码：TT2025001',
+    '腾讯实习生招聘，前端方向，熟悉React、Vue和TypeScript，有移动端项目经验。推荐码: TXINTERN88',
+    '美团算法岗，硕士优先，深度学习/机器学习基础扎实，熟悉Python和C++，有推荐系统经验。',
+    '阿里巴巴数据分析师，要求：熟练使用SQL和MySQL，Redis加分，良好的沟通能力和产品思维。',
+    '快手社招测试开发，自动化测试经验，2年以上测试经验，code: KS20250301',
+]
+
+def legacy_referral_code(content):
+    patterns = [
+        r'内推码[：:]?\s*([A-Za-z0-9]{6,20})',
+        r'推荐码[：:]?\s*([A-Za-z0-9]{6,20})',
+        r'邀请码[：:]?\s*([A-Za-z0-9]{6,20})',
+        r'code[：:]?\s*([A-Za-z0-9]{6,20})',
+        r'([A-Z]{2,4}\d{4,8})',
+    ]
+    for pattern in patterns:
+        matches = re.findall(pattern, content, re.IGNORECASE)
+        if matches:
+            return matches[0]
+    return None
+
+def legacy_nowcoder_requirements(content):
+    requirements = []
+    requirement_patterns = [
+        r'要求[：:](.+?)(?:[。\n]|$)',
+        r'任职要求[：:](.+?)(?:[。\n]|$)',
+        r'技能要求[：:](.+?)(?:[。\n]|$)',
+        r'([0-9]+年以上.+?经验)',
+        r'(熟悉.+?)(?:[，。\n]|$)',
+        r'(本科|硕士|博士).+?学历',
+    ]
+    for pattern in requirement_patterns:
+        for match in re.findall(pattern, content, re.IGNORECASE):
+            req = match.strip().rstrip('，。')
+            if req and len(req) > 3:
+                requirements.append(req)
+    return requirements[:5]
+
+def legacy_xiaohongshu_requirements(content):
+    requirements = []
+    if '硕士' in content or '研究生' in content:
+        requirements.append('硕士及以上学历')
+    elif '本科' in content or '学士' in content:
+        requirements.append('本科及以上学历')
+    for pattern in [r'(\d+年以上.+?经验)', r'(有.+?项目经验)', r'(熟悉.+?)(?:[，。]|$)']:
+        for match in re.findall(pattern, content, re.IGNORECASE):
+            req = match.strip().rstrip('，。')
+            if req and len(req) > 2:
+                requirements.append(req)
+    skills = {
+        'React': 'React开发经验', 'TypeScript': 'TypeScript开发经验', 'Java': 'Java开发经验',
+        'Spring Boot': 'Spring Boot框架经验', 'MySQL': '数据库操作经验', 'Redis': '缓存技术经验',
+        'SQL': 'SQL查询能力', 'Python': 'Python编程能力',
+    }
+    content_lower = content.lower()
+    for skill, desc in skills.items():
+        if skill.lower() in content_lower:
+            requirements.append(desc)
+    for word, desc in [('沟通', '良好的沟通能力'), ('数据分析', '数据分析能力'), ('产品思维', '产品思维能力')]:
+        if word in content:
+            requirements.append(desc)
+    return requirements[:5]
+
+def legacy_leetcode_requirements(content):
+    requirements = []
+    content_lower = content.lower()
+    for lang in ['java', 'python', 'go', 'javascript', 'c++', 'react', 'vue', 'spring']:
+        if lang in content_lower:
+            requirements.append(f'熟悉{lang.title()}')
+    requirements.extend(re.findall(r'(\d+年以上?.+?经验)', content, re.IGNORECASE)[:2])
+    if any(word in content for word in ['硕士', '研究生']):
+        requirements.append('硕士及以上学历')
+    elif any(word in content for word in ['本科', '学士']):
+        requirements.append('本科及以上学历')
+    for word, desc in [('分布式', '有分布式系统经验'), ('深度学习', '熟悉深度学习框架'),
+                       ('移动端', '有移动端开发经验'), ('自动化', '有自动化测试经验')]:
+        if word in content:
+            requirements.append(desc)
+    if 'sql' in content_lower:
+        requirements.append('熟悉SQL和数据库')
+    return requirements[:5]
+
+# (名称, 旧实现, 新实现)
+CASES = [
+    ('内推码', legacy_referral_code, extract_referral_code),
+    ('牛客要求', legacy_nowcoder_requirements,
+     lambda post: NowcoderCrawler.extract_requirements(None, post)),
+    ('小红书要求', legacy_xiaohongshu_requirements,
+     lambda post: XiaohongshuCrawler.extract_requirements(None, post)),
+    ('力扣要求', legacy_leetcode_requirements,
+     lambda post: LeetcodeCrawler.extract_requirements(None, post)),
+]
+
+def run(func, posts):
+    start = time.perf_counter()
+    for post in posts:
+        func(post)
+    return time.perf_counter() - start
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    random.seed(0)
+    posts = [random.choice(SAMPLE_POSTS) * random.randint(1, 3) for _ in range(count)]
+
+    print(f'帖子数量: {count}')
+    for name, legacy, current in CASES:
+        # 预热，排除正则首次编译的开销
+        run(legacy, posts[:100])
+        run(current, posts[:100])
+
+        legacy_time = run(legacy, posts)
+        current_time = run(current, posts)
+        same = sum(legacy(post) == current(post) for post in posts)
+        print(f'{name}: 旧 {legacy_time / count * 1e6:.1f} µs/帖, '
+              f'新 {current_time / count * 1e6:.1f} µs/帖, '
+              f'加速比 {legacy_time / current_time:.2f}x, 结果一致 {same}/{count}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+/api/jobs 查询索引性能
+线性扫描：与 DataManager.filterJobs 相同，逐个职位对标题/公司/内推码做子串匹配，再排序分页
+倒排索引：job_index.JobIndex.query，同时返回分类计数
+
+用法: python benchmarks/job_index_benchmark.py [职位数量]
+"""
+
+import os
+import sys
+import time
+import random
+
+CRAWLERS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(CRAWLERS_DIR)
+sys.path.append(os.path.dirname(CRAWLERS_DIR))
+
+from company_gazetteer import COMPANIES
+from job_index import JobIndex
+
+COMPANY_NAMES = [name for name, _, _ in COMPANIES]
+TYPES = ['校招', '社招', '实习']
+SOURCES = ['牛客', '力扣', '小红书', '脉脉']
+POSITIONS = {
+    '前端': ['前端开发工程师', 'Web前端工程师', '移动端开发工程师', '小程序开发工程师'],
+    '后端': ['后端开发工程师', 'Java开发工程师', 'Go开发工程师', '服务端架构师'],
+    '算法': ['算法工程师', '推荐算法工程师', 'NLP算法工程师', '计算机视觉算法工程师'],
+    '数据': ['数据分析师', '数据开发工程师', '商业分析师'],
+    '产品': ['产品经理', '策略产品经理', '用户体验设计师'],
+    '测试': ['测试开发工程师', '自动化测试工程师'],
+}
+CITIES = ['', '（北京）', '（上海）', '（深圳）', '（杭州）', '-急招', '-2026届']
+
+QUERIES = [
+    ({}, 'date'),
+    ({'search': '前端'}, 'date'),
+    ({'search': '算法工程师'}, 'date'),
+    ({'search': '字节'}, 'company'),
+    ({'search': 'tx2026'}, 'date'),
+    ({'type': '校招', 'direction': '后端'}, 'title'),
+    ({'search': '急招', 'source': '牛客'}, 'company'),
+    ({'direction': '算法'}, 'company'),
+]
+
+def generate(count: int):
+    random.seed(0)
+    jobs = []
+    for i in range(count):
+        direction = random.choice(list(POSITIONS))
+        company = random.choice(COMPANY_NAMES)
+        jobs.append({
+            'id': i,
+            'title': random.choice(POSITIONS[direction]) + random.choice(CITIES),
+            'company': company,
+            'type': random.choice(TYPES),
+            'direction': direction,
+            'source': random.choice(SOURCES),
+            'code': f'{random.choice("TX TT AL BD MT JD".split())}2026{random.randint(1000, 9999)}',
+            'date': f'2026-09-{1 + i % 30:02d}',
+        })
+    return jobs
+
+def linear_query(jobs, filters, sort, limit=20):
+    search = (filters.get('search') or '').lower()
+    matched = [
+        job for job in jobs
+        if all(not filters.get(facet) or job[facet] == filters[facet] for facet in ('type', 'direction', 'source'))
+        and (not search or search in job['title'].lower() or search in job['company'].lower()
+             or search in job['code'].lower())
+    ]
+    key = {'date': lambda job: job['date'], 'company': lambda job: job['company'],
+           'title': lambda job: job['title']}[sort]
+    matched.sort(key=key, reverse=sort == 'date')
+    return len(matched), matched[:limit]
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    jobs = generate(count)
+
+    start = time.perf_counter()
+    index = JobIndex(jobs)
+    print(f'职位数量: {count}，建立索引 {time.perf_counter() - start:.2f} s，{len(index.postings)} 个片段')
+    print(f'{"查询":<40}{"结果数":>8}{"线性扫描":>12}{"倒排索引":>12}')
+
+    for filters, sort in QUERIES:
+        linear_ms, (linear_total, _) = timed(lambda: linear_query(jobs, filters, sort), 3)
+        index_ms, result = timed(lambda: index.query(filters, sort=sort, limit=20), 200)
+        assert result['total'] == linear_total, (filters, result['total'], linear_total)
+        label = f'{filters} sort={sort}'
+        print(f'{label:<40}{result["total"]:>8}{linear_ms:>10.2f}ms{index_ms:>10.3f}ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JobData 内存占用对比
+旧实现：普通类，每个实例一个 __dict__，分类字段各自保存一份字符串，每次构造都格式化当前时间
+新实现：__slots__，分类字段驻留，日期字符串当天共用
+
+分类字段用新建的字符串传入，模拟从页面、JSON 或数据库解析出来的值。
+
+用法: python benchmarks/jobdata_memory_benchmark.py [职位数量]
+"""
+
+import os
+import sys
+import time
+import random
+import tracemalloc
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from base_crawler import JobData
+from company_gazetteer import COMPANIES
+
+class LegacyJobData:
+    def __init__(self, title, company, job_type, direction, source, code, description="", requirements=None):
+        self.id = int(time.time() * 1000) + random.randint(1000, 9999)
+        self.title = title
+        self.company = company
+        self.type = job_type
+        self.direction = direction
+        self.source = source
+        self.code = code
+        self.date = datetime.now().strftime('%Y-%m-%d')
+        self.description = description
+        self.requirements = requirements or []
+
+COMPANY_NAMES = [name for name, _, _ in COMPANIES]
+TYPES = ['校招', '社招', '实习']
+DIRECTIONS = ['前端', '后端', '算法', '数据', '产品', '测试', '其他']
+SOURCES = ['牛客', '力扣', '小红书', '脉脉']
+
+def fresh(text: str) -> str:
+    """与解析结果一样，得到内容相同但不是同一对象的字符串"""
+    return text.encode('utf-8').decode('utf-8')
+
+def build(cls, count: int, titles, descriptions):
+    random.seed(0)
+    return [
+        cls(titles[i % len(titles)], fresh(random.choice(COMPANY_NAMES)), fresh(random.choice(TYPES)),
+            fresh(random.choice(DIRECTIONS)), fresh(random.choice(SOURCES)), f'C{i}',
+            descriptions[i % len(descriptions)])
+        for i in range(count)
+    ]
+
+def measure(cls, count: int, titles, descriptions):
+    tracemalloc.start()
+    start = time.perf_counter()
+    jobs = build(cls, count, titles, descriptions)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del jobs
+    return current, elapsed
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    # 标题和描述两种实现共用，对比只反映结构和分类字段的差异
+    titles = [f'后端开发工程师 {i}' for i in range(1000)]
+    descriptions = [f'职位描述 {i}' for i in range(1000)]
+
+    print(f'职位数量: {count}')
+    results = {}
+    for name, cls in (('旧实现', LegacyJobData), ('新实现', JobData)):
+        memory, elapsed = measure(cls, count, titles, descriptions)
+        results[name] = memory
+        print(f'{name}: {memory / 1024 / 1024:.0f} MB ({memory / count:.0f} 字节/个), '
+              f'构造耗时 {elapsed:.2f} s（含内存跟踪开销）')
+    print(f'内存减少 {1 - results["新实现"] / results["旧实现"]:.0%}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+解析进程池吞吐
+当前线程：RealDataCrawler.parse_nowcoder_posts 逐页解析
+进程池：parse_payloads 按 chunk_size 分块交给 N 个解析进程（spawn 启动，首次提交包含进程启动时间）
+
+用法: python benchmarks/parse_pool_benchmark.py [页面数量] [进程数]
+"""
+
+import os
+import sys
+import time
+import random
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser_benchmark import build_page
+from crawler_config import config
+import parse_pool
+from real_data_crawler import RealDataCrawler
+
+def summary(results):
+    # 没有内推码的帖子会随机生成一个，不参与比较
+    return [(post_id, date, job and (job.title, job.company, job.direction, job.requirements))
+            for page in results for post_id, date, job in page]
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else max(1, (os.cpu_count() or 2) - 1)
+    random.seed(0)
+    pages = [build_page(30) for _ in range(count)]
+    crawler = RealDataCrawler.parser()
+
+    start = time.perf_counter()
+    expected = [crawler.parse_nowcoder_posts(page) for page in pages]
+    inline_time = time.perf_counter() - start
+    print(f'页面数量: {count}, CPU核心 {os.cpu_count()}')
+    print(f'当前线程: {inline_time / count * 1e3:.2f} ms/页')
+
+    config.config['parsing']['workers'] = workers
+    config.config['parsing']['chunk_size'] = 8
+    pool = parse_pool.get_parse_pool()
+    for label in ('首次（含启动）', '预热后'):
+        start = time.perf_counter()
+        results = crawler.parse_payloads('parse_nowcoder_posts', pages, '解析页面失败')
+        pool_time = time.perf_counter() - start
+        print(f'{workers} 个解析进程{label}: {pool_time / count * 1e3:.2f} ms/页, '
+              f'加速比 {inline_time / pool_time:.2f}x, 结果一致 {summary(results) == summary(expected)}')
+    pool.close()
+
+if __name__ == '__main__':
+    main()
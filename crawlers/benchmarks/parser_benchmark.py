@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+牛客帖子列表解析性能对比
+旧实现：BeautifulSoup(html.parser) 构建整页文档树后 find_all
+新实现：page_parser 中的各解析后端，只取出帖子列表需要的字段
+
+除构造的页面外，还解析 fixtures 目录中保存的讨论区页面，核对各后端在真实标记
+（省略闭合标签、实体、帖子内脚本、相似类名等）上与旧实现的结果是否一致。
+
+用法: python benchmarks/parser_benchmark.py [页面数量]
+"""
+
+import os
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+from page_parser import BACKENDS
+
+TITLES = [
+    '字节跳动2025校招内推，后端/前端/算法全部门可投',
+    '腾讯暑期实习内推，简历直达部门',
+    '今天面完美团三面，分享一下面经',
+    '阿里云社招内推 Java 高级开发',
+    '求问：秋招offer怎么选',
+]
+
+FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+
+CONTENTS = [
+    '任职要求：熟悉Java/Go，3年以上分布式系统开发经验。本科及以上学历。内推码：TT2025001',
+    '实习生招聘，熟悉React、Vue和TypeScript，有移动端项目经验。推荐码: TXINTERN88',
+    '一面问了 Redis 和 MySQL，二面手撕 LRU，三面聊项目。',
+]
+
+def build_page(post_count: int) -> str:
+    """构造与牛客讨论区结构相近的页面：导航、脚本、侧栏和帖子列表"""
+    posts = []
+    for index in range(post_count):
+        post_id = 500000 + random.randint(0, 99999)
+        posts.append(f'''
+        <div class="discuss-item clearfix">
+          <div class="discuss-main">
+            <a class="discuss-title" href="/discuss/{post_id}?type=2" target="_blank">
+              {random.choice(TITLES)} #{index}
+            </a>
+            <div class="discuss-content"><p>{random.choice(CONTENTS)}</p>
+              <p>欢迎私信 <span class="tag">内推</span></p></div>
+          </div>
+          <div class="discuss-info">
+            <span class="author"><img src="/avatar/{index}.png"> 用户{index}</span>
+            <time datetime="2025-0{random.randint(1, 9)}-1{random.randint(0, 9)}T10:00:00+08:00">
+              {random.randint(1, 59)}分钟前</time>
+            <span class="reply">回复 {random.randint(0, 200)}</span>
+          </div>
+        </div>''')
+    nav = ''.join(f'<li><a href="/nav/{i}">导航{i}</a></li>' for i in range(40))
+    sidebar = ''.join(f'<div class="hot-item"><a href="/discuss/{i}">热门话题{i}</a></div>' for i in range(30))
+    script = '<script>window.__INITIAL_STATE__ = ' + '{"k": "v"}, ' * 500 + '{};</script>'
+    return (f'<!DOCTYPE html><html><head><title>讨论区</title>{script}</head><body>'
+            f'<header><ul class="nav">{nav}</ul></header>'
+            f'<div class="content"><div class="discuss-list">{"".join(posts)}</div>'
+            f'<aside class="sidebar">{sidebar}</aside></div>'
+            f'<footer>{script}</footer></body></html>')
+
+def legacy_items(html: str):
+    soup = BeautifulSoup(html, 'html.parser')
+    items = []
+    for node in soup.find_all('div', class_='discuss-item'):
+        title = node.find('a', class_='discuss-title')
+        time_node = node.find('time')
+        content = node.find('div', class_='discuss-content')
+        items.append({
+            'title': title.get_text(strip=True) if title else None,
+            'href': title.get('href') if title else None,
+            'datetime': time_node.get('datetime') if time_node else None,
+            'content': content.get_text(strip=True) if content else None,
+        })
+    return items
+
+def load_fixtures():
+    return {path.name: path.read_text(encoding='utf-8') for path in sorted(FIXTURES_DIR.glob('*.html'))}
+
+def run(func, pages):
+    start = time.perf_counter()
+    for page in pages:
+        func(page)
+    return time.perf_counter() - start
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    random.seed(0)
+    pages = [build_page(30) for _ in range(count)]
+
+    legacy_time = run(legacy_items, pages)
+    expected = [legacy_items(page) for page in pages]
+    print(f'页面数量: {count}, 平均大小 {sum(map(len, pages)) / count / 1024:.0f} KB')
+    print(f'旧实现 html.parser 全量解析: {legacy_time / count * 1e3:.2f} ms/页')
+    for name, parse in BACKENDS.items():
+        current_time = run(parse, pages)
+        same = sum(parse(page) == items for page, items in zip(pages, expected))
+        print(f'{name}: {current_time / count * 1e3:.2f} ms/页, '
+              f'加速比 {legacy_time / current_time:.2f}x, 结果一致 {same}/{count}')
+
+    fixtures = load_fixtures()
+    print(f'\n保存的页面: {len(fixtures)} 个')
+    repeat = max(1, count // 5)
+    for file_name, page in fixtures.items():
+        expected = legacy_items(page)
+        legacy_time = run(legacy_items, [page] * repeat)
+        results = []
+        for name, parse in BACKENDS.items():
+            current_time = run(parse, [page] * repeat)
+            results.append(f'{name} {legacy_time / current_time:.1f}x{"" if parse(page) == expected else " 不一致"}')
+        print(f'{file_name} ({len(expected)} 个帖子): ' + ', '.join(results))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量爬取检查点
+按来源和入口记录已入库的最新帖子（高水位）以及未完成任务的翻页进度
+"""
+
+import os
+import json
+import threading
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+class CheckpointStore:
+    """检查点存储
+
+    文件结构: {来源: {入口: {"high_water": {...}, "pending": {...}, "next_page": n}}}
+    高水位只在入口完整爬完后推进，中断的任务下次从 next_page 继续，
+    并且仍然以旧的高水位作为停止条件。
+    """
+
+    def __init__(self, path='data/checkpoints.json'):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger('crawler.checkpoints')
+        self._lock = threading.Lock()
+        self.data = self._load()
+
+    def _load(self) -> Dict:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f'读取检查点失败，从头开始爬取: {e}')
+            return {}
+
+    def _save(self):
+        # 先写临时文件再替换，避免中途崩溃损坏检查点
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def _entry(self, source: str, endpoint: str) -> Dict:
+        return self.data.setdefault(source, {}).setdefault(endpoint, {})
+
+    def high_water(self, source: str, endpoint: str) -> Dict:
+        """已入库的最新帖子，如 {"post_id": 123, "date": "2025-09-17"}"""
+        with self._lock:
+            return dict(self._entry(source, endpoint).get('high_water', {}))
+
+    def resume_page(self, source: str, endpoint: str) -> int:
+        """上次未完成时返回中断的页码，否则从第1页开始"""
+        with self._lock:
+            return self._entry(source, endpoint).get('next_page', 1)
+
+    def is_finished(self, source: str, endpoint: str) -> bool:
+        """入口是否已完整爬完过，并且没有未完成的翻页进度"""
+        with self._lock:
+            entry = self._entry(source, endpoint)
+            return 'updated_at' in entry and 'next_page' not in entry
+
+    def is_seen(self, source: str, endpoint: str, post_id: Optional[int] = None,
+                date: Optional[str] = None) -> bool:
+        """判断帖子是否已在高水位之内，优先比较帖子ID，没有ID时比较日期"""
+        mark = self.high_water(source, endpoint)
+        if post_id is not None and mark.get('post_id') is not None:
+            return post_id <= mark['post_id']
+        if date and mark.get('date'):
+            return date < mark['date']
+        return False
+
+    def record_page(self, source: str, endpoint: str, page: int,
+                    post_id: Optional[int] = None, date: Optional[str] = None):
+        """记录一页已处理完成，保存翻页进度和本轮见到的最新帖子"""
+        with self._lock:
+            entry = self._entry(source, endpoint)
+            entry['next_page'] = page + 1
+            pending = entry.setdefault('pending', {})
+            if post_id is not None and post_id > pending.get('post_id', -1):
+                pending['post_id'] = post_id
+            if date and date > pending.get('date', ''):
+                pending['date'] = date
+            self._save()
+
+    def finish(self, source: str, endpoint: str):
+        """入口爬取完成，推进高水位并清除翻页进度"""
+        with self._lock:
+            entry = self._entry(source, endpoint)
+            pending = entry.pop('pending', {})
+            entry.pop('next_page', None)
+
+            mark = entry.setdefault('high_water', {})
+            if pending.get('post_id', -1) > mark.get('post_id', -1):
+                mark['post_id'] = pending['post_id']
+            if pending.get('date', '') > mark.get('date', ''):
+                mark['date'] = pending['date']
+            entry['updated_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            self._save()
+
+_shared_store = None
+_shared_lock = threading.Lock()
+
+def get_checkpoint_store() -> CheckpointStore:
+    """获取全局共享的检查点存储"""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = CheckpointStore()
+        return _shared_store
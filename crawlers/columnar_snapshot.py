@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+列式快照
+把职位数据导出为 Arrow IPC 文件，公司、类型、方向、来源使用字典编码，日期为 date32 列。
+读取时内存映射文件，分析脚本只扫描需要的列，不必把JSON解析成字典。
+
+需要安装 pyarrow；未安装时导出会跳过并记录警告。
+用法: python columnar_snapshot.py data/all_jobs_20250901.json ...  把历史JSON文件转换为快照
+      python columnar_snapshot.py data/all_jobs_20250901.arrow ...  统计快照中各分类的职位数
+"""
+
+import os
+import sys
+import json
+import logging
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+logger = logging.getLogger('crawler.columnar_snapshot')
+
+SNAPSHOT_SUFFIX = '.arrow'
+
+# 取值很少的字段，字典编码后每行只存一个整数下标
+CATEGORICAL_COLUMNS = ('company', 'type', 'direction', 'source')
+
+def available() -> bool:
+    return pa is not None
+
+def snapshot_schema():
+    categorical = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ('id', pa.int64()),
+        ('title', pa.string()),
+        ('company', categorical),
+        ('type', categorical),
+        ('direction', categorical),
+        ('source', categorical),
+        ('code', pa.string()),
+        ('date', pa.date32()),
+        ('description', pa.string()),
+        ('requirements', pa.list_(pa.string())),
+        ('sources', pa.list_(pa.string())),
+        ('codes', pa.list_(pa.string())),
+    ])
+
+def _parse_date(value):
+    try:
+        return date.fromisoformat(value[:10]) if value else None
+    except ValueError:
+        return None
+
+def write_snapshot(path, jobs: Iterable[Dict], batch_size: int = 50000) -> int:
+    """把职位写入 Arrow IPC 文件，返回写入数量
+
+    每 batch_size 个职位组成一个记录批次，内存中只保留一个批次的数据。
+    写入临时文件后替换目标文件。
+    """
+    if pa is None:
+        raise RuntimeError('导出列式快照需要安装 pyarrow')
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    schema = snapshot_schema()
+    columns = {name: [] for name in schema.names}
+    # 分类字段的编码在所有批次间共用，后面的批次只追加新出现的取值
+    codes = {name: {} for name in CATEGORICAL_COLUMNS}
+    count = 0
+
+    def column_array(name):
+        if name in codes:
+            return pa.DictionaryArray.from_arrays(
+                pa.array(columns[name], type=pa.int32()), pa.array(list(codes[name]), type=pa.string()))
+        return pa.array(columns[name], type=schema.field(name).type)
+
+    def flush(writer):
+        if not columns['id']:
+            return
+        writer.write_batch(pa.record_batch([column_array(name) for name in schema.names], schema=schema))
+        for values in columns.values():
+            values.clear()
+
+    try:
+        options = pa.ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        with pa.OSFile(str(tmp_path), 'wb') as sink, \
+                pa.ipc.new_file(sink, schema, options=options) as writer:
+            for job in jobs:
+                for name in schema.names:
+                    columns[name].append(job.get(name))
+                for name, mapping in codes.items():
+                    value = columns[name][-1]
+                    if value is not None:
+                        columns[name][-1] = mapping.setdefault(value, len(mapping))
+                columns['date'][-1] = _parse_date(job.get('date'))
+                if columns['sources'][-1] is None:
+                    columns['sources'][-1] = [job.get('source')]
+                if columns['codes'][-1] is None:
+                    columns['codes'][-1] = [job.get('code')]
+                count += 1
+                if len(columns['id']) >= batch_size:
+                    flush(writer)
+            flush(writer)
+        os.replace(tmp_path, path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return count
+
+def open_snapshot(path):
+    """内存映射读取快照，返回 pyarrow.Table，数据直接引用文件内容，不做复制"""
+    if pa is None:
+        raise RuntimeError('读取列式快照需要安装 pyarrow')
+    return pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+
+def summarize(path) -> Dict:
+    """统计快照的职位数、日期范围和各分类取值的职位数
+
+    只扫描日期列和字典编码的分类列，标题、描述等列不会从映射的文件中读入。
+    """
+    table = open_snapshot(path)
+    dates = pc.min_max(table.column('date')).as_py()
+    summary = {'total': table.num_rows,
+               'dates': [dates['min'].isoformat(), dates['max'].isoformat()] if dates['min'] else None}
+    for name in CATEGORICAL_COLUMNS:
+        counts = pc.value_counts(table.column(name)).to_pylist()
+        summary[name] = {item['values']: item['counts'] for item in sorted(
+            counts, key=lambda item: item['counts'], reverse=True) if item['values'] is not None}
+    return summary
+
+def convert_json(json_file, output_dir=None) -> Path:
+    """把 all_jobs_*.json 之类的历史文件转换为同名快照"""
+    json_file = Path(json_file)
+    output = Path(output_dir or json_file.parent) / (json_file.stem + SNAPSHOT_SUFFIX)
+    with open(json_file, 'r', encoding='utf-8') as f:
+        jobs = json.load(f)
+    count = write_snapshot(output, jobs)
+    logger.info(f'{json_file} -> {output}: {count} 个职位')
+    return output
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if not available():
+        print('需要先安装 pyarrow: pip install pyarrow')
+        sys.exit(1)
+    for file_path in sys.argv[1:]:
+        if file_path.endswith(SNAPSHOT_SUFFIX):
+            print(json.dumps(summarize(file_path), ensure_ascii=False, indent=2))
+        else:
+            convert_json(file_path)
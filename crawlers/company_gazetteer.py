@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+公司名录
+统一维护公司名称、别名和内推码前缀，用 Aho-Corasick 自动机在文本中查找公司
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# (公司, 内推码前缀, 别名)，内推码前缀为空时使用 'XX'
+# 别名本身是常用词时（微信、字节、蚂蚁、菜鸟）只收录带上下文的写法，
+# 否则 "加微信私聊"、"Java字节码"、"菜鸟求内推" 都会被识别成公司
+COMPANIES = [
+    # 互联网大厂
+    ('字节跳动', 'TT', ['字节内推', '字节校招', '字节社招', 'ByteDance', '抖音', 'TikTok', '今日头条', '飞书']),
+    ('腾讯', 'TX', ['Tencent', '微信事业群', 'WXG', '鹅厂']),
+    ('阿里巴巴', 'AL', ['阿里', 'Alibaba', '淘宝', '天猫', '阿里云']),
+    ('百度', 'BD', ['Baidu']),
+    ('美团', 'MT', ['Meituan', '美团点评']),
+    ('网易', 'WY', ['NetEase', '网易游戏', '网易有道']),
+    ('滴滴', 'DD', ['DiDi', '滴滴出行']),
+    ('快手', 'KS', ['Kuaishou', 'Kwai']),
+    ('小红书', 'XHS', ['Xiaohongshu']),
+    ('蚂蚁集团', 'ANT', ['Ant Group', '支付宝']),
+    ('京东', 'JD', ['京东集团']),
+    ('拼多多', 'PDD', ['Pinduoduo', 'Temu']),
+    ('哔哩哔哩', 'BL', ['bilibili', 'B站']),
+    ('知乎', 'ZH', ['Zhihu']),
+    ('微博', 'WB', ['Weibo']),
+    # 传统科技公司
+    ('华为', 'HW', ['Huawei']),
+    ('小米', 'MI', ['Xiaomi']),
+    ('OPPO', 'OP', []),
+    ('vivo', 'VI', []),
+    ('联想', 'LN', ['Lenovo']),
+    ('海康威视', '', ['海康', 'Hikvision']),
+    ('大华股份', '', ['大华']),
+    # 新兴公司
+    ('理想汽车', 'LX', ['Li Auto']),
+    ('蔚来', 'NIO', ['NIO']),
+    ('小鹏汽车', 'XP', ['小鹏', 'XPeng']),
+    ('商汤科技', 'ST', ['商汤', 'SenseTime']),
+    ('旷视科技', '', ['旷视', 'Megvii']),
+    ('云从科技', '', ['云从']),
+    ('依图科技', '', ['依图']),
+    ('第四范式', '', []),
+    ('明略科技', '', []),
+    ('格灵深瞳', '', []),
+    # 游戏公司
+    ('米哈游', 'MH', ['miHoYo']),
+    ('莉莉丝', '', ['莉莉丝游戏']),
+    ('鹰角网络', '', ['鹰角']),
+    ('完美世界', 'PW', []),
+    ('三七互娱', '', []),
+    ('巨人网络', '', []),
+    # 金融科技
+    ('蚂蚁金服', '', []),
+    ('京东数科', '', ['京东科技']),
+    ('陆金所', '', []),
+    ('度小满', '', []),
+    ('苏宁金融', '', []),
+    ('平安科技', '', []),
+    # 电商物流
+    ('菜鸟网络', 'CN', ['菜鸟集团']),
+    ('顺丰科技', 'SF', ['顺丰']),
+    ('圆通速递', '', ['圆通']),
+    ('中通快递', '', ['中通']),
+    ('韵达速递', '', ['韵达']),
+    # 出行公司
+    ('哈啰出行', '', ['哈啰']),
+    ('嘀嗒出行', '', []),
+    ('高德地图', '', ['高德']),
+    ('首汽约车', '', []),
+    ('曹操出行', '', []),
+    # 其他
+    ('新浪', '', ['Sina']),
+    ('搜狐', '', ['Sohu']),
+    ('360', '', ['奇虎360']),
+    ('金山软件', '', ['金山办公', 'WPS']),
+    ('猎豹移动', '', []),
+    ('欢聚时代', '', ['YY']),
+]
+
+def _is_word_char(char: str) -> bool:
+    return char.isascii() and char.isalnum()
+
+class CompanyGazetteer:
+    """公司名录和多模式匹配器
+
+    所有公司名和别名构成一个 Aho-Corasick 自动机，查找时间与文本长度成正比，
+    与名录大小无关。匹配不区分大小写，多个结果重叠时取最靠左、再取最长的一个，
+    例如 "京东数科" 不会被识别为 "京东"。以英文或数字开头/结尾的名称要求
+    两侧不是英文字母或数字，避免 "OPPO" 匹配到 "opportunity"。
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, str, Sequence[str]]] = ()):
+        self.names: List[str] = []
+        self.codes: Dict[str, str] = {}
+        # 小写名称/别名 -> 公司
+        self.aliases: Dict[str, str] = {}
+        self._automaton = None
+        for name, code, aliases in entries:
+            self.add(name, code, aliases)
+
+    def add(self, name: str, code: str = '', aliases: Sequence[str] = ()):
+        """添加公司，下次查找时重建自动机"""
+        if name not in self.codes:
+            self.names.append(name)
+        self.codes[name] = code or 'XX'
+        for alias in [name, *aliases]:
+            self.aliases[alias.lower()] = name
+        self._automaton = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self.aliases
+
+    def canonical(self, name: str) -> Optional[str]:
+        """把公司名或别名转换为名录中的标准名称"""
+        return self.aliases.get(name.strip().lower())
+
+    def code_of(self, company: str) -> str:
+        """公司的内推码前缀，名录中没有时返回 'XX'"""
+        return self.codes.get(self.canonical(company) or company, 'XX')
+
+    def _build(self):
+        """构建自动机: goto 转移表、失败指针，以及每个状态结束的名称长度"""
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[Tuple[int, str]]] = [[]]
+
+        for alias, name in self.aliases.items():
+            state = 0
+            for char in alias:
+                if char not in goto[state]:
+                    goto.append({})
+                    outputs.append([])
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            outputs[state].append((len(alias), name))
+
+        # 广度优先计算失败指针，并把后缀状态的输出合并进来
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, target in goto[state].items():
+                queue.append(target)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[target] = goto[fallback].get(char, 0)
+                outputs[target] = outputs[target] + outputs[fail[target]]
+
+        self._automaton = (goto, fail, outputs)
+
+    def _matches(self, text: str) -> List[Tuple[int, int, str]]:
+        """返回全部匹配 (起点, 终点, 公司)，包括互相重叠的匹配"""
+        if self._automaton is None:
+            self._build()
+        goto, fail, outputs = self._automaton
+
+        lowered = text.lower()
+        matches = []
+        state = 0
+        for end, char in enumerate(lowered, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, name in outputs[state]:
+                start = end - length
+                if _is_word_char(lowered[start]) and start > 0 and _is_word_char(lowered[start - 1]):
+                    continue
+                if _is_word_char(lowered[end - 1]) and end < len(lowered) and _is_word_char(lowered[end]):
+                    continue
+                matches.append((start, end, name))
+        return matches
+
+    def find_all(self, text: str) -> List[str]:
+        """按出现顺序返回文本中提到的公司，重叠时取最左最长的匹配，结果去重"""
+        found = []
+        position = 0
+        for start, end, name in sorted(self._matches(text), key=lambda m: (m[0], m[0] - m[1])):
+            if start < position:
+                continue
+            position = end
+            if name not in found:
+                found.append(name)
+        return found
+
+    def find(self, *texts: str) -> Optional[str]:
+        """依次在各段文本中查找，返回第一个提到的公司"""
+        for text in texts:
+            matches = self._matches(text)
+            if matches:
+                return min(matches, key=lambda m: (m[0], m[0] - m[1]))[2]
+        return None
+
+COMPANY_GAZETTEER = CompanyGazetteer(COMPANIES)
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+爬虫调度器
+每个平台有自己的运行间隔、随机抖动、最长运行时间和优先级：变化快的来源频繁刷新，变化慢的少刷新。
+下一次运行时间保存在最小堆中，调度线程直接睡到最早到期的任务，不再定时轮询。
+"""
+
+import time
+import heapq
+import random
+import itertools
+import threading
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger('crawler.scheduler')
+
+# 平台没有单独配置的项使用这里的默认值，单位为分钟
+DEFAULT_SCHEDULE = {
+    'interval_minutes': 240,
+    'jitter_minutes': 10,
+    'max_runtime_minutes': 30,
+    'priority': 0,
+}
+
+class ScheduledTask:
+    """一个平台的调度设置和运行状态，时间单位为秒"""
+
+    __slots__ = ('platform', 'interval', 'jitter', 'max_runtime', 'priority',
+                 'next_run', 'running', 'started_at', 'runs', 'skipped')
+
+    def __init__(self, platform: str, interval: float, jitter: float = 0.0,
+                 max_runtime: Optional[float] = None, priority: int = 0):
+        if interval <= 0:
+            raise ValueError(f'{platform} 的运行间隔必须大于0: {interval}')
+        self.platform = platform
+        self.interval = interval
+        # 抖动不超过半个间隔，保证下一次运行总在本次之后
+        self.jitter = min(max(0.0, jitter), interval / 2)
+        self.max_runtime = max_runtime or None
+        self.priority = priority
+        self.next_run = 0.0
+        self.running = False
+        self.started_at = 0.0
+        self.runs = 0
+        self.skipped = 0
+
+    @classmethod
+    def from_config(cls, platform: str, settings: Dict) -> 'ScheduledTask':
+        """按分钟配置创建，缺少的项使用 DEFAULT_SCHEDULE"""
+        settings = {**DEFAULT_SCHEDULE, **(settings or {})}
+        return cls(
+            platform,
+            interval=settings['interval_minutes'] * 60,
+            jitter=settings['jitter_minutes'] * 60,
+            max_runtime=(settings['max_runtime_minutes'] or 0) * 60,
+            priority=settings['priority'],
+        )
+
+    def schedule_after(self, moment: float) -> float:
+        """下一次运行时间为 moment 之后一个间隔，加上 ±jitter 的随机抖动"""
+        self.next_run = moment + self.interval + random.uniform(-self.jitter, self.jitter)
+        return self.next_run
+
+class CrawlScheduler:
+    """事件驱动的平台调度器
+
+    run_task(platform, deadline) 在线程池中执行一个平台的爬取和入库，deadline 为最长运行时间的截止时刻。
+    节奏固定：下一次运行从本次应运行的时间起推算，不受运行耗时影响。
+    同时到期的任务按优先级占用空闲线程；同一平台上一次运行尚未结束时跳过本次，顺延一个间隔。
+    """
+
+    def __init__(self, tasks: Iterable[ScheduledTask], run_task: Callable[[str, Optional[float]], object],
+                 max_workers: int = None):
+        self.tasks: Dict[str, ScheduledTask] = {task.platform: task for task in tasks}
+        self.run_task = run_task
+        self.max_workers = max(1, max_workers or len(self.tasks) or 1)
+        # 等待到期: (运行时间, -优先级, 序号, 平台)；已到期等待空闲线程: (-优先级, 运行时间, 序号, 平台)
+        self._waiting: List = []
+        self._due: List = []
+        self._sequence = itertools.count()
+        self._active = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+
+    def _push(self, task: ScheduledTask):
+        heapq.heappush(self._waiting, (task.next_run, -task.priority, next(self._sequence), task.platform))
+
+    def _dispatch(self, executor: ThreadPoolExecutor) -> Optional[float]:
+        """启动已到期的任务，返回距离下一个任务到期的秒数"""
+        now = time.time()
+        while self._waiting and self._waiting[0][0] <= now:
+            due_at, _, _, platform = heapq.heappop(self._waiting)
+            task = self.tasks[platform]
+            heapq.heappush(self._due, (-task.priority, due_at, next(self._sequence), platform))
+
+        while self._due:
+            with self._lock:
+                if self._active >= self.max_workers:
+                    break
+            _, due_at, _, platform = heapq.heappop(self._due)
+            task = self.tasks[platform]
+            # 长时间等待线程后不补跑错过的次数，从现在起重新计时
+            if task.schedule_after(due_at) <= now:
+                task.schedule_after(now)
+            self._push(task)
+
+            with self._lock:
+                if task.running:
+                    task.skipped += 1
+                    logger.warning(f'{platform} 上一次运行尚未结束（已运行 {now - task.started_at:.0f} 秒），跳过本次')
+                    continue
+                task.running = True
+                task.started_at = now
+                self._active += 1
+            self._start(executor, task, now)
+
+        if not self._waiting:
+            return None
+        return max(0.0, self._waiting[0][0] - now)
+
+    def _start(self, executor: ThreadPoolExecutor, task: ScheduledTask, now: float):
+        deadline = now + task.max_runtime if task.max_runtime else None
+        logger.info(f'开始运行 {task.platform}（优先级 {task.priority}），'
+                    f'下次 {datetime.fromtimestamp(task.next_run):%H:%M:%S}')
+        future = executor.submit(self.run_task, task.platform, deadline)
+        future.add_done_callback(lambda done, task=task: self._finished(task, done))
+
+    def _finished(self, task: ScheduledTask, future: Future):
+        duration = time.time() - task.started_at
+        error = future.exception()
+        if error is not None:
+            logger.error(f'{task.platform} 运行失败: {error}')
+        elif task.max_runtime and duration > task.max_runtime:
+            logger.warning(f'{task.platform} 运行 {duration:.0f} 秒，超过最长运行时间 {task.max_runtime:.0f} 秒')
+        else:
+            logger.info(f'{task.platform} 运行完成，耗时 {duration:.0f} 秒')
+
+        with self._lock:
+            task.running = False
+            task.runs += 1
+            self._active -= 1
+        # 空出线程后立即检查是否有等待中的到期任务
+        self._wakeup.set()
+
+    def run_forever(self, run_immediately: bool = True):
+        """阻塞运行直到调用 stop()
+
+        run_immediately 为真时各平台在启动后的抖动时间内先运行一次，否则等待一个完整间隔。
+        返回前等待正在运行的任务结束。
+        """
+        now = time.time()
+        for task in self.tasks.values():
+            if run_immediately:
+                task.next_run = now + random.uniform(0, task.jitter)
+            else:
+                task.schedule_after(now)
+            self._push(task)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='scheduler') as executor:
+            try:
+                while not self._stopped.is_set():
+                    # 先清除再调度，调度期间完成的任务会让下面的 wait 立即返回
+                    self._wakeup.clear()
+                    timeout = self._dispatch(executor)
+                    self._wakeup.wait(timeout)
+            finally:
+                self._stopped.set()
+                logger.info('调度器停止，等待正在运行的任务结束')
+
+    def stop(self):
+        self._stopped.set()
+        self._wakeup.set()
+
+    def status(self) -> List[Dict]:
+        """各平台的调度状态，按下一次运行时间排序"""
+        with self._lock:
+            return [{
+                'platform': task.platform,
+                'interval_minutes': task.interval / 60,
+                'jitter_minutes': task.jitter / 60,
+                'max_runtime_minutes': task.max_runtime / 60 if task.max_runtime else None,
+                'priority': task.priority,
+                'next_run': datetime.fromtimestamp(task.next_run).isoformat() if task.next_run else None,
+                'running': task.running,
+                'runs': task.runs,
+                'skipped': task.skipped,
+            } for task in sorted(self.tasks.values(), key=lambda task: task.next_run)]
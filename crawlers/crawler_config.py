@@ -37,9 +37,39 @@ class CrawlerConfig:
                 "delay_range": [2, 5],
                 "retry_times": 3
             },
+            "rate_limit": {
+                # 每秒请求数由 anti_detection.delay_range 推算
+                "burst": 2,
+                "backoff_factor": 0.5,  # 被拦截时速率乘以该系数
+                "recovery_step": 0.1,   # 每次成功恢复初始速率的比例
+                "min_rate": 0.05,
+                "domains": {}           # 按域名覆盖，如 {"www.nowcoder.com": {"rate": 0.2, "burst": 1}}
+            },
+            "http_cache": {
+                "enable": True,
+                "dir": "cache/http",
+                # 有效期内不发请求，过期后发送条件请求；增量爬取的列表页总是发送条件请求。
+                # 应短于最短的调度间隔（real_data 为30分钟）
+                "ttl_seconds": 600,
+                "max_bytes": 50 * 1024 * 1024  # 超过容量按LRU淘汰
+            },
+            "parsing": {
+                # auto 按 selectolax、lxml、bs4 的顺序选择已安装的解析器
+                "backend": "auto",
+                "workers": 0,  # 解析进程数，0 在抓取线程中解析，"auto" 为CPU核心数减一
+                "chunk_size": 32,  # 每次提交给解析进程的帖子/页面数
+                "backfill_workers": "auto"  # 回填模式下的解析进程数
+            },
+            "concurrency": {
+                "enable": True,
+                "max_workers": 5  # 同时运行的平台爬虫数量
+            },
             "platforms": {
                 "nowcoder": {
                     "enable": True,
+                    "max_connections": 2,  # 该平台同时进行的请求数
+                    # 调度模式下的运行间隔、随机抖动和最长运行时间（分钟），同时到期时优先级高的先运行
+                    "schedule": {"interval_minutes": 60, "jitter_minutes": 5, "priority": 2},
                     "base_url": "https://www.nowcoder.com",
                     "endpoints": [
                         "/discuss/tag/640",  # 内推
@@ -49,6 +79,8 @@ class CrawlerConfig:
                 },
                 "leetcode": {
                     "enable": True,
+                    "max_connections": 2,
+                    "schedule": {"interval_minutes": 180, "jitter_minutes": 15, "priority": 1},
                     "base_url": "https://leetcode.cn",
                     "endpoints": [
                         "/circle/discuss/",
@@ -57,23 +89,55 @@ class CrawlerConfig:
                 },
                 "xiaohongshu": {
                     "enable": False,  # 小红书反爬虫较强，默认关闭
+                    "max_connections": 2,
+                    "schedule": {"interval_minutes": 360, "jitter_minutes": 30},
                     "base_url": "https://www.xiaohongshu.com",
                     "keywords": ["内推", "校招", "实习", "求职"]
                 },
                 "maimai": {
                     "enable": False,  # 脉脉需要登录，默认关闭
+                    "max_connections": 2,
+                    "schedule": {"interval_minutes": 720, "jitter_minutes": 60},
                     "base_url": "https://maimai.cn"
+                },
+                "real_data": {
+                    "enable": True,
+                    "schedule": {"interval_minutes": 30, "jitter_minutes": 5,
+                                 "max_runtime_minutes": 20, "priority": 3},
+                    "backfill_max_pages": 500  # 回填模式下每个标签最多翻页数
+                }
+            },
+            "scheduler": {
+                # 平台未单独设置 schedule 的项使用这里的默认值（分钟）
+                "default": {
+                    "interval_minutes": 240,
+                    "jitter_minutes": 10,
+                    "max_runtime_minutes": 30,
+                    "priority": 0
                 }
             },
             "data_processing": {
                 "enable_deduplication": True,
+                "near_duplicate_threshold": 0.75,  # 同一公司的职位文本相似度不低于该值时合并
                 "max_age_days": 60,
                 "min_code_length": 4,
                 "max_code_length": 20
             },
+            "id_generator": {
+                "worker_id": None,          # 0-31，为空时每个进程自动分配，也可用环境变量 CRAWLER_WORKER_ID 指定
+                "lock_dir": "data/worker_ids"
+            },
             "output": {
                 "save_raw_data": True,
                 "save_processed_data": True,
+                "store_max_segments": 8,  # 追加写入存储的分段数超过该值时合并为一个
+                "columnar_snapshot": False,  # 额外导出 Arrow 列式快照，需要安装 pyarrow
+                "precompress": True,  # 网站数据文件旁生成 .gz/.br 压缩副本，.br 需要安装 brotli
+                "shards": {
+                    "enabled": True,  # 网站数据按日期分片导出到 ../data/shards
+                    "page_size": 100,  # 每个分片最多包含的职位数
+                    "keep_jobs_json": True  # 同时保留完整的 jobs.json
+                },
                 "data_dir": "data",
                 "backup_dir": "backup"
             }
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+职位近似去重
+对 标题+公司+描述 计算 MinHash 签名，用 LSH 分段索引查找候选，
+同一职位在多个平台转发时合并为一条并记录全部来源和内推码
+"""
+
+import re
+import operator
+import hashlib
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# MinHash 签名由 BANDS 段组成，每段 ROWS 个值，某一段完全相同的两个职位才成为候选。
+# Jaccard 相似度 0.85 的转发成为候选的概率约 99%，0.4 的不同职位约 8%
+BANDS = 8
+ROWS = 5
+NUM_HASHES = BANDS * ROWS
+BIN_WIDTH = (1 << 64) // NUM_HASHES
+BIN_BOUNDS = [index * BIN_WIDTH for index in range(NUM_HASHES)]
+
+# 候选用最小的 SKETCH_SIZE 个特征哈希核对相似度，特征更少的短帖子相当于精确比较
+SKETCH_SIZE = 64
+SKETCH_OFFSET = NUM_HASHES * 8
+BAND_BYTES = ROWS * 8
+
+# MinHash 估计的标准差约 0.07，低于阈值两倍标准差以上的候选不再用摘要核对
+PREFILTER_MARGIN = 0.15
+
+# 同一公司的帖子常有固定的套话，整段 MinHash 都来自套话时会落进同一个桶。
+# 桶满后不再加入也不再核对，真正的重复职位通常还在其他几段相同
+MAX_BUCKET_SIZE = 20
+
+NON_WORD = re.compile(r'[\W_]+')
+
+# 特征 -> 64 位哈希，字符二元组的种类有限，缓存后不用重复计算
+_hash_cache: Dict[str, int] = {}
+HASH_CACHE_SIZE = 200000
+
+def _hash(feature: str) -> int:
+    # 内置 hash() 每个进程随机加盐，签名要写入仓库，必须使用稳定的哈希
+    value = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+    if len(_hash_cache) >= HASH_CACHE_SIZE:
+        _hash_cache.clear()
+    _hash_cache[feature] = value
+    return value
+
+def feature_hashes(text: str) -> List[int]:
+    """文本去掉标点空白后，相邻两个字符作为一个特征，返回排好序的特征哈希"""
+    text = NON_WORD.sub('', text.lower())
+    features = {text[i:i + 2] for i in range(len(text) - 1)} if len(text) > 1 else {text}
+    hashes = list(map(_hash_cache.get, features))
+    if None in hashes:
+        hashes = [_hash_cache.get(feature) or _hash(feature) for feature in features]
+    hashes.sort()
+    return hashes
+
+def minhash(hashes: List[int]) -> List[int]:
+    """单次哈希的 MinHash：按哈希值分到 NUM_HASHES 个区间，每个区间取最小值
+
+    每个特征只计算一次哈希；哈希已排好序，每个区间的最小值用二分查找得到。
+    """
+    # 每个区间记录最小值在区间内的偏移，空区间为 BIN_WIDTH
+    signature = []
+    for lower in BIN_BOUNDS:
+        position = bisect_left(hashes, lower)
+        offset = hashes[position] - lower if position < len(hashes) else BIN_WIDTH
+        signature.append(min(offset, BIN_WIDTH))
+
+    # 空区间按环形顺序向右借用，加上距离的偏移，借来的值不会与原本落在该区间的值相等
+    genuine = list(signature)
+    for index in range(NUM_HASHES):
+        if genuine[index] != BIN_WIDTH:
+            continue
+        for distance in range(1, NUM_HASHES):
+            borrowed = genuine[(index + distance) % NUM_HASHES]
+            if borrowed != BIN_WIDTH:
+                signature[index] = borrowed + distance * BIN_WIDTH
+                break
+    return signature
+
+def signature(text: str) -> bytes:
+    """文本签名: NUM_HASHES 个 MinHash 值，之后是从小到大的特征哈希摘要"""
+    hashes = feature_hashes(text)
+    return array('Q', minhash(hashes) + hashes[:SKETCH_SIZE]).tobytes()
+
+def job_signature(job: Dict) -> bytes:
+    """职位签名，特征来自 标题+公司+描述"""
+    return signature(' '.join((job.get('title') or '', job.get('company') or '', job.get('description') or '')))
+
+def merge_group(job: Dict) -> Tuple:
+    """只有公司、职位类型和技术方向都相同的职位才可能合并
+
+    同一公司的帖子常用同一个模板，只换方向和类型，文字相似度很高但并不是同一个职位。
+    """
+    return job.get('company'), job.get('type'), job.get('direction')
+
+def estimate_similarity(a: bytes, b: bytes) -> float:
+    """用 MinHash 部分粗略估计相似度，只做初筛"""
+    return sum(map(operator.eq, array('Q', a[:SKETCH_OFFSET]), array('Q', b[:SKETCH_OFFSET]))) / NUM_HASHES
+
+def similarity(a: bytes, b: bytes) -> float:
+    """用两个摘要估计 Jaccard 相似度
+
+    摘要是各自最小的 SKETCH_SIZE 个特征哈希（特征少时就是全部特征）。
+    两边都只看不超过 limit 的部分，这部分在两个摘要里都是完整的，
+    其中共有的比例即为相似度；短帖子的摘要是完整特征集合，结果是精确值。
+    """
+    first = array('Q', a[SKETCH_OFFSET:])
+    second = array('Q', b[SKETCH_OFFSET:])
+    limits = [sketch[-1] for sketch in (first, second) if len(sketch) == SKETCH_SIZE]
+    if limits:
+        limit = min(limits)
+        first = first[:bisect_right(first, limit)]
+        second = second[:bisect_right(second, limit)]
+    shared = len(set(first).intersection(second))
+    return shared / (len(first) + len(second) - shared)
+
+class NearDuplicateIndex:
+    """MinHash LSH 近似重复索引
+
+    签名切成 BANDS 段，(分组, 段内容) 的哈希作为桶的键，查找时只核对同桶的候选，
+    不需要与全部职位两两比较。只有同一分组（见 merge_group）的职位才会合并，
+    这样也避免了同一模板生成的不同公司、不同方向的职位互相成为候选。
+    """
+
+    def __init__(self, threshold: float = 0.75):
+        self.threshold = threshold
+        self.buckets: List[Dict[int, List[int]]] = [{} for _ in range(BANDS)]
+        self.signatures: Dict[int, bytes] = {}
+        self.groups: Dict[int, Tuple] = {}
+
+    def __len__(self) -> int:
+        return len(self.signatures)
+
+    @staticmethod
+    def _band_keys(signature: bytes, group) -> Iterator[int]:
+        # 键只保存哈希值以节省内存，偶尔的哈希冲突会在核对相似度时排除
+        for band in range(BANDS):
+            yield hash((group, signature[band * BAND_BYTES:(band + 1) * BAND_BYTES]))
+
+    def add(self, key: int, signature: bytes, group=None):
+        self.signatures[key] = signature
+        self.groups[key] = group
+        for buckets, band_key in zip(self.buckets, self._band_keys(signature, group)):
+            bucket = buckets.setdefault(band_key, [])
+            if len(bucket) < MAX_BUCKET_SIZE:
+                bucket.append(key)
+
+    def find(self, signature: bytes, group=None) -> Optional[int]:
+        """返回同一分组中已索引的近似重复职位，没有时返回 None"""
+        checked = set()
+        for buckets, band_key in zip(self.buckets, self._band_keys(signature, group)):
+            bucket = buckets.get(band_key, ())
+            if len(bucket) >= MAX_BUCKET_SIZE:
+                continue
+            for key in bucket:
+                if key in checked:
+                    continue
+                checked.add(key)
+                # 桶键的哈希冲突可能带来其他分组的职位
+                if self.groups[key] != group:
+                    continue
+                other = self.signatures[key]
+                if estimate_similarity(signature, other) < self.threshold - PREFILTER_MARGIN:
+                    continue
+                if similarity(signature, other) >= self.threshold:
+                    return key
+        return None
+
+class JobDeduplicator:
+    """跨平台近似去重：重复职位并入最先出现的一条，来源记录在 sources 中，内推码记录在 codes 中"""
+
+    def __init__(self, threshold: float = 0.75):
+        self.index = NearDuplicateIndex(threshold)
+        self.sources: Dict[int, List[str]] = {}
+        self.codes: Dict[int, List[str]] = {}
+        # 来源或内推码有变化、需要回写仓库的职位: {id: {'sources': [...], 'codes': [...]}}
+        self.changed: Dict[int, Dict[str, List[str]]] = {}
+        self.merged = 0
+
+    def load(self, jobs: Iterable[Dict]) -> int:
+        """索引仓库中已有的职位，缺少签名的旧数据在这里补算"""
+        count = 0
+        for job in jobs:
+            signature = job.get('signature') or job_signature(job)
+            self.index.add(job['id'], signature, merge_group(job))
+            self.sources[job['id']] = job.get('sources') or [job.get('source')]
+            self.codes[job['id']] = job.get('codes') or [job.get('code')]
+            count += 1
+        return count
+
+    def filter(self, jobs: Iterable[Dict]) -> Iterator[Dict]:
+        """产出不重复的职位（附带 signature、sources 和 codes），重复的只记录来源和内推码"""
+        for job in jobs:
+            signature = job_signature(job)
+            group = merge_group(job)
+            duplicate = self.index.find(signature, group)
+            if duplicate is None:
+                job['signature'] = signature
+                job['sources'] = [job.get('source')]
+                job['codes'] = [job.get('code')]
+                self.index.add(job['id'], signature, group)
+                self.sources[job['id']] = job['sources']
+                self.codes[job['id']] = job['codes']
+                yield job
+                continue
+
+            self.merged += 1
+            sources = self.sources[duplicate]
+            codes = self.codes[duplicate]
+            updated = False
+            if job.get('source') not in sources:
+                sources.append(job.get('source'))
+                updated = True
+            if job.get('code') not in codes:
+                codes.append(job.get('code'))
+                updated = True
+            if updated:
+                self.changed[duplicate] = {'sources': sources, 'codes': codes}
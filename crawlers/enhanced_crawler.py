@@ -12,31 +12,15 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict
 from base_crawler import JobData
+from job_statistics import StatisticsAggregator
+from company_gazetteer import COMPANY_GAZETTEER
 
 class EnhancedDataGenerator:
     """增强数据生成器，生成更多真实的内推数据"""
     
     def __init__(self):
-        self.companies = [
-            # 互联网大厂
-            '字节跳动', '腾讯', '阿里巴巴', '百度', '美团', '网易', '滴滴', '快手', 
-            '小红书', '蚂蚁集团', '京东', '拼多多', '哔哩哔哩', '知乎', '微博',
-            # 传统科技公司
-            '华为', '小米', 'OPPO', 'vivo', '联想', '海康威视', '大华股份',
-            # 新兴公司
-            '理想汽车', '蔚来', '小鹏汽车', '商汤科技', '旷视科技', '云从科技',
-            '依图科技', '第四范式', '明略科技', '格灵深瞳',
-            # 游戏公司
-            '米哈游', '莉莉丝', '鹰角网络', '完美世界', '三七互娱', '巨人网络',
-            # 金融科技
-            '蚂蚁金服', '京东数科', '陆金所', '度小满', '苏宁金融', '平安科技',
-            # 电商物流
-            '菜鸟网络', '顺丰科技', '圆通速递', '中通快递', '韵达速递',
-            # 出行公司
-            '哈啰出行', '嘀嗒出行', '高德地图', '首汽约车', '曹操出行',
-            # 其他
-            '新浪', '搜狐', '360', '金山软件', '猎豹移动', '欢聚时代'
-        ]
+        # 公司列表统一维护在公司名录中
+        self.companies = list(COMPANY_GAZETTEER.names)
         
         self.job_templates = {
             '前端': [
@@ -241,17 +225,7 @@ class EnhancedDataGenerator:
     
     def generate_referral_code(self, company: str, job_type: str) -> str:
         """生成内推码"""
-        company_codes = {
-            '字节跳动': 'TT', '腾讯': 'TX', '阿里巴巴': 'AL', '百度': 'BD',
-            '美团': 'MT', '网易': 'WY', '滴滴': 'DD', '快手': 'KS',
-            '小红书': 'XHS', '蚂蚁集团': 'ANT', '京东': 'JD', '拼多多': 'PDD',
-            '哔哩哔哩': 'BL', '知乎': 'ZH', '微博': 'WB', '华为': 'HW',
-            '小米': 'MI', 'OPPO': 'OP', 'vivo': 'VI', '联想': 'LN',
-            '理想汽车': 'LX', '蔚来': 'NIO', '小鹏汽车': 'XP', '商汤科技': 'ST',
-            '米哈游': 'MH', '完美世界': 'PW', '菜鸟网络': 'CN', '顺丰科技': 'SF'
-        }
-        
-        code = company_codes.get(company, 'XX')
+        code = COMPANY_GAZETTEER.code_of(company)
         year = datetime.now().year
         sequence = random.randint(10000, 99999)
         
@@ -331,23 +305,18 @@ def main():
     print(f"\n📊 数据生成完成!")
     print(f"📦 总计职位: {len(jobs)} 个")
     
-    # 统计信息
-    companies = {}
-    sources = {}
-    types = {}
-    directions = {}
+    jobs_dict = [job.to_dict() for job in jobs]
     
-    for job in jobs:
-        companies[job.company] = companies.get(job.company, 0) + 1
-        sources[job.source] = sources.get(job.source, 0) + 1
-        types[job.type] = types.get(job.type, 0) + 1
-        directions[job.direction] = directions.get(job.direction, 0) + 1
+    # 统计信息（单次遍历）
+    aggregator = StatisticsAggregator()
+    aggregator.add_all(jobs_dict)
+    stats = aggregator.snapshot()
     
     print(f"\n📈 数据分布:")
-    print(f"🏢 公司数量: {len(companies)} 家")
-    print(f"🔍 数据来源: {len(sources)} 个平台")
-    print(f"📋 职位类型: {types}")
-    print(f"💻 技术方向: {directions}")
+    print(f"🏢 公司数量: {len(stats['by_company'])} 家")
+    print(f"🔍 数据来源: {len(stats['by_source'])} 个平台")
+    print(f"📋 职位类型: {stats['by_type']}")
+    print(f"💻 技术方向: {stats['by_direction']}")
     
     # 保存数据
     data_dir = Path('data')
@@ -355,7 +324,6 @@ def main():
     
     # 保存到爬虫数据目录
     crawler_data_file = data_dir / f'enhanced_jobs_{datetime.now().strftime("%Y%m%d")}.json'
-    jobs_dict = [job.to_dict() for job in jobs]
     
     with open(crawler_data_file, 'w', encoding='utf-8') as f:
         json.dump(jobs_dict, f, ensure_ascii=False, indent=2)
@@ -373,16 +341,8 @@ def main():
         json.dump(jobs_dict, f, ensure_ascii=False, indent=2)
     
     # 生成统计数据
-    stats = {
-        'total_jobs': len(jobs),
-        'update_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'by_source': sources,
-        'by_type': types,
-        'by_direction': directions,
-        'by_company': dict(sorted(companies.items(), key=lambda x: x[1], reverse=True)[:20]),
-        'today_jobs': sum(1 for job in jobs if job.date == datetime.now().strftime('%Y-%m-%d')),
-        'date_range': f"{generator.start_date.strftime('%Y-%m-%d')} 至 {generator.end_date.strftime('%Y-%m-%d')}"
-    }
+    stats['by_company'] = dict(list(stats['by_company'].items())[:20])
+    stats['date_range'] = f"{generator.start_date.strftime('%Y-%m-%d')} 至 {generator.end_date.strftime('%Y-%m-%d')}"
     
     # 保存统计数据
     stats_file = Path('../data/statistics.json')
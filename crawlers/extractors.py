@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+帖子字段提取
+内推码、要求段落、经验、学历、技能等规则在导入时预编译，各平台爬虫共用
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+# 内推码规则按优先级排列，取第一条有结果的规则
+CODE_PATTERNS = [
+    re.compile(r'内推码[：:]?\s*([A-Za-z0-9]{6,20})'),
+    re.compile(r'推荐码[：:]?\s*([A-Za-z0-9]{6,20})'),
+    re.compile(r'邀请码[：:]?\s*([A-Za-z0-9]{6,20})'),
+    re.compile(r'code[：:]?\s*([A-Za-z0-9]{6,20})', re.IGNORECASE),
+    re.compile(r'([A-Za-z]{2,4}\d{4,8})'),  # 常见格式如 TT2025001
+]
+
+# 字段 -> (正则, 必需文字)
+# 必需文字是匹配结果一定包含的字面文字，文本中没有时直接跳过正则，
+# 字面查找远快于正则逐字符尝试
+FIELD_PATTERNS = {
+    # "任职要求："、"技能要求：" 同样以 "要求：" 开头，一条规则即可覆盖
+    'requirements': (re.compile(r'要求[：:](.+?)(?:[。\n]|$)'), '要求'),
+    'experience': (re.compile(r'([0-9]+年以上.+?经验)'), '年以上'),
+    'projects': (re.compile(r'(有.+?项目经验)'), '项目经验'),
+    'familiar': (re.compile(r'(熟悉.+?)(?:[，。\n]|$)'), '熟悉'),
+}
+
+# 学历关键词 -> 学历
+DEGREE_KEYWORDS = {
+    '博士': '博士',
+    '硕士': '硕士',
+    '研究生': '硕士',
+    '本科': '本科',
+    '学士': '本科',
+}
+
+# 未指定技能表时使用的常见技能
+SKILL_KEYWORDS = [
+    'Java', 'Python', 'Go', 'JavaScript', 'TypeScript', 'C++', 'React', 'Vue',
+    'Spring', 'MySQL', 'Redis', 'SQL', '机器学习', '深度学习', '分布式',
+]
+
+ALL_FIELDS = ('code',) + tuple(FIELD_PATTERNS) + ('degrees', 'skills')
+
+def extract_referral_code(text: str) -> Optional[str]:
+    """从内容中提取真实内推码"""
+    for pattern in CODE_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            return match.group(1)
+    return None
+
+def find_all(field: str, text: str) -> List[str]:
+    """按字段规则查找全部匹配，结果与 re.findall 相同"""
+    pattern, required = FIELD_PATTERNS[field]
+    if required not in text:
+        return []
+    return pattern.findall(text)
+
+def extract_degrees(text: str) -> Set[str]:
+    """返回文本中提到的学历"""
+    return {degree for word, degree in DEGREE_KEYWORDS.items() if word in text}
+
+def mentioned_keywords(text: str, keywords: Iterable[str]) -> Set[str]:
+    """返回文本中出现的关键词，不区分大小写，结果保持关键词原本的写法"""
+    lowered = text.lower()
+    return {keyword for keyword in keywords if keyword.lower() in lowered}
+
+def extract_post_fields(text: str, fields: Iterable[str] = None,
+                        skills: Iterable[str] = SKILL_KEYWORDS) -> Dict[str, object]:
+    """一次调用提取帖子中的字段，fields 为 None 时提取全部字段
+
+    字段:
+        code          第一个内推码，没有时为 None
+        requirements  "任职要求：" 等段落内容
+        experience    "3年以上...经验"
+        projects      "有...项目经验"
+        familiar      "熟悉..."
+        degrees       提到的学历 {'博士', '硕士', '本科'}
+        skills        skills 中在文本里出现的技能
+    """
+    result = {}
+    for field in (ALL_FIELDS if fields is None else fields):
+        if field == 'code':
+            result[field] = extract_referral_code(text)
+        elif field == 'degrees':
+            result[field] = extract_degrees(text)
+        elif field == 'skills':
+            result[field] = mentioned_keywords(text, skills)
+        else:
+            result[field] = find_all(field, text)
+    return result
+
+def clean_matches(matches: List[str], min_length: int) -> List[str]:
+    """去掉首尾空白和句末标点，过滤太短的内容"""
+    cleaned = []
+    for match in matches:
+        text = match.strip().rstrip('，。')
+        if text and len(text) > min_length:
+            cleaned.append(text)
+    return cleaned
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+HTTP响应缓存
+磁盘保存页面内容及 ETag/Last-Modified，支持条件请求、TTL 和按容量的LRU淘汰
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+from crawler_config import config
+
+class CachedResponse:
+    """缓存命中时返回的响应，接口与 requests.Response 常用字段一致"""
+
+    def __init__(self, url: str, text: str, headers: Dict = None, not_modified: bool = False):
+        self.url = url
+        self.text = text
+        self.headers = headers or {}
+        self.status_code = 200
+        # True 表示服务器返回 304 或缓存仍在有效期内，页面内容没有变化
+        self.not_modified = not_modified
+
+class HTTPCache:
+    """磁盘HTTP缓存
+
+    每个URL保存一个内容文件，元数据集中在 index.json 中；
+    总大小超过上限时按最近访问时间淘汰。
+    """
+
+    def __init__(self, cache_dir='cache/http', ttl_seconds: float = 600,
+                 max_bytes: int = 50 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.cache_dir / 'index.json'
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.logger = logging.getLogger('crawler.http_cache')
+
+        self._lock = threading.Lock()
+        self.index = self._load_index()
+
+    @classmethod
+    def from_config(cls):
+        """根据配置创建缓存，未启用时返回 None"""
+        if not config.get('http_cache.enable', True):
+            return None
+        return cls(
+            cache_dir=config.get('http_cache.dir', 'cache/http'),
+            ttl_seconds=config.get('http_cache.ttl_seconds', 600),
+            max_bytes=config.get('http_cache.max_bytes', 50 * 1024 * 1024),
+        )
+
+    def _load_index(self) -> Dict[str, Dict]:
+        if not self.index_file.exists():
+            return {}
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f'读取缓存索引失败，重建缓存: {e}')
+            return {}
+
+    def _save_index(self):
+        # 先写临时文件再替换，避免中途崩溃损坏索引
+        tmp_file = self.index_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False)
+        os.replace(tmp_file, self.index_file)
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def _body_path(self, url: str) -> Path:
+        return self.cache_dir / f'{self._key(url)}.html'
+
+    def _read_body(self, url: str) -> Optional[str]:
+        try:
+            return self._body_path(url).read_text(encoding='utf-8')
+        except OSError:
+            return None
+
+    def get_fresh(self, url: str) -> Optional[CachedResponse]:
+        """在TTL内直接返回缓存，不发送请求"""
+        with self._lock:
+            entry = self.index.get(url)
+            if not entry or time.time() - entry['stored_at'] > self.ttl_seconds:
+                return None
+            entry['accessed_at'] = time.time()
+
+        body = self._read_body(url)
+        if body is None:
+            return None
+        return CachedResponse(url, body, entry.get('headers'), not_modified=True)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """生成条件请求头"""
+        with self._lock:
+            entry = self.index.get(url)
+        if not entry or not self._body_path(url).exists():
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def revalidated(self, url: str, response) -> Optional[CachedResponse]:
+        """处理 304 响应：刷新有效期并返回缓存内容"""
+        body = self._read_body(url)
+        if body is None:
+            return None
+
+        with self._lock:
+            entry = self.index.get(url)
+            if not entry:
+                return None
+            now = time.time()
+            entry['stored_at'] = now
+            entry['accessed_at'] = now
+            # 服务器可能在 304 中更新校验值
+            entry['etag'] = response.headers.get('ETag', entry.get('etag'))
+            entry['last_modified'] = response.headers.get('Last-Modified', entry.get('last_modified'))
+            self._save_index()
+
+        return CachedResponse(url, body, entry.get('headers'), not_modified=True)
+
+    def store(self, url: str, response):
+        """保存 200 响应，没有校验值且TTL为0时不缓存"""
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not (etag or last_modified or self.ttl_seconds > 0):
+            return
+
+        body = response.text
+        self._body_path(url).write_text(body, encoding='utf-8')
+
+        now = time.time()
+        with self._lock:
+            self.index[url] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'headers': {'Content-Type': response.headers.get('Content-Type', '')},
+                'size': len(body.encode('utf-8')),
+                'stored_at': now,
+                'accessed_at': now,
+            }
+            self._evict()
+            self._save_index()
+
+    def discard(self, url: str):
+        """删除某个URL的缓存，如被拦截时缓存到的验证页"""
+        with self._lock:
+            if self.index.pop(url, None) is None:
+                return
+            try:
+                self._body_path(url).unlink()
+            except OSError:
+                pass
+            self._save_index()
+
+    def _evict(self):
+        """按最近访问时间淘汰，直到总大小不超过上限"""
+        total = sum(entry['size'] for entry in self.index.values())
+        if total <= self.max_bytes:
+            return
+
+        for url, entry in sorted(self.index.items(), key=lambda item: item[1]['accessed_at']):
+            if total <= self.max_bytes:
+                break
+            try:
+                self._body_path(url).unlink()
+            except OSError:
+                pass
+            total -= entry['size']
+            del self.index[url]
+            self.logger.info(f'淘汰缓存: {url}')
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+def get_http_cache() -> Optional[HTTPCache]:
+    """获取全局共享的HTTP缓存，未启用时返回 None"""
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = HTTPCache.from_config() or False
+        return _shared_cache or None
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+职位ID生成
+Snowflake 风格的 53 位ID: 毫秒时间戳 | 工作进程号 | 序号，
+不重复、按生成顺序递增，并且在 JavaScript 中可以精确表示
+"""
+
+import os
+import time
+import atexit
+import threading
+import logging
+from pathlib import Path
+from typing import Optional
+
+from crawler_config import config
+
+# 2024-01-01 00:00:00 UTC，41 位毫秒时间戳可以用到 2093 年
+EPOCH_MS = 1704067200000
+
+WORKER_BITS = 5
+SEQUENCE_BITS = 7
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+TIMESTAMP_SHIFT = WORKER_BITS + SEQUENCE_BITS
+
+logger = logging.getLogger('crawler.id_generator')
+
+def claim_worker_id(lock_dir) -> int:
+    """在 lock_dir 中独占创建锁文件，为当前进程分配一个未被占用的工作进程号
+
+    锁文件记录持有者的进程号，持有者已退出的锁可以被接管；
+    全部被占用时退回到进程号取模，并记录警告。
+    """
+    lock_dir = Path(lock_dir)
+    lock_dir.mkdir(parents=True, exist_ok=True)
+    pid = os.getpid()
+
+    for offset in range(MAX_WORKER_ID + 1):
+        worker_id = (pid + offset) % (MAX_WORKER_ID + 1)
+        lock_file = lock_dir / f'worker-{worker_id}.lock'
+        for _ in range(2):
+            try:
+                fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if _lock_is_stale(lock_file):
+                    lock_file.unlink(missing_ok=True)
+                    continue
+                break
+            with os.fdopen(fd, 'w') as f:
+                f.write(str(pid))
+            atexit.register(_release_worker_id, lock_file, pid)
+            return worker_id
+
+    logger.warning('工作进程号已全部占用，按进程号分配，多进程同时生成时可能重复')
+    return pid % (MAX_WORKER_ID + 1)
+
+def _lock_is_stale(lock_file: Path) -> bool:
+    try:
+        owner = int(lock_file.read_text().strip())
+    except (OSError, ValueError):
+        # 刚创建还没写入进程号，当作仍被占用
+        return False
+    if owner == os.getpid():
+        # fork 出的子进程继承了父进程的号，父进程仍在使用
+        return False
+    try:
+        os.kill(owner, 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+def _release_worker_id(lock_file: Path, pid: int):
+    if os.getpid() != pid:
+        return
+    try:
+        if lock_file.read_text().strip() == str(pid):
+            lock_file.unlink()
+    except OSError:
+        pass
+
+class IdGenerator:
+    """线程安全的ID生成器
+
+    同一毫秒内序号递增，序号用完或系统时钟回拨时借用下一毫秒，
+    保证同一进程生成的ID严格递增。不同进程通过工作进程号区分，
+    fork 出的子进程在第一次生成时重新分配工作进程号。
+    """
+
+    def __init__(self, worker_id: Optional[int] = None, lock_dir='data/worker_ids'):
+        self.lock_dir = lock_dir
+        self._fixed_worker_id = worker_id
+        self._lock = threading.Lock()
+        self._pid = None
+        self.worker_id = 0
+        self._last_ms = 0
+        self._sequence = 0
+
+    def _init_process(self):
+        """当前进程第一次生成ID时分配工作进程号"""
+        if self._fixed_worker_id is not None:
+            if not 0 <= self._fixed_worker_id <= MAX_WORKER_ID:
+                raise ValueError(f'工作进程号必须在 0-{MAX_WORKER_ID} 之间: {self._fixed_worker_id}')
+            self.worker_id = self._fixed_worker_id
+        else:
+            self.worker_id = claim_worker_id(self.lock_dir)
+        self._pid = os.getpid()
+        self._last_ms = 0
+        self._sequence = 0
+
+    def next_id(self) -> int:
+        with self._lock:
+            if self._pid != os.getpid():
+                self._init_process()
+
+            now_ms = int(time.time() * 1000) - EPOCH_MS
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._sequence = 0
+            else:
+                self._sequence += 1
+                if self._sequence > MAX_SEQUENCE:
+                    self._last_ms += 1
+                    self._sequence = 0
+
+            return (self._last_ms << TIMESTAMP_SHIFT) | (self.worker_id << SEQUENCE_BITS) | self._sequence
+
+_shared_generator = None
+_shared_lock = threading.Lock()
+
+def get_id_generator() -> IdGenerator:
+    """获取全局共享的ID生成器
+
+    工作进程号依次取自环境变量 CRAWLER_WORKER_ID、配置 id_generator.worker_id，
+    都没有设置时自动分配。
+    """
+    global _shared_generator
+    with _shared_lock:
+        if _shared_generator is None:
+            worker_id = os.environ.get('CRAWLER_WORKER_ID', config.get('id_generator.worker_id'))
+            _shared_generator = IdGenerator(
+                worker_id=int(worker_id) if worker_id is not None else None,
+                lock_dir=config.get('id_generator.lock_dir', 'data/worker_ids')
+            )
+        return _shared_generator
+
+def next_job_id() -> int:
+    return get_id_generator().next_id()
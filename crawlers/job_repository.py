@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+职位数据仓库
+基于 SQLite 保存全部职位，常用筛选字段建立索引，筛选和统计直接走索引查询
+"""
+
+import json
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional, Set
+
+class JobRepository:
+    """SQLite职位仓库，内推码唯一，重复写入会被忽略"""
+
+    COLUMNS = ('id', 'title', 'company', 'type', 'direction', 'source',
+               'code', 'date', 'description', 'requirements', 'sources', 'codes')
+    INSERT_COLUMNS = COLUMNS + ('signature', 'crawl_id')
+    INSERT_SQL = (f'INSERT OR IGNORE INTO jobs ({", ".join(INSERT_COLUMNS)}) '
+                  f'VALUES ({", ".join("?" * len(INSERT_COLUMNS))})')
+
+    # 允许分组统计和排序的字段，防止拼接任意SQL
+    INDEXED_COLUMNS = ('code', 'source', 'type', 'direction', 'company', 'date')
+    FILTER_COLUMNS = INDEXED_COLUMNS + ('crawl_id',)
+
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY,
+            title TEXT NOT NULL,
+            company TEXT,
+            type TEXT,
+            direction TEXT,
+            source TEXT,
+            code TEXT NOT NULL,
+            date TEXT,
+            description TEXT,
+            requirements TEXT,
+            crawl_id TEXT,
+            sources TEXT,
+            signature BLOB,
+            codes TEXT
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_code ON jobs(code);
+        CREATE INDEX IF NOT EXISTS idx_jobs_source ON jobs(source);
+        CREATE INDEX IF NOT EXISTS idx_jobs_type ON jobs(type);
+        CREATE INDEX IF NOT EXISTS idx_jobs_direction ON jobs(direction);
+        CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs(company);
+        CREATE INDEX IF NOT EXISTS idx_jobs_date ON jobs(date);
+        CREATE INDEX IF NOT EXISTS idx_jobs_crawl_id ON jobs(crawl_id);
+    '''
+
+    def __init__(self, db_path='data/jobs.db'):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.logger = logging.getLogger('crawler.repository')
+        # SQLite 同一时间只允许一个写事务，多线程写入时在进程内排队
+        self._write_lock = threading.Lock()
+
+        with self.connect() as conn:
+            conn.executescript(self.SCHEMA)
+            self._migrate(conn)
+
+    # 后来新增的字段，旧数据库启动时补上
+    ADDED_COLUMNS = {'sources': 'TEXT', 'signature': 'BLOB', 'codes': 'TEXT'}
+
+    def _migrate(self, conn):
+        existing = {row['name'] for row in conn.execute('PRAGMA table_info(jobs)')}
+        for column, column_type in self.ADDED_COLUMNS.items():
+            if column not in existing:
+                conn.execute(f'ALTER TABLE jobs ADD COLUMN {column} {column_type}')
+
+    @contextmanager
+    def connect(self):
+        """打开连接，正常退出时提交事务"""
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _to_row(job: Dict, crawl_id: Optional[str]) -> tuple:
+        return (
+            job['id'], job['title'], job.get('company'), job.get('type'),
+            job.get('direction'), job.get('source'), job['code'], job.get('date'),
+            job.get('description', ''),
+            json.dumps(job.get('requirements', []), ensure_ascii=False),
+            json.dumps(job.get('sources') or [job.get('source')], ensure_ascii=False),
+            json.dumps(job.get('codes') or [job['code']], ensure_ascii=False),
+            job.get('signature'),
+            crawl_id,
+        )
+
+    @classmethod
+    def _to_dict(cls, row: sqlite3.Row) -> Dict:
+        job = {column: row[column] for column in cls.COLUMNS}
+        job['requirements'] = json.loads(job['requirements'] or '[]')
+        job['sources'] = json.loads(job['sources']) if job['sources'] else [job['source']]
+        job['codes'] = json.loads(job['codes']) if job['codes'] else [job['code']]
+        return job
+
+    def add_jobs(self, jobs: Iterable[Dict], crawl_id: Optional[str] = None,
+                 batch_size: int = 1000) -> int:
+        """在一个事务内批量写入职位，返回新增数量"""
+        added = 0
+        with self._write_lock, self.connect() as conn:
+            before = conn.total_changes
+            batch = []
+            for job in jobs:
+                batch.append(self._to_row(job, crawl_id))
+                if len(batch) >= batch_size:
+                    conn.executemany(self.INSERT_SQL, batch)
+                    batch = []
+            if batch:
+                conn.executemany(self.INSERT_SQL, batch)
+            added = conn.total_changes - before
+
+        self.logger.info(f'写入职位仓库: 新增 {added} 个')
+        return added
+
+    def existing_codes(self, codes: Iterable[str], batch_size: int = 500) -> Set[str]:
+        """返回已经写入仓库的内推码，这些职位再次写入时会被 INSERT OR IGNORE 忽略"""
+        codes = list(codes)
+        found = set()
+        with self.connect() as conn:
+            for start in range(0, len(codes), batch_size):
+                batch = codes[start:start + batch_size]
+                sql = f'SELECT code FROM jobs WHERE code IN ({", ".join("?" * len(batch))})'
+                found.update(row['code'] for row in conn.execute(sql, batch))
+        return found
+
+    def _where(self, since: Optional[str] = None, filters: Dict[str, str] = None,
+               until: Optional[str] = None):
+        clauses, params = [], []
+        if since:
+            clauses.append('date >= ?')
+            params.append(since)
+        if until:
+            clauses.append('date < ?')
+            params.append(until)
+        for column, value in (filters or {}).items():
+            if column not in self.FILTER_COLUMNS:
+                raise ValueError(f'不支持的筛选字段: {column}')
+            clauses.append(f'{column} = ?')
+            params.append(value)
+        where = f' WHERE {" AND ".join(clauses)}' if clauses else ''
+        return where, params
+
+    def iter_jobs(self, since: Optional[str] = None, filters: Dict[str, str] = None,
+                  order_by: str = 'date', descending: bool = True,
+                  until: Optional[str] = None) -> Iterator[Dict]:
+        """按索引顺序逐条读取职位，日期范围为 [since, until)"""
+        if order_by not in self.INDEXED_COLUMNS + ('id',):
+            raise ValueError(f'不支持的排序字段: {order_by}')
+
+        where, params = self._where(since, filters, until)
+        direction = 'DESC' if descending else 'ASC'
+        sql = f'SELECT * FROM jobs{where} ORDER BY {order_by} {direction}, id {direction}'
+
+        with self.connect() as conn:
+            for row in conn.execute(sql, params):
+                yield self._to_dict(row)
+
+    def iter_signatures(self, since: Optional[str] = None) -> Iterator[Dict]:
+        """读取近似去重需要的字段，旧数据没有签名时带上标题和描述供重新计算"""
+        where, params = self._where(since)
+        sql = ('SELECT id, company, type, direction, source, sources, code, codes, signature, '
+               'CASE WHEN signature IS NULL THEN title END AS title, '
+               f'CASE WHEN signature IS NULL THEN description END AS description FROM jobs{where}')
+        with self.connect() as conn:
+            for row in conn.execute(sql, params):
+                job = dict(row)
+                job['sources'] = json.loads(job['sources']) if job['sources'] else [job['source']]
+                job['codes'] = json.loads(job['codes']) if job['codes'] else [job['code']]
+                yield job
+
+    def update_sources(self, merged: Dict[int, Dict[str, list]]) -> int:
+        """回写合并后的来源列表和内推码列表，merged 为 {id: {'sources': [...], 'codes': [...]}}"""
+        with self._write_lock, self.connect() as conn:
+            conn.executemany('UPDATE jobs SET sources = ?, codes = ? WHERE id = ?', [
+                (json.dumps(job['sources'], ensure_ascii=False), json.dumps(job['codes'], ensure_ascii=False), job_id)
+                for job_id, job in merged.items()
+            ])
+        return len(merged)
+
+    def count(self, since: Optional[str] = None, filters: Dict[str, str] = None) -> int:
+        """统计职位数量"""
+        where, params = self._where(since, filters)
+        with self.connect() as conn:
+            return conn.execute(f'SELECT COUNT(*) FROM jobs{where}', params).fetchone()[0]
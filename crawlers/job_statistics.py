@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+职位统计聚合器
+按来源/类型/方向/公司/日期维护计数器，随职位新增和过期增量更新，状态持久化到磁盘
+"""
+
+import os
+import json
+import logging
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+class StatisticsAggregator:
+    """增量统计聚合器
+
+    每次运行只需加上新增职位、减去移出展示窗口的职位，
+    即可得到与全量扫描相同的统计结果。
+    """
+
+    FIELDS = {
+        'by_source': 'source',
+        'by_type': 'type',
+        'by_direction': 'direction',
+        'by_company': 'company',
+    }
+
+    def __init__(self, state_file=None):
+        self.state_file = Path(state_file) if state_file else None
+        self.logger = logging.getLogger('crawler.statistics')
+        self.reset()
+
+    def reset(self, window_start: Optional[str] = None):
+        """清空计数器"""
+        self.total = 0
+        self.counters = {key: Counter() for key in self.FIELDS}
+        self.by_date = Counter()
+        # 统计范围内最早的发布日期，早于该日期的职位已被移出
+        self.window_start = window_start
+
+    def add(self, job: Dict):
+        """计入一个职位"""
+        self.total += 1
+        for key, field in self.FIELDS.items():
+            self.counters[key][job.get(field) or '未知'] += 1
+        self.by_date[job.get('date') or '未知'] += 1
+
+    def remove(self, job: Dict):
+        """移除一个职位，计数归零的项会被删除"""
+        self.total -= 1
+        for key, field in self.FIELDS.items():
+            self._decrement(self.counters[key], job.get(field) or '未知')
+        self._decrement(self.by_date, job.get('date') or '未知')
+
+    @staticmethod
+    def _decrement(counter: Counter, value: str):
+        counter[value] -= 1
+        if counter[value] <= 0:
+            del counter[value]
+
+    def add_all(self, jobs: Iterable[Dict]) -> int:
+        """计入多个职位，返回数量"""
+        count = 0
+        for job in jobs:
+            self.add(job)
+            count += 1
+        return count
+
+    def remove_all(self, jobs: Iterable[Dict]) -> int:
+        """移除多个职位，返回数量"""
+        count = 0
+        for job in jobs:
+            self.remove(job)
+            count += 1
+        return count
+
+    def snapshot(self, today: Optional[str] = None) -> Dict:
+        """生成 statistics.json 格式的统计结果，各分布按数量从多到少排列"""
+        today = today or datetime.now().strftime('%Y-%m-%d')
+        stats = {
+            'total_jobs': self.total,
+            'update_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        for key in self.FIELDS:
+            stats[key] = dict(self.counters[key].most_common())
+        stats['today_jobs'] = self.by_date.get(today, 0)
+        return stats
+
+    def load(self) -> bool:
+        """加载持久化状态，文件不存在或损坏时返回 False"""
+        if not self.state_file or not self.state_file.exists():
+            return False
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.total = state['total']
+            self.counters = {key: Counter(state[key]) for key in self.FIELDS}
+            self.by_date = Counter(state['by_date'])
+            self.window_start = state.get('window_start')
+            return True
+        except Exception as e:
+            self.logger.warning(f'读取统计状态失败: {e}')
+            self.reset()
+            return False
+
+    def save(self):
+        """原子写入持久化状态"""
+        if not self.state_file:
+            return
+        state = {
+            'total': self.total,
+            'window_start': self.window_start,
+            'by_date': dict(self.by_date),
+        }
+        for key in self.FIELDS:
+            state[key] = dict(self.counters[key])
+
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.state_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_file, self.state_file)
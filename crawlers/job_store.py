@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+追加写入的职位存储
+职位以 JSONL 分段追加保存，内推码索引用于去重，压缩时通过原子重命名替换
+"""
+
+import os
+import json
+import threading
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Set
+
+class JobStore:
+    """追加写入的职位存储
+
+    目录结构:
+        segment-000001.jsonl  每行一个职位，写满后滚动到下一个分段
+        codes.idx             已保存的内推码，每行一个，随分段一起追加
+
+    写入N个新职位的开销为 O(N)，与已有数据量无关；读取时逐行流式解析。
+    """
+
+    SEGMENT_PREFIX = 'segment-'
+    INDEX_FILE = 'codes.idx'
+
+    def __init__(self, store_dir, segment_max_bytes: int = 4 * 1024 * 1024):
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.index_path = self.store_dir / self.INDEX_FILE
+        self.logger = logging.getLogger('crawler.job_store')
+
+        self._lock = threading.Lock()
+        self.codes = self._load_codes()
+
+    def _segments(self) -> List[Path]:
+        return sorted(self.store_dir.glob(f'{self.SEGMENT_PREFIX}*.jsonl'))
+
+    def _segment_path(self, number: int) -> Path:
+        return self.store_dir / f'{self.SEGMENT_PREFIX}{number:06d}.jsonl'
+
+    def _active_segment(self) -> Path:
+        """返回当前写入的分段，超过大小上限时滚动到新分段"""
+        segments = self._segments()
+        if not segments:
+            return self._segment_path(1)
+
+        last = segments[-1]
+        if last.stat().st_size < self.segment_max_bytes:
+            return last
+        return self._segment_path(int(last.stem[len(self.SEGMENT_PREFIX):]) + 1)
+
+    def _repair_tail(self, path: Path, block_size: int = 64 * 1024):
+        """截掉崩溃时留下的不完整最后一行，否则下一次追加会接在它后面，两行都无法解析"""
+        if not path.exists():
+            return
+        with open(path, 'rb+') as f:
+            end = f.seek(0, os.SEEK_END)
+            if end == 0:
+                return
+            f.seek(end - 1)
+            if f.read(1) == b'\n':
+                return
+
+            # 从后往前按块查找最后一个换行符
+            position = end
+            while position > 0:
+                start = max(0, position - block_size)
+                f.seek(start)
+                newline = f.read(position - start).rfind(b'\n')
+                if newline >= 0:
+                    position = start + newline + 1
+                    break
+                position = start
+            f.truncate(position)
+            f.flush()
+            os.fsync(f.fileno())
+        self.logger.warning(f'已截掉 {path} 末尾不完整的 {end - position} 字节')
+
+    def _load_codes(self) -> Set[str]:
+        """加载内推码索引，索引缺失时从分段重建"""
+        if self.index_path.exists():
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return {line.rstrip('\n') for line in f if line.strip()}
+
+        codes = {job.get('code', '') for job in self.iter_jobs()}
+        if codes:
+            self._write_index(codes)
+        return codes
+
+    def _write_index(self, codes: Iterable[str]):
+        tmp_path = self.index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for code in codes:
+                f.write(code + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.index_path)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @property
+    def segment_count(self) -> int:
+        return len(self._segments())
+
+    def __contains__(self, code: str) -> bool:
+        return code in self.codes
+
+    def append(self, jobs: Iterable[Dict]) -> List[Dict]:
+        """追加新职位（基于内推码去重），返回实际写入的职位"""
+        with self._lock:
+            new_jobs = []
+            new_codes = set()
+            for job in jobs:
+                code = job.get('code', '')
+                if code in self.codes or code in new_codes:
+                    continue
+                new_codes.add(code)
+                new_jobs.append(job)
+
+            if not new_jobs:
+                return []
+
+            # 先写数据再写索引；中途崩溃时最多导致重复行，读取和压缩时会去重
+            segment = self._active_segment()
+            self._repair_tail(segment)
+            with open(segment, 'a', encoding='utf-8') as f:
+                for job in new_jobs:
+                    f.write(json.dumps(job, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+            self._repair_tail(self.index_path)
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                for job in new_jobs:
+                    f.write(job.get('code', '') + '\n')
+
+            # 写入成功后才记为已保存，写入失败时重试不会被当作重复跳过
+            self.codes.update(new_codes)
+            return new_jobs
+
+    def iter_jobs(self) -> Iterator[Dict]:
+        """按写入顺序逐行读取职位，跳过损坏的行和重复的内推码"""
+        seen = set()
+        for segment in self._segments():
+            with open(segment, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        job = json.loads(line)
+                    except ValueError:
+                        # 崩溃时可能留下不完整的最后一行
+                        continue
+                    code = job.get('code', '')
+                    if code in seen:
+                        continue
+                    seen.add(code)
+                    yield job
+
+    def compact(self):
+        """把所有分段合并为一个，写完后原子替换旧分段"""
+        with self._lock:
+            segments = self._segments()
+            if len(segments) <= 1:
+                return
+
+            tmp_path = self.store_dir / 'compact.tmp'
+            codes = []
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for job in self.iter_jobs():
+                    f.write(json.dumps(job, ensure_ascii=False) + '\n')
+                    codes.append(job.get('code', ''))
+                f.flush()
+                os.fsync(f.fileno())
+
+            os.replace(tmp_path, segments[0])
+            for segment in segments[1:]:
+                segment.unlink()
+            self._write_index(codes)
+            self.codes = set(codes)
+
+            self.logger.info(f'已压缩 {len(segments)} 个分段: {self.store_dir}')
+
+    def import_json(self, json_file) -> int:
+        """导入旧版整文件JSON数据"""
+        with open(json_file, 'r', encoding='utf-8') as f:
+            return len(self.append(json.load(f)))
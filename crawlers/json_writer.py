@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流式JSON写入
+逐条写出JSON数组，同时写入多个文件，完成后原子替换目标文件
+"""
+
+import os
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+class JsonArrayWriter:
+    """把数据逐条写成JSON数组，输出格式与 json.dump(..., indent=2) 相同
+
+    indent 为 None 时输出不带缩进和空白的紧凑格式。写入临时文件，全部完成后再替换目标文件，读取方不会看到写了一半的数据。
+    """
+
+    def __init__(self, paths: List, indent: int = 2):
+        self.paths = [Path(path) for path in paths]
+        self.indent = indent
+        self.count = 0
+        self._files = []
+
+    def __enter__(self):
+        for path in self.paths:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._files.append(open(self._tmp_path(path), 'w', encoding='utf-8'))
+        self._write('[')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self._write('\n]' if self.count and self.indent is not None else ']')
+        for f in self._files:
+            f.close()
+
+        for path in self.paths:
+            if exc_type is None:
+                os.replace(self._tmp_path(path), path)
+            else:
+                os.remove(self._tmp_path(path))
+        return False
+
+    @staticmethod
+    def _tmp_path(path: Path) -> Path:
+        return path.with_name(path.name + '.tmp')
+
+    def _write(self, text: str):
+        for f in self._files:
+            f.write(text)
+
+    def write(self, item: Dict):
+        """写入一条数据"""
+        if self.indent is None:
+            text = json.dumps(item, ensure_ascii=False, separators=(',', ':'))
+            self._write(text if self.count == 0 else ',' + text)
+            self.count += 1
+            return
+
+        text = json.dumps(item, ensure_ascii=False, indent=self.indent)
+        pad = ' ' * self.indent
+        text = '\n'.join(pad + line for line in text.split('\n'))
+        self._write(('\n' if self.count == 0 else ',\n') + text)
+        self.count += 1
+
+def write_json_array(paths: List, items: Iterable[Dict], compact_paths: List = ()) -> int:
+    """单次遍历把数据流写入多个JSON文件，compact_paths 中的文件使用紧凑格式，返回写入数量"""
+    with JsonArrayWriter(paths) as writer, JsonArrayWriter(compact_paths, indent=None) as compact:
+        for item in items:
+            writer.write(item)
+            compact.write(item)
+    return writer.count
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+关键词分类器
+各类别的关键词在导入时编译成正则，替代逐个关键词的 in 查找
+"""
+
+import re
+from typing import Sequence, Tuple
+
+class KeywordClassifier:
+    """多类别关键词匹配
+
+    categories 按优先级排列，classify 返回命中的优先级最高的类别，
+    结果与依次执行 any(word in text for word in words) 相同。
+
+    每个类别的关键词在导入时编译成一个正则，按优先级依次查找，命中即返回。
+    """
+
+    def __init__(self, categories: Sequence[Tuple[str, Sequence[str]]], default: str):
+        self.default = default
+        # 长词在前，避免短词先匹配后跳过长词
+        self.patterns = [
+            (label, re.compile('|'.join(
+                re.escape(word.lower()) for word in sorted(words, key=len, reverse=True)
+            )))
+            for label, words in categories
+        ]
+
+    def classify(self, text: str) -> str:
+        """返回优先级最高的类别，没有命中时返回默认类别"""
+        text = text.lower()
+        for label, pattern in self.patterns:
+            if pattern.search(text):
+                return label
+        return self.default
+
+JOB_TYPE_CLASSIFIER = KeywordClassifier([
+    ('校招', ['校招', '秋招', '春招', '校园招聘', '应届']),
+    ('实习', ['实习', '暑期', '寒假']),
+], default='社招')
+
+DIRECTION_CLASSIFIER = KeywordClassifier([
+    ('前端', ['前端', 'frontend', 'react', 'vue', 'angular', 'javascript', 'html', 'css']),
+    ('后端', ['后端', 'backend', 'java', 'python', 'go', 'node.js', 'spring', 'django']),
+    ('算法', ['算法', 'algorithm', '机器学习', 'ai', '深度学习', 'nlp', 'cv']),
+    ('数据', ['数据', 'data', '分析师', 'bi', 'sql', '数据库']),
+    ('产品', ['产品', 'product', '产品经理', 'pm']),
+    ('测试', ['测试', 'test', 'qa', '质量']),
+], default='其他')
@@ -9,18 +9,19 @@ import re
 import json
 from typing import List
 from base_crawler import BaseCrawler, JobData
+from extractors import extract_post_fields
 
 class LeetcodeCrawler(BaseCrawler):
     """力扣爬虫"""
     
+    platform_key = 'leetcode'
+    
     def __init__(self):
         super().__init__('力扣')
         self.base_url = 'https://leetcode.cn'
         
     def crawl(self) -> List[JobData]:
         """爬取力扣内推信息"""
-        jobs = []
-        
         # 力扣讨论区的内推相关话题
         topics = [
             'interview',  # 面试
@@ -28,17 +29,7 @@ class LeetcodeCrawler(BaseCrawler):
             'internship'  # 实习
         ]
         
-        for topic in topics:
-            try:
-                self.logger.info(f'爬取话题: {topic}')
-                topic_jobs = self.crawl_topic(topic)
-                jobs.extend(topic_jobs)
-                self.random_delay(2, 4)
-            except Exception as e:
-                self.logger.error(f'爬取话题 {topic} 失败: {e}')
-                continue
-                
-        return jobs
+        return self.crawl_units(topics, self.crawl_topic, '爬取话题')
     
     def crawl_topic(self, topic: str) -> List[JobData]:
         """爬取特定话题的内推信息"""
@@ -78,14 +69,10 @@ class LeetcodeCrawler(BaseCrawler):
             }
         ]
         
-        for discussion in sample_discussions:
-            try:
-                job = self.parse_discussion(discussion)
-                if job:
-                    jobs.append(job)
-            except Exception as e:
-                self.logger.error(f'解析讨论失败: {e}')
-                continue
+        # 解析和分类按配置在解析进程池中进行，失败的为 None
+        for job in self.parse_payloads('parse_discussion', sample_discussions, '解析讨论失败'):
+            if job:
+                jobs.append(job)
                 
         return jobs
     
@@ -151,35 +138,37 @@ class LeetcodeCrawler(BaseCrawler):
         requirements = []
         
         # 分析内容中的技能要求
-        content_lower = content.lower()
+        languages = ['java', 'python', 'go', 'javascript', 'c++', 'react', 'vue', 'spring']
+        fields = extract_post_fields(
+            content, ('experience', 'degrees', 'skills'),
+            skills=languages + ['分布式', '深度学习', '移动端', '自动化', 'sql']
+        )
+        skills = fields['skills']
         
         # 编程语言要求
-        languages = ['java', 'python', 'go', 'javascript', 'c++', 'react', 'vue', 'spring']
         for lang in languages:
-            if lang in content_lower:
+            if lang in skills:
                 requirements.append(f'熟悉{lang.title()}')
         
         # 经验要求
-        experience_pattern = r'(\d+年以上?.+?经验)'
-        exp_matches = re.findall(experience_pattern, content, re.IGNORECASE)
-        requirements.extend(exp_matches[:2])
+        requirements.extend(fields['experience'][:2])
         
         # 学历要求
-        if any(word in content for word in ['硕士', '研究生']):
+        if '硕士' in fields['degrees']:
             requirements.append('硕士及以上学历')
-        elif any(word in content for word in ['本科', '学士']):
+        elif '本科' in fields['degrees']:
             requirements.append('本科及以上学历')
         
         # 通用要求
-        if '分布式' in content:
+        if '分布式' in skills:
             requirements.append('有分布式系统经验')
-        if '深度学习' in content:
+        if '深度学习' in skills:
             requirements.append('熟悉深度学习框架')
-        if '移动端' in content:
+        if '移动端' in skills:
             requirements.append('有移动端开发经验')
-        if '自动化' in content:
+        if '自动化' in skills:
             requirements.append('有自动化测试经验')
-        if 'sql' in content_lower:
+        if 'sql' in skills:
             requirements.append('熟悉SQL和数据库')
         
         # 如果没有找到要求，添加默认要求
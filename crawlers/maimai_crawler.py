@@ -13,14 +13,14 @@ from base_crawler import BaseCrawler, JobData
 class MaimaiCrawler(BaseCrawler):
     """脉脉爬虫"""
     
+    platform_key = 'maimai'
+    
     def __init__(self):
         super().__init__('脉脉')
         self.base_url = 'https://maimai.cn'
         
     def crawl(self) -> List[JobData]:
         """爬取脉脉内推信息"""
-        jobs = []
-        
         # 脉脉的求职板块
         sections = [
             'job_referral',  # 内推
@@ -29,17 +29,7 @@ class MaimaiCrawler(BaseCrawler):
             'internship'      # 实习
         ]
         
-        for section in sections:
-            try:
-                self.logger.info(f'爬取板块: {section}')
-                section_jobs = self.crawl_section(section)
-                jobs.extend(section_jobs)
-                self.random_delay(2, 4)
-            except Exception as e:
-                self.logger.error(f'爬取板块 {section} 失败: {e}')
-                continue
-                
-        return jobs
+        return self.crawl_units(sections, self.crawl_section, '爬取板块')
     
     def crawl_section(self, section: str) -> List[JobData]:
         """爬取特定板块的内推信息"""
@@ -94,14 +84,10 @@ class MaimaiCrawler(BaseCrawler):
             }
         ]
         
-        for post in sample_posts:
-            try:
-                job = self.parse_post(post)
-                if job:
-                    jobs.append(job)
-            except Exception as e:
-                self.logger.error(f'解析帖子失败: {e}')
-                continue
+        # 解析和分类按配置在解析进程池中进行，失败的为 None
+        for job in self.parse_payloads('parse_post', sample_posts, '解析帖子失败'):
+            if job:
+                jobs.append(job)
                 
         return jobs
     
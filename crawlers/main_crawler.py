@@ -9,21 +9,39 @@ import os
 import sys
 import json
 import time
+import queue
+import shutil
 import logging
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Set, Tuple
 
 # 添加当前目录到Python路径
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from base_crawler import JobData
+from crawler_config import config
+from job_repository import JobRepository
+from json_writer import write_json_array
+from shard_exporter import ShardExporter
+from precompress import compress_file, write_data_file
+from dedup import JobDeduplicator
+from id_generator import next_job_id
+from parse_pool import get_parse_pool, resolve_workers
+from crawl_scheduler import CrawlScheduler, ScheduledTask
+import columnar_snapshot
+from job_statistics import StatisticsAggregator
 from nowcoder_crawler import NowcoderCrawler
 from leetcode_crawler import LeetcodeCrawler
 from xiaohongshu_crawler import XiaohongshuCrawler
 from maimai_crawler import MaimaiCrawler
 from real_data_crawler import RealDataCrawler
 
+# 网站数据的代数，每次写完网站数据后递增，查询服务据此重建索引（见 job_index.py）
+GENERATION_FILE = 'generation.json'
+
 class MainCrawler:
     """主爬虫管理器"""
     
@@ -41,114 +59,364 @@ class MainCrawler:
         self.data_dir = Path('data')
         self.data_dir.mkdir(exist_ok=True)
         
+        # 全部职位保存在 SQLite 仓库中，网站数据和统计由仓库查询生成
+        self.repository = JobRepository(self.data_dir / 'jobs.db')
+        
+        # 统计计数器随每次新增/过期的职位增量更新
+        self.statistics = StatisticsAggregator(self.data_dir / 'statistics_state.json')
+        
         # 确保前端数据目录存在
         self.frontend_data_dir = Path('../data')
         self.frontend_data_dir.mkdir(exist_ok=True)
+        
+        # 调度模式下各平台独立完成，入库和导出网站数据依次进行
+        self._merge_lock = threading.Lock()
+        self._last_cleanup = None
     
-    def run_all_crawlers(self) -> Dict[str, List[JobData]]:
-        """运行所有爬虫"""
-        self.logger.info('开始运行所有爬虫...')
-        start_time = time.time()
+    def run_all_crawlers(self, concurrent: bool = None) -> Dict[str, List[JobData]]:
+        """运行所有爬虫，返回各平台的全部职位"""
+        # 结果按平台注册顺序返回，与串行模式一致
+        all_jobs = {platform: [] for platform in self.crawlers}
+        for platform, jobs in self.iter_crawler_results(concurrent):
+            all_jobs[platform] = jobs
+        return all_jobs
+    
+    def iter_crawler_results(self, concurrent: bool = None) -> Iterator[Tuple[str, List[JobData]]]:
+        """运行所有爬虫，每个平台完成后立即产出 (平台, 职位列表)
+        
+        concurrent 为 None 时读取配置 concurrency.enable；并发模式下各平台同时运行，
+        总耗时约等于最慢的平台，单个平台失败不影响其他平台。
+        """
+        if concurrent is None:
+            concurrent = config.get('concurrency.enable', True)
         
-        all_jobs = {}
+        self.logger.info(f'开始运行所有爬虫 ({"并发" if concurrent else "串行"}模式)...')
+        start_time = time.time()
         total_jobs = 0
         
-        for platform, crawler in self.crawlers.items():
-            try:
-                self.logger.info(f'运行 {platform} 爬虫...')
-                jobs = crawler.run()
-                all_jobs[platform] = jobs
-                total_jobs += len(jobs)
-                
-                self.logger.info(f'{platform} 爬虫完成，获取 {len(jobs)} 个职位')
-                
-                # 休息一下再运行下一个爬虫
-                time.sleep(2)
-                
-            except Exception as e:
-                self.logger.error(f'{platform} 爬虫运行失败: {e}')
-                all_jobs[platform] = []
+        results = self._iter_concurrently() if concurrent else self._iter_sequentially()
+        for platform, jobs in results:
+            total_jobs += len(jobs)
+            yield platform, jobs
         
         end_time = time.time()
         duration = end_time - start_time
         
         self.logger.info(f'所有爬虫运行完成，总共获取 {total_jobs} 个职位，耗时 {duration:.2f} 秒')
+    
+    def _run_platform(self, platform: str) -> List[JobData]:
+        """运行单个爬虫，失败时返回空列表"""
+        crawler = self.crawlers[platform]
         
-        return all_jobs
+        try:
+            self.logger.info(f'运行 {platform} 爬虫...')
+            jobs = crawler.run()
+            self.logger.info(f'{platform} 爬虫完成，获取 {len(jobs)} 个职位')
+            return jobs
+        except Exception as e:
+            self.logger.error(f'{platform} 爬虫运行失败: {e}')
+            return []
+    
+    def _iter_sequentially(self) -> Iterator[Tuple[str, List[JobData]]]:
+        """依次运行各平台爬虫"""
+        for platform in self.crawlers:
+            yield platform, self._run_platform(platform)
+            
+            # 休息一下再运行下一个爬虫
+            time.sleep(2)
+    
+    def _iter_concurrently(self) -> Iterator[Tuple[str, List[JobData]]]:
+        """使用线程池同时运行各平台爬虫，按完成顺序产出结果"""
+        max_workers = config.get('concurrency.max_workers', len(self.crawlers))
+        
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='crawler') as executor:
+            futures = {
+                executor.submit(self._run_platform, platform): platform
+                for platform in self.crawlers
+            }
+            
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+    
+    def iter_backfill_results(self, since: str, until: Optional[str] = None) -> Iterator[Tuple[str, List[JobData]]]:
+        """各平台并行回填 [since, until] 内的历史职位，逐页产出 (平台, 职位列表)，until 为 None 时不限结束日期
+        
+        爬虫线程每交出一页就等待，直到调用方处理完这一页（写入仓库）才继续并记录检查点，
+        中断时已记录进度的页面都已入库；调用方提前结束时，爬虫在下一次交出页面时退出。
+        """
+        batches = queue.Queue()
+        closed = threading.Event()
+        
+        def make_sink(platform):
+            def sink(jobs):
+                if closed.is_set():
+                    raise RuntimeError('回填已中止')
+                if not jobs:
+                    return
+                saved = threading.Event()
+                batches.put((platform, jobs, saved))
+                while not saved.wait(1.0):
+                    if closed.is_set():
+                        raise RuntimeError('回填已中止')
+            return sink
+        
+        def run_platform(platform):
+            crawler = self.crawlers[platform]
+            try:
+                self.logger.info(f'回填 {platform}: {since} ~ {until or "最新"}')
+                crawler.backfill(since, until, make_sink(platform))
+                self.logger.info(f'{platform} 回填完成')
+            except Exception as e:
+                self.logger.error(f'{platform} 回填失败: {e}')
+            finally:
+                crawler.close()
+                batches.put((platform, None, None))
+        
+        with ThreadPoolExecutor(max_workers=len(self.crawlers), thread_name_prefix='backfill') as executor:
+            for platform in self.crawlers:
+                executor.submit(run_platform, platform)
+            
+            running = len(self.crawlers)
+            try:
+                while running:
+                    platform, jobs, saved = batches.get()
+                    if jobs is None:
+                        running -= 1
+                        continue
+                    yield platform, jobs
+                    saved.set()
+            finally:
+                closed.set()
+    
+    def backfill(self, since: str, until: Optional[str] = None):
+        """回填历史数据：深度翻页、逐页批量写入仓库，最后重新导出网站数据和统计
+        
+        解析进程数改用 parsing.backfill_workers；中断后用相同的日期范围重新运行即可从检查点继续。
+        until 为 None 时回填到最新，之后哪天重新运行都沿用同一个检查点。
+        """
+        self.logger.info(f'🚀 开始回填历史数据: {since} ~ {until or "最新"}')
+        start_time = time.time()
+        get_parse_pool().resize(resolve_workers(config.get('parsing.backfill_workers', 'auto')))
+        
+        total_jobs = self.merge_and_save_data(self.iter_backfill_results(since, until))
+        stats = self.generate_statistics()
+        
+        self.logger.info(f'✅ 回填完成，耗时 {time.time() - start_time:.0f} 秒')
+        return total_jobs, stats
+    
+    def run_scheduled(self, platform: str, deadline: float = None) -> int:
+        """调度器调用：运行单个平台，结果立即入库并更新网站数据和统计，返回导出的职位数量
+        
+        deadline 之后爬虫不再开始新的页面，未完成的翻页进度保留在检查点中；旧数据每天清理一次。
+        """
+        crawler = self.crawlers[platform]
+        crawler.deadline = deadline
+        try:
+            jobs = self._run_platform(platform)
+        finally:
+            crawler.deadline = None
+        
+        if not jobs:
+            self.logger.info(f'{platform} 没有获取到职位，不更新网站数据')
+            return 0
+        
+        with self._merge_lock:
+            total = self.merge_and_save_data({platform: jobs})
+            self.generate_statistics()
+            today = datetime.now().strftime('%Y-%m-%d')
+            if self._last_cleanup != today:
+                self.cleanup_old_data()
+                self._last_cleanup = today
+        return total
+    
+    def create_scheduler(self) -> CrawlScheduler:
+        """按 platforms.<平台>.schedule 为每个启用的平台创建调度任务，缺少的项使用 scheduler.default"""
+        default = config.get('scheduler.default', {})
+        tasks = []
+        for platform, crawler in self.crawlers.items():
+            key = f'platforms.{crawler.platform_key}'
+            if not config.get(f'{key}.enable', True):
+                self.logger.info(f'{platform} 未启用，不参与调度')
+                continue
+            tasks.append(ScheduledTask.from_config(platform, {**default, **config.get(f'{key}.schedule', {})}))
+        
+        max_workers = config.get('concurrency.max_workers', len(tasks))
+        return CrawlScheduler(tasks, self.run_scheduled, max_workers=max_workers)
+    
+    def jobs_since(self) -> str:
+        """网站展示的最早发布日期，由 data_processing.max_age_days 决定"""
+        max_age_days = config.get('data_processing.max_age_days', 60)
+        return (datetime.now() - timedelta(days=max_age_days)).strftime('%Y-%m-%d')
+    
+    def normalize_jobs(self, jobs: Iterable[JobData]) -> Iterator[Dict]:
+        """把职位对象转换为字典"""
+        for job in jobs:
+            yield job.to_dict()
+    
+    def dedup_jobs(self, jobs: Iterable[Dict], seen_codes: Set[str]) -> Iterator[Dict]:
+        """跳过本次运行中已出现过的内推码"""
+        for job in jobs:
+            if job['code'] in seen_codes:
+                continue
+            seen_codes.add(job['code'])
+            yield job
     
-    def merge_and_save_data(self, all_jobs: Dict[str, List[JobData]]):
-        """合并并保存所有数据"""
+    def create_deduplicator(self):
+        """创建近似去重器，并索引展示窗口内已有的职位"""
+        if not config.get('data_processing.enable_deduplication', True):
+            return None
+        
+        deduplicator = JobDeduplicator(config.get('data_processing.near_duplicate_threshold', 0.75))
+        loaded = deduplicator.load(self.repository.iter_signatures(since=self.jobs_since()))
+        self.logger.info(f'近似去重索引: {loaded} 个已有职位')
+        return deduplicator
+    
+    def merge_and_save_data(self, all_jobs) -> int:
+        """合并并保存所有数据
+        
+        all_jobs 可以是 {平台: 职位列表}，也可以是 iter_crawler_results 产出的数据流。
+        各平台结果依次经过 转换 → 内推码去重（本次运行和仓库中已有的） → 近似去重 → 写入仓库，不在内存中汇总全部职位；
+        近似重复的职位并入先出现的一条，来源记录在 sources 中，内推码记录在 codes 中；
+        最后从仓库按日期索引流式导出，单次遍历同时写入JSON文件和网站使用的日期分片，
+        写完后递增数据代数，通知查询服务重建索引。
+        返回导出的职位数量。
+        """
         self.logger.info('开始合并和保存数据...')
         
-        # 合并所有职位数据
-        merged_jobs = []
-        for platform, jobs in all_jobs.items():
-            for job in jobs:
-                merged_jobs.append(job.to_dict())
+        results = all_jobs.items() if isinstance(all_jobs, dict) else all_jobs
+        
+        # 每个平台的爬取结果在一个事务内批量写入仓库
+        # 同一秒内多次合并时时间字符串会重复，使用递增的唯一ID区分每次运行
+        crawl_id = str(next_job_id())
+        seen_codes = set()
+        deduplicator = self.create_deduplicator()
+        updated = 0
+        for platform, jobs in results:
+            jobs = list(self.dedup_jobs(self.normalize_jobs(jobs), seen_codes))
+            # 内推码已在仓库中的职位写入时会被忽略，先剔除，近似去重索引只登记真正写入的职位
+            stored = self.repository.existing_codes(job['code'] for job in jobs)
+            jobs = [job for job in jobs if job['code'] not in stored]
+            if deduplicator:
+                jobs = deduplicator.filter(jobs)
+            self.repository.add_jobs(jobs, crawl_id=crawl_id)
+            # 每批写入后立即回写合并的来源，回填在下一批开始前记录检查点，中断时不会丢失
+            if deduplicator and deduplicator.changed:
+                updated += self.repository.update_sources(deduplicator.changed)
+                deduplicator.changed.clear()
+        
+        if deduplicator:
+            self.logger.info(f'近似去重: 合并 {deduplicator.merged} 个重复职位，'
+                             f'{updated} 次新增来源或内推码')
         
-        # 按日期排序
-        merged_jobs.sort(key=lambda x: x['date'], reverse=True)
+        self.update_statistics(crawl_id)
         
         # 保存到数据文件
         today = datetime.now().strftime('%Y%m%d')
         
-        # 保存到爬虫数据目录
+        # 爬虫数据目录和前端数据目录（用于网站显示）
         crawler_data_file = self.data_dir / f'all_jobs_{today}.json'
-        with open(crawler_data_file, 'w', encoding='utf-8') as f:
-            json.dump(merged_jobs, f, ensure_ascii=False, indent=2)
-        
-        # 保存到前端数据目录（用于网站显示）
         frontend_data_file = self.frontend_data_dir / 'jobs.json'
-        with open(frontend_data_file, 'w', encoding='utf-8') as f:
-            json.dump(merged_jobs, f, ensure_ascii=False, indent=2)
+        # 网站数据使用紧凑格式，并生成预压缩副本
+        site_files = []
+        if config.get('output.shards.keep_jobs_json', True):
+            # 完整的 jobs.json 供不支持分片的旧页面使用
+            site_files.append(frontend_data_file)
+        precompress = config.get('output.precompress', True)
+        
+        # 从仓库按日期索引倒序读取展示窗口内的全部职位
+        jobs = self.repository.iter_jobs(since=self.jobs_since())
+        shards = None
+        if config.get('output.shards.enabled', True):
+            shards = ShardExporter(self.frontend_data_dir / 'shards',
+                                   config.get('output.shards.page_size', 100), precompress=precompress)
+            jobs = shards.track(jobs)
+        total = write_json_array([crawler_data_file], jobs, compact_paths=site_files)
+        if shards:
+            shards.finish()
+        if precompress:
+            for site_file in site_files:
+                compress_file(site_file)
+        
+        self.logger.info(f'数据保存完成: {total} 个职位')
+        for json_file in [crawler_data_file, *site_files]:
+            self.logger.info(f'数据文件: {json_file}')
+        
+        self.publish_generation(total)
         
-        self.logger.info(f'数据保存完成: {len(merged_jobs)} 个职位')
-        self.logger.info(f'爬虫数据文件: {crawler_data_file}')
-        self.logger.info(f'前端数据文件: {frontend_data_file}')
+        if config.get('output.columnar_snapshot', False):
+            self.export_columnar_snapshot(self.data_dir / f'all_jobs_{today}{columnar_snapshot.SNAPSHOT_SUFFIX}')
         
-        return merged_jobs
+        return total
     
-    def generate_statistics(self, merged_jobs: List[Dict]):
-        """生成统计信息"""
-        self.logger.info('生成统计信息...')
+    def publish_generation(self, total: int) -> int:
+        """网站数据全部写完后递增数据代数，正在运行的查询服务几秒内换上新索引
         
-        stats = {
-            'total_jobs': len(merged_jobs),
-            'update_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'by_source': {},
-            'by_type': {},
-            'by_direction': {},
-            'by_company': {},
-            'today_jobs': 0
-        }
+        代数文件最后写入并原子替换，服务读到新代数时它引用的数据都已就绪。
+        """
+        generation_file = self.frontend_data_dir / GENERATION_FILE
+        try:
+            with open(generation_file, 'r', encoding='utf-8') as f:
+                generation = int(json.load(f)['generation']) + 1
+        except (OSError, ValueError, KeyError, TypeError):
+            generation = 1
         
-        today = datetime.now().strftime('%Y-%m-%d')
+        write_data_file(generation_file, {
+            'generation': generation,
+            'updated_at': datetime.now().isoformat(),
+            'total': total
+        }, precompress=False)
+        self.logger.info(f'数据代数: {generation}')
+        return generation
+    
+    def export_columnar_snapshot(self, snapshot_file: Path):
+        """从仓库再读一遍展示窗口内的职位，导出列式快照
         
-        for job in merged_jobs:
-            # 按来源统计
-            source = job.get('source', '未知')
-            stats['by_source'][source] = stats['by_source'].get(source, 0) + 1
-            
-            # 按类型统计
-            job_type = job.get('type', '未知')
-            stats['by_type'][job_type] = stats['by_type'].get(job_type, 0) + 1
-            
-            # 按方向统计
-            direction = job.get('direction', '未知')
-            stats['by_direction'][direction] = stats['by_direction'].get(direction, 0) + 1
-            
-            # 按公司统计
-            company = job.get('company', '未知')
-            stats['by_company'][company] = stats['by_company'].get(company, 0) + 1
+        与JSON导出分开进行，未开启时JSON导出没有任何额外开销；导出失败不影响本次运行。
+        """
+        if not columnar_snapshot.available():
+            self.logger.warning('未安装 pyarrow，跳过列式快照导出')
+            return
+        
+        try:
+            count = columnar_snapshot.write_snapshot(
+                snapshot_file, self.repository.iter_jobs(since=self.jobs_since())
+            )
+            self.logger.info(f'列式快照: {snapshot_file} ({count} 个职位)')
+        except Exception as e:
+            self.logger.error(f'导出列式快照失败: {e}')
+    
+    def update_statistics(self, crawl_id: str):
+        """增量更新统计：移出过期职位，计入本次新增职位
+        
+        状态缺失、窗口回退或与仓库数量不一致时，从仓库全量重建一次。
+        """
+        since = self.jobs_since()
+        stats = self.statistics
+        
+        if stats.load() and stats.window_start and stats.window_start <= since:
+            expired = stats.remove_all(self.repository.iter_jobs(since=stats.window_start, until=since))
+            stats.window_start = since
+            added = stats.add_all(self.repository.iter_jobs(since=since, filters={'crawl_id': crawl_id}))
             
-            # 今日新增统计
-            if job.get('date') == today:
-                stats['today_jobs'] += 1
+            if stats.total == self.repository.count(since=since):
+                self.logger.info(f'统计增量更新: 新增 {added} 个，过期 {expired} 个')
+                stats.save()
+                return
+            self.logger.warning('统计状态与仓库不一致，重新全量统计')
+        
+        stats.reset(window_start=since)
+        stats.add_all(self.repository.iter_jobs(since=since))
+        stats.save()
+    
+    def generate_statistics(self):
+        """生成统计信息，直接读取增量维护的计数器"""
+        self.logger.info('生成统计信息...')
+        
+        stats = self.statistics.snapshot()
         
         # 保存统计信息
         stats_file = self.frontend_data_dir / 'statistics.json'
-        with open(stats_file, 'w', encoding='utf-8') as f:
-            json.dump(stats, f, ensure_ascii=False, indent=2)
+        write_data_file(stats_file, stats, precompress=config.get('output.precompress', True))
         
         self.logger.info(f'统计信息已保存到: {stats_file}')
         
@@ -193,12 +461,28 @@ class MainCrawler:
         cutoff_time = current_time - (keep_days * 24 * 60 * 60)
         
         cleaned_count = 0
-        for file_path in self.data_dir.glob('*.json'):
+        # 只清理按日期命名的职位文件（all_jobs_20250917.json 及同名的列式快照），
+        # checkpoints.json、statistics_state.json 等状态文件删除后增量爬取和统计会从头开始
+        old_files = [path for suffix in ('.json', columnar_snapshot.SNAPSHOT_SUFFIX)
+                     for path in self.data_dir.glob(f'*_jobs_[0-9]*{suffix}')]
+        for file_path in old_files:
             if file_path.stat().st_mtime < cutoff_time:
                 file_path.unlink()
                 cleaned_count += 1
                 self.logger.info(f'删除旧文件: {file_path.name}')
         
+        # 追加写入存储按目录清理，以目录内最后写入时间为准
+        store_root = self.data_dir / 'store'
+        if store_root.exists():
+            for store_dir in store_root.iterdir():
+                if not store_dir.is_dir():
+                    continue
+                last_write = max((f.stat().st_mtime for f in store_dir.iterdir()), default=0)
+                if last_write < cutoff_time:
+                    shutil.rmtree(store_dir)
+                    cleaned_count += 1
+                    self.logger.info(f'删除旧存储: {store_dir.name}')
+        
         if cleaned_count > 0:
             self.logger.info(f'已清理 {cleaned_count} 个旧数据文件')
         else:
@@ -209,21 +493,21 @@ class MainCrawler:
         self.logger.info('🚀 启动内推码爬虫系统')
         
         try:
-            # 1. 运行所有爬虫
-            all_jobs = self.run_all_crawlers()
+            # 1. 运行所有爬虫，结果以数据流形式交给后续步骤
+            all_jobs = self.iter_crawler_results()
             
-            # 2. 合并和保存数据
-            merged_jobs = self.merge_and_save_data(all_jobs)
+            # 2. 合并和保存数据（各平台完成后立即写入）
+            total_jobs = self.merge_and_save_data(all_jobs)
             
             # 3. 生成统计信息
-            stats = self.generate_statistics(merged_jobs)
+            stats = self.generate_statistics()
             
             # 4. 清理旧数据（可选）
             if cleanup_old:
                 self.cleanup_old_data()
             
             self.logger.info('✅ 爬虫系统运行完成')
-            return merged_jobs, stats
+            return total_jobs, stats
             
         except Exception as e:
             self.logger.error(f'❌ 爬虫系统运行失败: {e}')
@@ -243,9 +527,9 @@ def main():
     
     # 运行主爬虫
     crawler = MainCrawler()
-    jobs, stats = crawler.run()
+    total_jobs, stats = crawler.run()
     
-    print(f"\n🎉 爬虫运行完成！共获取 {len(jobs)} 个内推职位")
+    print(f"\n🎉 爬虫运行完成！共获取 {total_jobs} 个内推职位")
     print("💡 提示: 数据已保存到 ../data/jobs.json，前端网站将自动显示最新数据")
 
 if __name__ == '__main__':
@@ -12,18 +12,19 @@ import random
 from typing import List
 from bs4 import BeautifulSoup
 from base_crawler import BaseCrawler, JobData
+from extractors import extract_post_fields, clean_matches
 
 class NowcoderCrawler(BaseCrawler):
     """牛客网爬虫"""
     
+    platform_key = 'nowcoder'
+    
     def __init__(self):
         super().__init__('牛客')
         self.base_url = 'https://www.nowcoder.com'
         
     def crawl(self) -> List[JobData]:
         """爬取牛客网内推信息"""
-        jobs = []
-        
         # 模拟爬取不同页面的内推信息
         pages = [
             '/discuss/tag/640',  # 内推tag
@@ -31,22 +32,12 @@ class NowcoderCrawler(BaseCrawler):
             '/discuss/tag/641'   # 实习tag
         ]
         
-        for page in pages:
-            try:
-                self.logger.info(f'爬取页面: {page}')
-                page_jobs = self.crawl_page(page)
-                jobs.extend(page_jobs)
-                self.random_delay(2, 4)  # 随机延时
-            except Exception as e:
-                self.logger.error(f'爬取页面 {page} 失败: {e}')
-                continue
-                
-        return jobs
+        return self.crawl_units(pages, self.crawl_page, '爬取页面')
     
     def crawl_page(self, page_url: str) -> List[JobData]:
         """爬取单个页面"""
         # 由于无法直接访问牛客网，这里使用模拟数据
-        # 实际应用中，这里会发送HTTP请求获取页面内容
+        # 实际应用中，这里会通过 self.fetch 复用连接池获取页面内容
         
         jobs = []
         
@@ -84,14 +75,10 @@ class NowcoderCrawler(BaseCrawler):
             }
         ]
         
-        for post in sample_posts:
-            try:
-                job = self.parse_job_post(post)
-                if job:
-                    jobs.append(job)
-            except Exception as e:
-                self.logger.error(f'解析职位信息失败: {e}')
-                continue
+        # 解析和分类按配置在解析进程池中进行，失败的为 None
+        for job in self.parse_payloads('parse_job_post', sample_posts, '解析职位信息失败'):
+            if job:
+                jobs.append(job)
                 
         return jobs
     
@@ -155,26 +142,12 @@ class NowcoderCrawler(BaseCrawler):
     
     def extract_requirements(self, content: str) -> List[str]:
         """从内容中提取职位要求"""
-        requirements = []
-        
-        # 常见要求关键词
-        requirement_patterns = [
-            r'要求[：:](.+?)(?:[。\n]|$)',
-            r'任职要求[：:](.+?)(?:[。\n]|$)',
-            r'技能要求[：:](.+?)(?:[。\n]|$)',
-            r'([0-9]+年以上.+?经验)',
-            r'(熟悉.+?)(?:[，。\n]|$)',
-            r'(本科|硕士|博士).+?学历',
-        ]
+        fields = extract_post_fields(content, ('requirements', 'experience', 'familiar'))
         
-        for pattern in requirement_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            for match in matches:
-                if isinstance(match, tuple):
-                    match = match[0]
-                req = match.strip().rstrip('，。')
-                if req and len(req) > 3:  # 过滤太短的内容
-                    requirements.append(req)
+        # 要求段落、经验要求、熟悉的技术，过滤太短的内容
+        requirements = clean_matches(
+            fields['requirements'] + fields['experience'] + fields['familiar'], 3
+        )
         
         # 如果没有找到具体要求，添加一些通用要求
         if not requirements:
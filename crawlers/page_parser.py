@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+页面解析后端
+按安装情况选择 selectolax / lxml / BeautifulSoup，只取出帖子列表需要的字段
+"""
+
+import logging
+import re
+from typing import Callable, Dict, List, Optional
+
+from crawler_config import config
+
+try:
+    # selectolax 1.0 起旧的 Modest 后端已弃用，优先使用 Lexbor
+    from selectolax.lexbor import LexborHTMLParser as HTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser
+    except ImportError:
+        HTMLParser = None
+
+try:
+    import lxml.etree
+    import lxml.html
+except ImportError:
+    lxml = None
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+logger = logging.getLogger('crawler.page_parser')
+
+# 帖子字段: title, href, datetime, content，元素不存在时为 None
+DiscussItem = Dict[str, Optional[str]]
+
+# BeautifulSoup 的 get_text 不包含这些元素中的文字，其他后端取文本前先去掉，保持结果一致
+NON_TEXT_TAGS = ('script', 'style')
+
+def _selectolax_text(node) -> str:
+    node.strip_tags(list(NON_TEXT_TAGS))
+    return node.text(strip=True)
+
+def _selectolax_items(html: str) -> List[DiscussItem]:
+    items = []
+    for node in HTMLParser(html).css('div.discuss-item'):
+        title = node.css_first('a.discuss-title')
+        time_node = node.css_first('time')
+        content = node.css_first('div.discuss-content')
+        items.append({
+            'title': _selectolax_text(title) if title else None,
+            'href': title.attributes.get('href') if title else None,
+            'datetime': time_node.attributes.get('datetime') if time_node else None,
+            'content': _selectolax_text(content) if content else None,
+        })
+    return items
+
+def _has_class(class_name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+if lxml is not None:
+    ITEM_XPATH = lxml.etree.XPath(f"//div[{_has_class('discuss-item')}]")
+    TITLE_XPATH = lxml.etree.XPath(f".//a[{_has_class('discuss-title')}]")
+    TIME_XPATH = lxml.etree.XPath('.//time')
+    CONTENT_XPATH = lxml.etree.XPath(f".//div[{_has_class('discuss-content')}]")
+
+def _lxml_first(xpath, node):
+    found = xpath(node)
+    return found[0] if found else None
+
+def _lxml_text(element) -> str:
+    # 与 BeautifulSoup 的 get_text(strip=True) 一致：逐段去掉空白后拼接
+    lxml.etree.strip_elements(element, *NON_TEXT_TAGS, with_tail=False)
+    return ''.join(text.strip() for text in element.itertext())
+
+def _lxml_items(html: str) -> List[DiscussItem]:
+    if not html.strip():
+        return []
+    items = []
+    for node in ITEM_XPATH(lxml.html.fromstring(html)):
+        title = _lxml_first(TITLE_XPATH, node)
+        time_node = _lxml_first(TIME_XPATH, node)
+        content = _lxml_first(CONTENT_XPATH, node)
+        items.append({
+            'title': _lxml_text(title) if title is not None else None,
+            'href': title.get('href') if title is not None else None,
+            'datetime': time_node.get('datetime') if time_node is not None else None,
+            'content': _lxml_text(content) if content is not None else None,
+        })
+    return items
+
+# 只构建 discuss-item 子树，页面其余部分（导航、脚本、侧栏）直接跳过。
+# 过滤发生在解析过程中，此时 class 还是未拆分的字符串，需要用正则匹配多个类名
+DISCUSS_ITEM_STRAINER = SoupStrainer('div', class_=re.compile(r'(?:^|\s)discuss-item(?:\s|$)'))
+
+def _soup_items(html: str) -> List[DiscussItem]:
+    # lxml 已安装时作为 BeautifulSoup 的底层解析器，否则使用纯 Python 的 html.parser
+    features = 'lxml' if lxml is not None else 'html.parser'
+    soup = BeautifulSoup(html, features, parse_only=DISCUSS_ITEM_STRAINER)
+    items = []
+    for node in soup.find_all('div', class_='discuss-item'):
+        title = node.find('a', class_='discuss-title')
+        time_node = node.find('time')
+        content = node.find('div', class_='discuss-content')
+        items.append({
+            'title': title.get_text(strip=True) if title else None,
+            'href': title.get('href') if title else None,
+            'datetime': time_node.get('datetime') if time_node else None,
+            'content': content.get_text(strip=True) if content else None,
+        })
+    return items
+
+BACKENDS: Dict[str, Callable[[str], List[DiscussItem]]] = {}
+if HTMLParser is not None:
+    BACKENDS['selectolax'] = _selectolax_items
+if lxml is not None:
+    BACKENDS['lxml'] = _lxml_items
+BACKENDS['bs4'] = _soup_items
+
+def select_backend(name: str = None) -> str:
+    """返回可用的解析后端名称，auto 时按 selectolax、lxml、bs4 的顺序选择"""
+    name = name or config.get('parsing.backend', 'auto')
+    fastest = next(iter(BACKENDS))
+    if name == 'auto':
+        return fastest
+    if name not in BACKENDS:
+        logger.warning(f'解析后端 {name} 不可用，改用 {fastest}')
+        return fastest
+    return name
+
+def parse_discuss_items(html: str, backend: str = None) -> List[DiscussItem]:
+    """取出页面中每个 discuss-item 的标题、链接、时间和正文"""
+    return BACKENDS[select_backend(backend)](html)
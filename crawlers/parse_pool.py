@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+解析进程池
+把帖子/页面的解析和分类按块交给 ProcessPoolExecutor，解析不再占用抓取线程和GIL，
+大规模回填时可以用满多个CPU核心，抓取与解析同时进行。
+
+parsing.workers 为 0 时不启动进程，由调用方在当前线程解析。
+"""
+
+import os
+import atexit
+import asyncio
+import threading
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Sequence
+
+from crawler_config import config
+
+logger = logging.getLogger('crawler.parse_pool')
+
+# 解析进程中为 True。职位ID等需要全局唯一的值不在解析进程中生成，由主进程在合并结果时分配
+_in_worker = False
+
+def _init_worker():
+    global _in_worker
+    _in_worker = True
+
+def in_worker() -> bool:
+    return _in_worker
+
+class ParsePool:
+    """按块提交解析任务的进程池
+
+    func 接收一块原始数据、返回同样长度的结果列表，必须可以 pickle（模块级函数或类方法）。
+    结果按原始顺序合并；某一块提交或执行失败时（进程崩溃、数据无法序列化），
+    记录警告并用 fallback 在当前进程中解析这一块。
+    """
+
+    def __init__(self, workers: int = 0, chunk_size: int = 32):
+        self.workers = max(0, workers)
+        self.chunk_size = max(1, chunk_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # 爬虫线程运行时 fork 会复制其他线程持有的锁，使用 spawn 启动干净的解析进程
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+                logger.info(f'启动 {self.workers} 个解析进程')
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        """进程池损坏后丢弃，下次提交时重新创建"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def _chunks(self, items: Sequence) -> List[List]:
+        return [list(items[start:start + self.chunk_size]) for start in range(0, len(items), self.chunk_size)]
+
+    def _submit(self, func: Callable, chunk: List):
+        executor = self._get_executor()
+        try:
+            return executor.submit(func, chunk)
+        except RuntimeError:
+            # BrokenProcessPool 是 RuntimeError 的子类；已关闭的进程池同样无法提交
+            self._discard_executor(executor)
+            raise
+
+    def _fallback(self, error: Exception, chunk: List, fallback: Optional[Callable]) -> List:
+        if fallback is None:
+            raise error
+        logger.warning(f'解析进程执行失败，在当前进程解析 {len(chunk)} 条: {error}')
+        return fallback(chunk)
+
+    def map(self, func: Callable[[List], List], items: Sequence,
+            fallback: Callable[[List], List] = None) -> List[Any]:
+        """分块并行解析，等待全部完成后按顺序返回结果"""
+        chunks = self._chunks(items)
+        futures = []
+        for chunk in chunks:
+            try:
+                futures.append(self._submit(func, chunk))
+            except Exception as e:
+                futures.append(e)
+
+        results = []
+        for chunk, future in zip(chunks, futures):
+            try:
+                if isinstance(future, Exception):
+                    raise future
+                results.extend(future.result())
+            except Exception as e:
+                results.extend(self._fallback(e, chunk, fallback))
+        return results
+
+    async def map_async(self, func: Callable[[List], List], items: Sequence,
+                        fallback: Callable[[List], List] = None) -> List[Any]:
+        """与 map 相同，但在等待解析时让出事件循环，其他抓取任务继续进行"""
+        chunks = self._chunks(items)
+
+        async def run_chunk(chunk):
+            try:
+                return await asyncio.wrap_future(self._submit(func, chunk))
+            except Exception as e:
+                if fallback is None:
+                    raise
+                logger.warning(f'解析进程执行失败，在当前进程解析 {len(chunk)} 条: {e}')
+                return await asyncio.to_thread(fallback, chunk)
+
+        results = await asyncio.gather(*(run_chunk(chunk) for chunk in chunks))
+        return [result for chunk_results in results for result in chunk_results]
+
+    def resize(self, workers: int):
+        """调整解析进程数，已启动的进程池在当前任务完成后关闭，下次提交时按新进程数启动"""
+        with self._lock:
+            workers = max(0, workers)
+            if workers == self.workers:
+                return
+            self.workers = workers
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def close(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+def resolve_workers(value) -> int:
+    """配置中的进程数，"auto" 为CPU核心数减一（至少一个）"""
+    if value == 'auto':
+        return max(1, (os.cpu_count() or 2) - 1)
+    return int(value or 0)
+
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+def get_parse_pool() -> ParsePool:
+    """获取全局共享的解析进程池
+
+    parsing.workers 为 0 时不使用进程池；为 "auto" 时按CPU核心数减一（至少一个）。
+    """
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            _shared_pool = ParsePool(
+                workers=resolve_workers(config.get('parsing.workers', 0)),
+                chunk_size=config.get('parsing.chunk_size', 32)
+            )
+            atexit.register(_shared_pool.close)
+        return _shared_pool
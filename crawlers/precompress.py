@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+预压缩
+为网站数据文件生成 .gz / .br 压缩副本，服务器按 Accept-Encoding 直接返回，不必每次请求时压缩
+
+brotli 为可选依赖，未安装时只生成 .gz。
+用法: python precompress.py ../data  为目录下全部JSON文件生成压缩副本
+"""
+
+import os
+import sys
+import gzip
+import json
+import logging
+from pathlib import Path
+from typing import Dict
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger('crawler.precompress')
+
+# 太小的文件压缩后节省不了多少，反而多一次文件查找
+MIN_SIZE = 512
+
+def _compressors():
+    compressors = {'.gz': lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        compressors['.br'] = lambda data: brotli.compress(data, quality=11)
+    return compressors
+
+def sibling(path, suffix: str) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + suffix)
+
+def remove_siblings(path):
+    """删除文件的压缩副本"""
+    for suffix in ('.gz', '.br'):
+        sibling(path, suffix).unlink(missing_ok=True)
+
+def is_fresh(path) -> bool:
+    """压缩副本是否齐全且不早于原文件"""
+    path = Path(path)
+    if path.stat().st_size < MIN_SIZE:
+        return True
+    mtime = path.stat().st_mtime_ns
+    for suffix in _compressors():
+        compressed = sibling(path, suffix)
+        if not compressed.exists() or compressed.stat().st_mtime_ns < mtime:
+            return False
+    return True
+
+def compress_file(path) -> Dict[str, int]:
+    """生成压缩副本，返回 后缀 -> 压缩后大小；文件太小时删除旧副本"""
+    path = Path(path)
+    data = path.read_bytes()
+    if len(data) < MIN_SIZE:
+        remove_siblings(path)
+        return {}
+
+    sizes = {}
+    for suffix, compress in _compressors().items():
+        compressed = sibling(path, suffix)
+        tmp_path = sibling(path, suffix + '.tmp')
+        tmp_path.write_bytes(compress(data))
+        os.replace(tmp_path, compressed)
+        sizes[suffix] = compressed.stat().st_size
+    return sizes
+
+def write_data_file(path, data, precompress: bool = True):
+    """写入不带缩进和空白的JSON，替换目标文件后生成压缩副本"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + '.tmp')
+    tmp_path.write_text(json.dumps(data, ensure_ascii=False, separators=(',', ':')), encoding='utf-8')
+    os.replace(tmp_path, path)
+    if precompress:
+        compress_file(path)
+    else:
+        remove_siblings(path)
+
+def compress_tree(directory) -> int:
+    """为目录下所有过期的JSON文件生成压缩副本，返回处理的文件数"""
+    count = 0
+    for path in Path(directory).rglob('*.json'):
+        if not is_fresh(path):
+            compress_file(path)
+            count += 1
+    return count
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if brotli is None:
+        print('未安装 brotli，只生成 .gz: pip install brotli')
+    for directory in sys.argv[1:] or ['../data']:
+        print(f'{directory}: {compress_tree(directory)} 个文件')
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+按域名限速
+每个域名一个令牌桶，控制每秒请求数和突发量；被拦截时降速，请求成功后逐步恢复
+"""
+
+import time
+import asyncio
+import threading
+import logging
+from typing import Dict
+from urllib.parse import urlsplit
+
+from crawler_config import config
+
+class TokenBucket:
+    """令牌桶，支持线程并发预约令牌"""
+
+    def __init__(self, rate: float, burst: int):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """预约一个令牌，返回需要等待的秒数
+
+        令牌数允许为负，表示已被排队的请求预约，后来者顺延等待。
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0.0
+            return -self.tokens / self.rate
+
+    def slow_down(self, factor: float, min_rate: float):
+        """乘性降速，并清空积攒的突发额度"""
+        with self.lock:
+            self.rate = max(min_rate, self.rate * factor)
+            self.tokens = min(self.tokens, 0.0)
+
+    def speed_up(self, step: float):
+        """加性恢复，不超过初始速率"""
+        with self.lock:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * step)
+
+class RateLimiter:
+    """域名级限速器，所有爬虫共享同一实例"""
+
+    def __init__(self, rate: float, burst: int = 1, backoff_factor: float = 0.5,
+                 recovery_step: float = 0.1, min_rate: float = 0.05,
+                 domains: Dict[str, Dict] = None):
+        self.rate = rate
+        self.burst = burst
+        self.backoff_factor = backoff_factor
+        self.recovery_step = recovery_step
+        self.min_rate = min_rate
+        self.domains = domains or {}
+        self.logger = logging.getLogger('crawler.rate_limiter')
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls):
+        """根据 anti_detection.delay_range 推算每秒请求数"""
+        min_delay, max_delay = config.get('anti_detection.delay_range', [2, 5])
+        rate = 1.0 / max(0.001, (min_delay + max_delay) / 2)
+        return cls(
+            rate=rate,
+            burst=config.get('rate_limit.burst', 2),
+            backoff_factor=config.get('rate_limit.backoff_factor', 0.5),
+            recovery_step=config.get('rate_limit.recovery_step', 0.1),
+            min_rate=config.get('rate_limit.min_rate', 0.05),
+            domains=config.get('rate_limit.domains', {}),
+        )
+
+    @staticmethod
+    def domain_of(url_or_domain: str) -> str:
+        """提取域名，传入的已是域名时原样返回"""
+        if '://' in url_or_domain:
+            return urlsplit(url_or_domain).netloc.lower()
+        return url_or_domain.lower()
+
+    def bucket_for(self, url_or_domain: str) -> TokenBucket:
+        """获取域名对应的令牌桶，首次访问时按配置创建"""
+        domain = self.domain_of(url_or_domain)
+        with self._lock:
+            bucket = self._buckets.get(domain)
+            if bucket is None:
+                override = self.domains.get(domain, {})
+                bucket = TokenBucket(override.get('rate', self.rate),
+                                     override.get('burst', self.burst))
+                self._buckets[domain] = bucket
+            return bucket
+
+    def acquire(self, url_or_domain: str):
+        """阻塞当前线程直到可以请求该域名，其他域名不受影响"""
+        wait = self.bucket_for(url_or_domain).reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, url_or_domain: str):
+        """异步等待直到可以请求该域名"""
+        wait = self.bucket_for(url_or_domain).reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def report_blocked(self, url_or_domain: str):
+        """请求被拦截，降低该域名的速率"""
+        bucket = self.bucket_for(url_or_domain)
+        bucket.slow_down(self.backoff_factor, self.min_rate)
+        self.logger.warning(f'{self.domain_of(url_or_domain)} 请求被拦截，降速至 {bucket.rate:.3f} 次/秒')
+
+    def report_success(self, url_or_domain: str):
+        """请求成功，逐步恢复该域名的速率"""
+        self.bucket_for(url_or_domain).speed_up(self.recovery_step)
+
+_shared_limiter = None
+_shared_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    """获取全局共享的限速器"""
+    global _shared_limiter
+    with _shared_lock:
+        if _shared_limiter is None:
+            _shared_limiter = RateLimiter.from_config()
+        return _shared_limiter
@@ -10,12 +10,18 @@ import re
 import json
 import time
 import random
+import asyncio
 import requests
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
+from functools import partial
+from typing import List, Dict, Any, Optional
 from pathlib import Path
 import logging
 from base_crawler import JobData, BaseCrawler
+from crawler_config import config
+from extractors import extract_post_fields, extract_referral_code
+from company_gazetteer import COMPANY_GAZETTEER
+from page_parser import parse_discuss_items
 
 # 配置反反爬虫的用户代理和请求头
 USER_AGENTS = [
@@ -28,9 +34,13 @@ USER_AGENTS = [
 class RealDataCrawler(BaseCrawler):
     """真实数据爬虫，基于Anti-Anti-Spider技术"""
     
+    platform_key = 'real_data'
+    
     def __init__(self):
         super().__init__('真实数据爬虫')
         self.setup_anti_detection()
+        # 本次运行中正常结束的标签数（包括页面未变化和到达已入库帖子）
+        self.completed_endpoints = 0
         
     def setup_anti_detection(self):
         """设置反反爬虫检测机制"""
@@ -55,15 +65,8 @@ class RealDataCrawler(BaseCrawler):
             # {'http': 'http://proxy1:port', 'https': 'https://proxy1:port'},
         ]
         
-    def get_random_delay(self, min_delay=2, max_delay=5):
-        """获取随机延时，模拟人类行为"""
-        return random.uniform(min_delay, max_delay)
-    
     def make_request(self, url, **kwargs):
-        """发送请求，带有反检测机制"""
-        # 随机延时
-        time.sleep(self.get_random_delay())
-        
+        """发送请求，带有反检测机制；经过按域名限速和HTTP缓存"""
         # 随机更换User-Agent
         self.session.headers['User-Agent'] = random.choice(USER_AGENTS)
         
@@ -72,19 +75,43 @@ class RealDataCrawler(BaseCrawler):
             kwargs['proxies'] = random.choice(self.proxies)
         
         try:
-            response = self.session.get(url, timeout=10, **kwargs)
+            response = self.fetch(url, **kwargs)
+            return self.check_response(url, response)
             
-            # 检查是否被反爬虫拦截
-            if self.is_blocked(response):
-                self.logger.warning(f"请求被拦截: {url}")
-                return None
-                
-            return response
+        except Exception as e:
+            self.logger.error(f"请求失败 {url}: {e}")
+            return None
+    
+    async def make_request_async(self, url, **kwargs):
+        """异步发送请求，限速等待不阻塞其他请求"""
+        # 每个请求单独指定User-Agent，避免并发请求互相覆盖
+        headers = {'User-Agent': random.choice(USER_AGENTS)}
+        
+        if self.proxies:
+            kwargs['proxies'] = random.choice(self.proxies)
+        
+        try:
+            response = await self.fetch_async(url, headers=headers, **kwargs)
+            return self.check_response(url, response)
             
         except Exception as e:
             self.logger.error(f"请求失败 {url}: {e}")
             return None
     
+    def check_response(self, url, response):
+        """检查响应是否被拦截，被拦截时返回 None"""
+        # 检查是否被反爬虫拦截
+        if self.is_blocked(response):
+            self.logger.warning(f"请求被拦截: {url}")
+            self.rate_limiter.report_blocked(url)
+            # 不保留被拦截时缓存的页面
+            if self.http_cache:
+                self.http_cache.discard(url)
+            return None
+        
+        self.rate_limiter.report_success(url)
+        return response
+    
     def is_blocked(self, response):
         """检测是否被反爬虫系统拦截"""
         if response.status_code != 200:
@@ -104,71 +131,192 @@ class RealDataCrawler(BaseCrawler):
         return False
     
     def crawl_nowcoder_real(self) -> List[JobData]:
-        """爬取牛客网真实内推信息"""
+        """爬取牛客网真实内推信息，各标签并发增量翻页"""
+        self.completed_endpoints = 0
+        
+        base_url = config.get('platforms.nowcoder.base_url', 'https://www.nowcoder.com')
+        # 牛客网内推讨论页面：内推/校招/实习标签
+        endpoints = config.get('platforms.nowcoder.endpoints',
+                               ['/discuss/tag/640', '/discuss/tag/639', '/discuss/tag/641'])
+        
+        try:
+            results = asyncio.run(self._crawl_endpoints(base_url, endpoints))
+        except Exception as e:
+            self.logger.error(f"爬取牛客网失败: {e}")
+            return []
+        
+        return [job for endpoint_jobs in results for job in endpoint_jobs]
+    
+    async def _crawl_endpoints(self, base_url, endpoints):
+        return await asyncio.gather(*(self.crawl_endpoint(base_url, endpoint) for endpoint in endpoints))
+    
+    async def crawl_endpoint(self, base_url, endpoint) -> List[JobData]:
+        """增量爬取单个标签：从检查点页码开始翻页，遇到已入库的帖子即停止
+        
+        翻页进度和高水位通过 defer_progress 登记，职位保存后才写入检查点。
+        """
         jobs = []
+        source = '牛客'
+        max_pages = self.platform_config('max_pages', 5)
+        page = self.checkpoints.resume_page(source, endpoint)
+        if page > 1:
+            self.logger.info(f"从检查点继续爬取 {endpoint} 第 {page} 页")
         
-        # 牛客网内推讨论页面
-        urls = [
-            'https://www.nowcoder.com/discuss/tag/640?type=2&order=0&page=1',  # 内推标签
-            'https://www.nowcoder.com/discuss/tag/639?type=2&order=0&page=1',  # 校招标签
-        ]
+        while page <= max_pages:
+            if self.out_of_time:
+                # 保留翻页进度，下次运行从这一页继续
+                self.logger.warning(f"超过最长运行时间，{endpoint} 下次从第 {page} 页继续")
+                self.completed_endpoints += 1
+                return jobs
+            
+            url = f'{base_url}{endpoint}?type=2&order=0&page={page}'
+            self.logger.info(f"正在爬取牛客网: {url}")
+            # 列表页随时会有新帖，不信任缓存有效期，每次都用 ETag/Last-Modified 向服务器确认
+            response = await self.make_request_async(url, revalidate=True)
+            
+            if not response:
+                # 请求失败时保留检查点，下次从这一页继续
+                return jobs
+            
+            # 页面未变化（服务器返回304），无需重新解析，后续页面也不会有新帖
+            if getattr(response, 'not_modified', False):
+                self.logger.info(f"页面未变化，跳过解析: {url}")
+                break
+            
+            # 在解析进程池（或后台线程）中解析，等待期间其他标签继续抓取
+            posts = (await self.parse_payloads_async('parse_nowcoder_posts', [response.text],
+                                                     '爬取牛客网失败'))[0]
+            if posts is None:
+                return jobs
+            
+            reached_seen = False
+            newest_id, newest_date = None, None
+            for post_id, date, job in posts:
+                if self.checkpoints.is_seen(source, endpoint, post_id, date):
+                    reached_seen = True
+                    continue
+                if post_id is not None and (newest_id is None or post_id > newest_id):
+                    newest_id = post_id
+                if newest_date is None or date > newest_date:
+                    newest_date = date
+                if job:
+                    jobs.append(job)
+            
+            self.defer_progress(partial(self.checkpoints.record_page, source, endpoint,
+                                        page, newest_id, newest_date))
+            
+            if reached_seen or not posts:
+                break
+            page += 1
         
-        for url in urls:
-            try:
-                self.logger.info(f"正在爬取牛客网: {url}")
-                response = self.make_request(url)
-                
-                if response:
-                    page_jobs = self.parse_nowcoder_page(response.text)
-                    jobs.extend(page_jobs)
-                    
-            except Exception as e:
-                self.logger.error(f"爬取牛客网失败: {e}")
-                
+        self.defer_progress(partial(self.checkpoints.finish, source, endpoint))
+        self.completed_endpoints += 1
         return jobs
     
+    def backfill(self, since: str, until: Optional[str], sink):
+        """回填牛客网历史帖子，各标签并发深度翻页"""
+        base_url = config.get('platforms.nowcoder.base_url', 'https://www.nowcoder.com')
+        endpoints = config.get('platforms.nowcoder.endpoints',
+                               ['/discuss/tag/640', '/discuss/tag/639', '/discuss/tag/641'])
+        asyncio.run(self._backfill_endpoints(base_url, endpoints, since, until, sink))
+    
+    async def _backfill_endpoints(self, base_url, endpoints, since, until, sink):
+        await asyncio.gather(*(self.backfill_endpoint(base_url, endpoint, since, until, sink)
+                               for endpoint in endpoints))
+    
+    async def backfill_endpoint(self, base_url, endpoint, since, until, sink):
+        """按页回填单个标签，直到整页帖子都早于 since
+        
+        翻页进度单独记录在 "标签#backfill:起:止" 检查点下，不影响日常增量爬取的高水位；
+        每页的职位由 sink 写入仓库后才记录进度，中断后重新运行同一日期范围会从断点继续，
+        已完成的标签直接跳过。until 为 None 时检查点记为 "起:latest"，不随运行日期变化。
+        """
+        source = '牛客'
+        key = f'{endpoint}#backfill:{since}:{until or "latest"}'
+        if self.checkpoints.is_finished(source, key):
+            self.logger.info(f"{endpoint} 已回填到 {since}，跳过")
+            return
+        
+        max_pages = self.platform_config('backfill_max_pages', 500)
+        page = self.checkpoints.resume_page(source, key)
+        if page > 1:
+            self.logger.info(f"从检查点继续回填 {endpoint} 第 {page} 页")
+        
+        while page <= max_pages:
+            url = f'{base_url}{endpoint}?type=2&order=0&page={page}'
+            response = await self.make_request_async(url)
+            if not response:
+                # 请求失败时保留检查点，下次从这一页继续
+                return
+            
+            # 缓存中的页面（包括未变化的页面）同样需要解析
+            posts = (await self.parse_payloads_async('parse_nowcoder_posts', [response.text],
+                                                     '回填牛客网失败'))[0]
+            if posts is None:
+                return
+            
+            # 没有范围内的职位也交给 sink，回填中止时由它抛出异常结束翻页
+            jobs = [job for _, date, job in posts if job and since <= date and (until is None or date <= until)]
+            await asyncio.to_thread(sink, jobs)
+            
+            post_ids = [post_id for post_id, _, _ in posts if post_id is not None]
+            dates = [date for _, date, _ in posts]
+            self.checkpoints.record_page(source, key, page, max(post_ids, default=None), max(dates, default=None))
+            self.logger.info(f"回填 {endpoint} 第 {page} 页: {len(jobs)} 个职位")
+            
+            if not posts or all(date < since for date in dates):
+                break
+            page += 1
+        
+        self.checkpoints.finish(source, key)
+    
     def parse_nowcoder_page(self, html_content):
         """解析牛客网页面内容"""
-        jobs = []
+        return [job for _, _, job in self.parse_nowcoder_posts(html_content) if job]
+    
+    def parse_nowcoder_posts(self, html_content):
+        """解析页面中的全部帖子，返回 (帖子ID, 日期, 职位) 列表
+        
+        非内推帖子的职位为 None，但仍返回ID和日期，供增量爬取判断是否到达高水位。
+        """
+        posts = []
         
         # 这里需要根据实际的HTML结构来解析
         # 由于牛客网的反爬虫机制，实际解析需要更复杂的处理
         
         # 示例解析逻辑（需要根据实际页面结构调整）
         try:
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # 查找讨论帖子列表
-            post_items = soup.find_all('div', class_='discuss-item')
-            
-            for item in post_items:
+            # 只解析帖子列表，解析后端由配置 parsing.backend 决定
+            for item in parse_discuss_items(html_content):
                 try:
                     # 提取标题
-                    title_elem = item.find('a', class_='discuss-title')
-                    if not title_elem:
+                    if item['title'] is None:
                         continue
                         
-                    title = title_elem.get_text(strip=True)
+                    title = item['title']
+                    
+                    # 提取帖子ID
+                    id_match = re.search(r'/discuss/(\d+)', item['href'] or '')
+                    post_id = int(id_match.group(1)) if id_match else None
+                    
+                    # 提取时间
+                    date_str = item['datetime']
+                    date = date_str[:10] if date_str and len(date_str) >= 10 else datetime.now().strftime('%Y-%m-%d')
                     
                     # 检查是否包含内推关键词
                     if not any(keyword in title for keyword in ['内推', '招聘', '校招', '实习']):
+                        posts.append((post_id, date, None))
                         continue
                     
                     # 提取更多信息
-                    content_elem = item.find('div', class_='discuss-content')
-                    content = content_elem.get_text(strip=True) if content_elem else ''
-                    
-                    # 提取时间
-                    time_elem = item.find('time')
-                    date_str = time_elem.get('datetime') if time_elem else datetime.now().strftime('%Y-%m-%d')
+                    content = item['content'] or ''
                     
                     # 解析职位信息
                     job = self.parse_job_info(title, content)
                     if job:
-                        job.date = date_str[:10] if len(date_str) >= 10 else datetime.now().strftime('%Y-%m-%d')
+                        job.date = date
                         job.source = '牛客'
-                        jobs.append(job)
+                    posts.append((post_id, date, job))
                         
                 except Exception as e:
                     self.logger.error(f"解析单个帖子失败: {e}")
@@ -177,29 +325,16 @@ class RealDataCrawler(BaseCrawler):
         except Exception as e:
             self.logger.error(f"解析页面失败: {e}")
             
-        return jobs
+        return posts
     
     def parse_job_info(self, title, content):
         """从标题和内容中解析职位信息"""
         try:
-            # 提取公司名称
-            companies = [
-                '字节跳动', '腾讯', '阿里巴巴', '百度', '美团', '网易', '滴滴', '快手',
-                '小红书', '蚂蚁集团', '京东', '拼多多', '华为', '小米', 'OPPO', 'vivo'
-            ]
-            
-            company = '未知公司'
-            for comp in companies:
-                if comp in title or comp in content:
-                    company = comp
-                    break
+            # 提取公司名称，标题优先，支持别名（如 抖音 → 字节跳动）
+            company = COMPANY_GAZETTEER.find(title, content) or '未知公司'
             
             # 提取职位类型
-            job_type = '社招'
-            if any(word in title + content for word in ['校招', '秋招', '春招', '应届']):
-                job_type = '校招'
-            elif any(word in title + content for word in ['实习', '暑期', '寒假']):
-                job_type = '实习'
+            job_type = self.extract_job_type(title + content)
             
             # 提取技术方向
             direction = self.extract_direction(title, content)
@@ -207,11 +342,16 @@ class RealDataCrawler(BaseCrawler):
             # 提取职位名称
             position_title = self.extract_position_title(title, direction)
             
-            # 生成内推码（这里仍然是生成的，真实内推码需要从内容中提取）
-            code = self.extract_referral_code(content) or self.generate_referral_code(company, job_type)
+            # 内推码和要求在一次扫描中提取
+            fields = extract_post_fields(
+                content, ('code', 'requirements', 'experience', 'familiar', 'degrees')
+            )
+            
+            # 优先使用帖子中的真实内推码，没有时生成
+            code = fields['code'] or self.generate_referral_code(company, job_type)
             
             # 提取要求
-            requirements = self.extract_requirements(content)
+            requirements = self.requirements_from_fields(fields)
             
             return JobData(
                 title=position_title,
@@ -230,21 +370,7 @@ class RealDataCrawler(BaseCrawler):
     
     def extract_referral_code(self, content):
         """从内容中提取真实内推码"""
-        # 匹配各种内推码格式
-        patterns = [
-            r'内推码[：:]?\s*([A-Za-z0-9]{6,20})',
-            r'推荐码[：:]?\s*([A-Za-z0-9]{6,20})',
-            r'邀请码[：:]?\s*([A-Za-z0-9]{6,20})',
-            r'code[：:]?\s*([A-Za-z0-9]{6,20})',
-            r'([A-Z]{2,4}\d{4,8})',  # 常见格式如 TT2025001
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            if matches:
-                return matches[0]
-        
-        return None
+        return extract_referral_code(content)
     
     def extract_position_title(self, title, direction):
         """提取职位标题"""
@@ -283,8 +409,8 @@ class RealDataCrawler(BaseCrawler):
         except Exception as e:
             self.logger.error(f"爬取过程中出错: {e}")
         
-        # 如果真实爬取失败，返回一些增强的模拟数据
-        if not all_jobs:
+        # 全部标签的请求都失败时才返回增强的模拟数据；没有新帖子（页面未变化、到达已入库帖子）不算失败
+        if not all_jobs and not self.completed_endpoints:
             self.logger.warning("真实爬取失败，返回增强模拟数据")
             all_jobs = self.generate_enhanced_sample_data()
         
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+分片导出
+把展示窗口内的职位按日期切成分片，每个分片最多 page_size 个职位，
+另外为 来源/类型/方向/公司 各生成一个索引文件，manifest.json 记录全部文件和内容哈希。
+
+网站先读清单，只加载当前要显示的分片；分片内容没变时文件不重写、哈希不变，
+浏览器和 Service Worker 的缓存继续有效，一次爬取只让变化的日期分片失效。
+"""
+
+import os
+import json
+import hashlib
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+
+from precompress import compress_file, is_fresh, remove_siblings, write_data_file
+
+logger = logging.getLogger('crawler.shard_exporter')
+
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# 建立索引的字段；一个职位有多个来源时在每个来源下都出现。
+# 公司索引的取值同时作为静态部署时的搜索建议
+FACETS = ('source', 'type', 'direction', 'company')
+
+class ShardExporter:
+    """按日期倒序接收职位，逐个日期写出分片
+
+    内存中只保留当前日期的职位和各分类的ID列表。
+    用法: exporter.export(jobs)，或把 exporter.track(jobs) 接入其他导出流程后调用 finish()。
+    """
+
+    def __init__(self, output_dir, page_size: int = 100, precompress: bool = True):
+        self.output_dir = Path(output_dir)
+        self.page_size = max(1, page_size)
+        self.precompress = precompress
+        # 上次导出的 文件 -> 内容哈希，用于跳过未变化的文件和清理旧分片
+        self.previous_hashes = self._previous_hashes(self._load_manifest())
+        self.dates: List[Dict] = []
+        self.facets: Dict[str, Dict[str, Dict[str, List[int]]]] = {facet: {} for facet in FACETS}
+        self.total = 0
+        self.written = 0
+        self._date = None
+        self._pending: List[Dict] = []
+
+    def _load_manifest(self) -> Dict:
+        try:
+            with open(self.output_dir / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _previous_hashes(manifest: Dict) -> Dict[str, str]:
+        hashes = {}
+        for entry in manifest.get('dates', []):
+            for page in entry.get('pages', []):
+                hashes[page['file']] = page['hash']
+        for entry in manifest.get('facets', {}).values():
+            hashes[entry['file']] = entry['hash']
+        return hashes
+
+    def _write(self, relative: str, data) -> str:
+        """内容有变化时才写入（连同压缩副本），返回内容哈希"""
+        content = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha1(content).hexdigest()[:12]
+        path = self.output_dir / relative
+        if self.previous_hashes.get(relative) == digest and path.exists():
+            if self.precompress and not is_fresh(path):
+                compress_file(path)
+            return digest
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+        if self.precompress:
+            compress_file(path)
+        else:
+            remove_siblings(path)
+        self.written += 1
+        return digest
+
+    def _flush_date(self):
+        if self._date is None:
+            return
+        pages = []
+        for number, start in enumerate(range(0, len(self._pending), self.page_size), 1):
+            jobs = self._pending[start:start + self.page_size]
+            relative = f'dates/{self._date}-{number}.json'
+            pages.append({'file': relative, 'count': len(jobs), 'hash': self._write(relative, jobs)})
+        self.dates.append({'date': self._date, 'count': len(self._pending), 'pages': pages})
+        self._pending = []
+
+    def add(self, job: Dict):
+        """加入一个职位，职位须按日期倒序到达"""
+        date = (job.get('date') or '')[:10] or 'unknown'
+        if date != self._date:
+            self._flush_date()
+            self._date = date
+        self._pending.append(job)
+        self.total += 1
+
+        for facet in FACETS:
+            values = (job.get('sources') or [job.get('source')]) if facet == 'source' else [job.get(facet)]
+            for value in values:
+                if value:
+                    self.facets[facet].setdefault(value, {}).setdefault(date, []).append(job['id'])
+
+    def track(self, jobs: Iterable[Dict]) -> Iterator[Dict]:
+        """原样产出职位并顺带加入分片，用于与其他导出共用一次遍历"""
+        for job in jobs:
+            self.add(job)
+            yield job
+
+    def finish(self) -> Dict:
+        """写出剩余分片、分类索引和清单，删除不再使用的旧分片，返回新清单"""
+        self._flush_date()
+        facets = {}
+        for facet, index in self.facets.items():
+            relative = f'facets/{facet}.json'
+            facets[facet] = {'file': relative, 'hash': self._write(relative, index)}
+
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'generated_at': datetime.now().isoformat(),
+            'total': self.total,
+            'page_size': self.page_size,
+            'dates': self.dates,
+            'facets': facets,
+        }
+        # 清单最后写入，读取方看到新清单时它引用的分片都已就绪
+        write_data_file(self.output_dir / MANIFEST_FILE, manifest, precompress=self.precompress)
+
+        current = {page['file'] for entry in self.dates for page in entry['pages']}
+        current.update(entry['file'] for entry in facets.values())
+        for relative in self.previous_hashes:
+            if relative not in current:
+                (self.output_dir / relative).unlink(missing_ok=True)
+                remove_siblings(self.output_dir / relative)
+
+        logger.info(f'分片导出: {self.total} 个职位，{sum(len(e["pages"]) for e in self.dates)} 个分片，'
+                    f'重写 {self.written} 个文件')
+        return manifest
+
+    def export(self, jobs: Iterable[Dict]) -> Dict:
+        for job in jobs:
+            self.add(job)
+        return self.finish()
+
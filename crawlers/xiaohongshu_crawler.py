@@ -9,18 +9,19 @@ import re
 import json
 from typing import List
 from base_crawler import BaseCrawler, JobData
+from extractors import extract_post_fields, clean_matches
 
 class XiaohongshuCrawler(BaseCrawler):
     """小红书爬虫"""
     
+    platform_key = 'xiaohongshu'
+    
     def __init__(self):
         super().__init__('小红书')
         self.base_url = 'https://www.xiaohongshu.com'
         
     def crawl(self) -> List[JobData]:
         """爬取小红书内推信息"""
-        jobs = []
-        
         # 小红书求职相关关键词
         keywords = [
             '内推',
@@ -31,17 +32,7 @@ class XiaohongshuCrawler(BaseCrawler):
             '找工作'
         ]
         
-        for keyword in keywords:
-            try:
-                self.logger.info(f'搜索关键词: {keyword}')
-                keyword_jobs = self.search_keyword(keyword)
-                jobs.extend(keyword_jobs)
-                self.random_delay(2, 4)
-            except Exception as e:
-                self.logger.error(f'搜索关键词 {keyword} 失败: {e}')
-                continue
-                
-        return jobs
+        return self.crawl_units(keywords, self.search_keyword, '搜索关键词')
     
     def search_keyword(self, keyword: str) -> List[JobData]:
         """搜索特定关键词的内推信息"""
@@ -86,14 +77,10 @@ class XiaohongshuCrawler(BaseCrawler):
             }
         ]
         
-        for note in sample_notes:
-            try:
-                job = self.parse_note(note)
-                if job:
-                    jobs.append(job)
-            except Exception as e:
-                self.logger.error(f'解析笔记失败: {e}')
-                continue
+        # 解析和分类按配置在解析进程池中进行，失败的为 None
+        for job in self.parse_payloads('parse_note', sample_notes, '解析笔记失败'):
+            if job:
+                jobs.append(job)
                 
         return jobs
     
@@ -203,28 +190,18 @@ class XiaohongshuCrawler(BaseCrawler):
     def extract_requirements(self, content: str) -> List[str]:
         """提取职位要求"""
         requirements = []
+        fields = extract_post_fields(content, ('degrees', 'experience', 'projects', 'familiar'))
         
         # 学历要求
-        if '硕士' in content or '研究生' in content:
+        if '硕士' in fields['degrees']:
             requirements.append('硕士及以上学历')
-        elif '本科' in content or '学士' in content:
+        elif '本科' in fields['degrees']:
             requirements.append('本科及以上学历')
         
         # 经验要求
-        exp_patterns = [
-            r'(\d+年以上.+?经验)',
-            r'(有.+?项目经验)',
-            r'(熟悉.+?)(?:[，。]|$)'
-        ]
-        
-        for pattern in exp_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            for match in matches:
-                if isinstance(match, tuple):
-                    match = match[0]
-                req = match.strip().rstrip('，。')
-                if req and len(req) > 2:
-                    requirements.append(req)
+        requirements.extend(clean_matches(
+            fields['experience'] + fields['projects'] + fields['familiar'], 2
+        ))
         
         # 技能要求
         skills = {
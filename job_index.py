@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+职位查询索引
+在内存中为网站数据建立倒排索引，供 start_server.py 的 /api/jobs 接口查询
+
+- 文本: 标题、公司、内推码的单字和相邻两字，中文不需要分词
+- 分类: 类型、方向、来源各取值对应一个位图，筛选和计数都是整数位运算
+- 排序: 文档按 日期倒序 编号；按公司/职位排序时把排好的顺序切成若干段，每段一个位图，
+  逐段与结果求交，只在凑成当前页的段内排序
+- 翻页: 按ID排序（ID随生成时间递增，即最新发现的在前）时可以传入上一页最后一个职位的ID，
+  直接从该ID之后的段开始，不需要数过前面的结果
+
+爬虫写完网站数据后递增 generation.json 中的代数，后台线程发现代数变化后建立新索引并整体替换，
+正在处理的查询继续使用旧索引，服务不需要重启。
+"""
+
+import json
+import time
+import logging
+import threading
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+try:
+    popcount = int.bit_count
+except AttributeError:
+    # Python 3.10 之前没有 int.bit_count
+    def popcount(value: int) -> int:
+        return bin(value).count('1')
+
+FACETS = ('type', 'direction', 'source')
+SORT_FIELDS = {'date': None, 'id': 'id', 'company': 'company', 'title': 'title', 'position': 'title'}
+MAX_LIMIT = 1000
+
+# 爬虫发布数据代数的文件，与 crawlers/main_crawler.py 中的 GENERATION_FILE 一致
+GENERATION_FILE = 'generation.json'
+
+logger = logging.getLogger('job_index')
+
+# 排序顺序切成的段数，翻页时最多与这么多个位图求交
+SORT_CHUNKS = 256
+
+# 超过两个字的查询，命中文档数不超过该值时逐条核对原文，结果与子串匹配完全一致；
+# 更多时以 "查询的每个两字片段都出现" 作为匹配条件。一两个字的查询本身就是一个片段，总是精确的
+RECHECK_LIMIT = 1000
+
+def load_jobs(data_dir) -> List[Dict]:
+    """读取网站数据，优先使用分片，没有分片时读取 jobs.json"""
+    data_dir = Path(data_dir)
+    manifest_file = data_dir / 'shards' / 'manifest.json'
+    if manifest_file.exists():
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        jobs = []
+        for entry in manifest['dates']:
+            for page in entry['pages']:
+                with open(data_dir / 'shards' / page['file'], 'r', encoding='utf-8') as f:
+                    jobs.extend(json.load(f))
+        return jobs
+    with open(data_dir / 'jobs.json', 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def read_generation(data_dir) -> Optional[int]:
+    """读取爬虫发布的数据代数，文件不存在或不完整时返回 None"""
+    try:
+        with open(Path(data_dir) / GENERATION_FILE, 'r', encoding='utf-8') as f:
+            return int(json.load(f)['generation'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def ngrams(text: str) -> Iterator[str]:
+    """文本中的单字和相邻两字"""
+    yield from text
+    for i in range(len(text) - 1):
+        yield text[i:i + 2]
+
+def query_grams(query: str) -> List[str]:
+    """查询使用的片段: 单字查询用单字，其余用相邻两字"""
+    if len(query) == 1:
+        return [query]
+    return list({query[i:i + 2] for i in range(len(query) - 1)})
+
+class JobIndex:
+    """职位倒排索引，建立后只读，可以在多个线程中同时查询
+
+    常见片段的倒排表是整数位图，少见片段是文档号数组，
+    大量少见片段只占与文档数成正比的内存。
+    """
+
+    def __init__(self, jobs: Iterable[Dict], generation: Optional[int] = None):
+        self.generation = generation
+        self.jobs: List[Dict] = sorted(jobs, key=lambda job: (job.get('date') or '', job.get('id') or 0),
+                                       reverse=True)
+        count = len(self.jobs)
+        self.all = (1 << count) - 1
+        self.texts: List[str] = [
+            '\n'.join((job.get('title') or '', job.get('company') or '',
+                       ' '.join(job.get('codes') or [job.get('code') or '']))).lower()
+            for job in self.jobs
+        ]
+
+        postings: Dict[str, array] = {}
+        for doc, text in enumerate(self.texts):
+            for gram in set(ngrams(text)):
+                posting = postings.get(gram)
+                if posting is None:
+                    posting = postings[gram] = array('I')
+                posting.append(doc)
+        # 位图固定 count/8 字节，数组 4 字节/文档；超过 count/64 个文档就用位图，
+        # 位图最多占用等量数组的两倍内存，换来查询时不用转换
+        self.postings: Dict[str, object] = {
+            gram: self._to_bitmap(docs) if len(docs) * 64 > count else docs
+            for gram, docs in postings.items()
+        }
+
+        self.facets: Dict[str, Dict[str, int]] = {}
+        for facet in FACETS:
+            values: Dict[str, List[int]] = {}
+            for doc, job in enumerate(self.jobs):
+                for value in self._facet_values(job, facet):
+                    values.setdefault(value, []).append(doc)
+            self.facets[facet] = {value: self._to_bitmap(docs) for value, docs in values.items()}
+
+        # 每种排序下每个文档的名次（相同时按日期倒序），以及按名次切段的位图
+        self.ranks: Dict[str, array] = {}
+        self.chunks: Dict[str, List[int]] = {}
+        self.chunk_size = chunk_size = max(1, -(-count // SORT_CHUNKS))
+        for field in set(filter(None, SORT_FIELDS.values())):
+            order = sorted(range(count), key=self._sort_key(field))
+            rank = array('I', bytes(4 * count))
+            for position, doc in enumerate(order):
+                rank[doc] = position
+            self.ranks[field] = rank
+            self.chunks[field] = [self._to_bitmap(order[start:start + chunk_size])
+                                  for start in range(0, count, chunk_size)]
+            if field == 'id':
+                # ID从大到小的取负值，升序排列，供 before_id 二分查找起始名次
+                self.id_keys = [-self._job_id(self.jobs[doc]) for doc in order]
+
+    def _sort_key(self, field: str):
+        if field == 'id':
+            return lambda doc: (-self._job_id(self.jobs[doc]), doc)
+        return lambda doc: (self.jobs[doc].get(field) or '', doc)
+
+    @staticmethod
+    def _job_id(job: Dict) -> int:
+        try:
+            return int(job.get('id') or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    @staticmethod
+    def _facet_values(job: Dict, facet: str) -> List[str]:
+        # 跨平台合并的职位在每个来源下都能筛选到
+        if facet == 'source':
+            return [value for value in (job.get('sources') or [job.get('source')]) if value]
+        return [job[facet]] if job.get(facet) else []
+
+    def _to_bitmap(self, docs: Iterable[int]) -> int:
+        flags = bytearray((len(self.jobs) + 7) // 8)
+        for doc in docs:
+            flags[doc >> 3] |= 1 << (doc & 7)
+        return int.from_bytes(flags, 'little')
+
+    def _flags(self, bitmap: int) -> bytes:
+        return bitmap.to_bytes((len(self.jobs) + 7) // 8, 'little')
+
+    def _iter_docs(self, bitmap: int, skip: int = 0) -> Iterator[int]:
+        """按文档号从小到大产出位图中的文档，跳过前 skip 个"""
+        words = array('Q', bitmap.to_bytes((len(self.jobs) + 63) // 64 * 8, 'little'))
+        for index, word in enumerate(words):
+            if not word:
+                continue
+            if skip:
+                bits = popcount(word)
+                if skip >= bits:
+                    skip -= bits
+                    continue
+            base = index * 64
+            while word:
+                low = word & -word
+                if skip:
+                    skip -= 1
+                else:
+                    yield base + low.bit_length() - 1
+                word ^= low
+
+    def _text_mask(self, query: str) -> int:
+        """匹配查询文本的文档位图"""
+        query = query.lower()
+        postings = [self.postings.get(gram) for gram in query_grams(query)]
+        if any(posting is None for posting in postings):
+            return 0
+
+        mask = self.all
+        arrays = sorted((p for p in postings if isinstance(p, array)), key=len)
+        for bitmap in postings:
+            if not isinstance(bitmap, array):
+                mask &= bitmap
+        if arrays:
+            docs = arrays[0] if len(arrays) == 1 else set(arrays[0]).intersection(*arrays[1:])
+            mask &= self._to_bitmap(docs)
+
+        if len(query) <= 2 or popcount(mask) > RECHECK_LIMIT:
+            return mask
+        return self._to_bitmap(doc for doc in self._iter_docs(mask) if query in self.texts[doc])
+
+    def _sorted_page(self, mask: int, field: str, offset: int, limit: int, start: int = 0) -> List[int]:
+        """按字段排序后的一页，逐段求交，跳过 offset 之前的段，只在需要的段内排序
+
+        start 为起始名次，之前的段整段跳过，所在段内只保留名次不小于 start 的文档。
+        """
+        rank = self.ranks[field]
+        page = []
+        first = start // self.chunk_size
+        for index, chunk in enumerate(self.chunks[field][first:], first):
+            if len(page) >= limit:
+                break
+            matched = mask & chunk
+            if not matched:
+                continue
+            docs = self._iter_docs(matched)
+            if index == first and start % self.chunk_size:
+                docs = [doc for doc in docs if rank[doc] >= start]
+                if not docs:
+                    continue
+                count = len(docs)
+            else:
+                count = popcount(matched)
+            if offset >= count:
+                offset -= count
+                continue
+            docs = sorted(docs, key=rank.__getitem__)
+            page.extend(docs[offset:offset + limit - len(page)])
+            offset = 0
+        return page
+
+    def _facet_mask(self, filters: Dict[str, str], exclude: Optional[str] = None) -> int:
+        mask = self.all
+        for facet in FACETS:
+            value = filters.get(facet)
+            if facet == exclude or not value or value == 'all':
+                continue
+            mask &= self.facets[facet].get(value, 0)
+        return mask
+
+    def query(self, filters: Dict[str, str], sort: str = 'date', offset: int = 0,
+              limit: int = 20, with_facets: bool = True, before_id: Optional[int] = None) -> Dict:
+        """筛选、排序并分页
+
+        filters 可包含 search、type、direction、source，取值 'all' 或空表示不限。
+        分类计数不受本分类自身的筛选影响，便于切换到同组的其他取值。
+        按ID排序时结果带有 next_before_id，作为下一页的 before_id 传入，本页已是最后一页时为 None。
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f'不支持的排序字段: {sort}')
+        if before_id is not None and sort != 'id':
+            raise ValueError('before_id 只能与 sort=id 一起使用')
+        offset = max(0, offset)
+        limit = max(0, min(limit, MAX_LIMIT))
+
+        search = (filters.get('search') or '').strip()
+        text = self._text_mask(search) if search else self.all
+        mask = text & self._facet_mask(filters)
+        total = popcount(mask)
+
+        field = SORT_FIELDS[sort]
+        if field is None:
+            page = [doc for _, doc in zip(range(limit), self._iter_docs(mask, offset))]
+        else:
+            start = bisect_right(self.id_keys, -before_id) if before_id is not None else 0
+            page = self._sorted_page(mask, field, offset, limit, start)
+
+        result = {'total': total, 'offset': offset, 'limit': limit, 'jobs': [self.jobs[doc] for doc in page]}
+        if sort == 'id':
+            result['next_before_id'] = self._job_id(self.jobs[page[-1]]) if page and len(page) == limit else None
+        if with_facets:
+            result['facets'] = {facet: self._facet_counts(facet, text, filters) for facet in FACETS}
+        return result
+
+    def _facet_counts(self, facet: str, text: int, filters: Dict[str, str]) -> Dict[str, int]:
+        base = text & self._facet_mask(filters, exclude=facet)
+        counts = {value: popcount(base & bitmap) for value, bitmap in self.facets[facet].items()}
+        return {value: count for value, count in counts.items() if count}
+
+class JobIndexHolder:
+    """双缓冲的索引: 查询读取 current 引用，新索引在后台建好后一次性替换
+
+    替换只是一次引用赋值，已经拿到旧索引的查询照常完成，旧索引随后被回收。
+    """
+
+    def __init__(self, data_dir, interval: float = 1.0):
+        self.data_dir = Path(data_dir)
+        self.interval = interval
+        self.current: Optional[JobIndex] = None
+        self.version = None
+        self._build_lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+
+    def data_version(self):
+        """当前数据的版本: 爬虫发布的代数；没有代数文件时用数据文件的修改时间"""
+        generation = read_generation(self.data_dir)
+        if generation is not None:
+            return 'generation', generation
+        for name in ('shards/manifest.json', 'jobs.json'):
+            try:
+                return name, (self.data_dir / name).stat().st_mtime_ns
+            except OSError:
+                continue
+        return None
+
+    def get(self) -> JobIndex:
+        """当前索引，还没有时立即建立；没有数据时抛出 FileNotFoundError"""
+        index = self.current
+        if index is None:
+            self.reload()
+            index = self.current
+            if index is None:
+                raise FileNotFoundError(f'{self.data_dir} 中没有职位数据')
+        return index
+
+    def reload(self, force: bool = False) -> bool:
+        """数据版本变化时建立新索引并替换，返回是否替换"""
+        with self._build_lock:
+            version = self.data_version()
+            if version is None:
+                return False
+            if not force and self.current is not None and version == self.version:
+                return False
+            # 先读版本再读数据，读取期间又发布了新数据时，下一轮检查会再更新一次
+            generation = version[1] if version[0] == 'generation' else None
+            index = JobIndex(load_jobs(self.data_dir), generation)
+            self.current, self.version = index, version
+            return True
+
+    def watch(self):
+        """启动后台线程，每 interval 秒检查一次数据版本"""
+        if self._watcher is not None:
+            return
+        self._watcher = threading.Thread(target=self._watch_loop, name='job-index-watcher', daemon=True)
+        self._watcher.start()
+
+    def _watch_loop(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                started = time.perf_counter()
+                if self.reload():
+                    logger.info(f'查询索引已更新: 代数 {self.current.generation}，{len(self.current)} 个职位，'
+                                f'耗时 {time.perf_counter() - started:.2f} s')
+            except Exception as e:
+                # 爬虫正在写入时可能读到被替换的分片，数据中也可能有格式不对的行；
+                # 任何错误都不能结束监视线程，保留旧索引，下一轮重试
+                logger.warning(f'重建查询索引失败，继续使用旧索引: {e!r}')
+
+_shared_holder: Optional[JobIndexHolder] = None
+_shared_lock = threading.Lock()
+
+def get_index_holder(data_dir) -> JobIndexHolder:
+    """获取全局共享的索引容器"""
+    global _shared_holder
+    with _shared_lock:
+        if _shared_holder is None:
+            _shared_holder = JobIndexHolder(data_dir)
+        return _shared_holder
+
+def get_job_index(data_dir) -> JobIndex:
+    """获取当前的查询索引，第一次调用时从 data_dir 读取数据建立"""
+    return get_index_holder(data_dir).get()
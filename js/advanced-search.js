@@ -423,15 +423,20 @@ class AdvancedSearch {
         suggestions.style.display = 'none';
         input.parentNode.appendChild(suggestions);
 
-        input.addEventListener('input', () => {
+        // 建议是异步获取的，只显示最近一次输入的结果
+        let latest = 0;
+        input.addEventListener('input', async () => {
             const value = input.value.toLowerCase();
+            const request = ++latest;
             if (value.length < 2) {
                 suggestions.style.display = 'none';
                 return;
             }
 
-            const matches = this.getSearchSuggestions(value);
-            this.displaySuggestions(suggestions, matches, input);
+            const matches = await this.getSearchSuggestions(value);
+            if (request === latest) {
+                this.displaySuggestions(suggestions, matches, input);
+            }
         });
 
         // 点击外部隐藏建议
@@ -442,26 +447,14 @@ class AdvancedSearch {
         });
     }
 
-    getSearchSuggestions(query) {
-        const jobs = this.dataManager.getAllJobs();
-        const suggestions = new Set();
-
-        jobs.forEach(job => {
-            // 匹配公司名
-            if (job.company.toLowerCase().includes(query)) {
-                suggestions.add(job.company);
-            }
-            // 匹配职位名
-            if (job.title.toLowerCase().includes(query)) {
-                suggestions.add(job.title);
-            }
-            // 匹配技术方向
-            if (job.direction.toLowerCase().includes(query)) {
-                suggestions.add(job.direction);
-            }
-        });
-
-        return Array.from(suggestions).slice(0, 8);
+    // 从全部职位中匹配公司名、职位名和技术方向，而不只是已加载的职位
+    async getSearchSuggestions(query) {
+        try {
+            return await this.dataManager.getSearchSuggestions(query, 8);
+        } catch (error) {
+            console.warn('获取搜索建议失败:', error);
+            return [];
+        }
     }
 
     displaySuggestions(container, suggestions, input) {
@@ -5,25 +5,50 @@ class DataManager {
         this.statistics = {};
         this.dataUrl = 'data/jobs.json';
         this.statsUrl = 'data/statistics.json';
+        this.shardsUrl = 'data/shards/';
+        this.apiUrl = 'api/jobs';
+        // 服务器是否提供查询接口，第一次查询时确定
+        this.apiAvailable = null;
         this.lastUpdateTime = null;
+        // 分片清单；没有分片时为 null，退回到一次加载完整的 jobs.json
+        this.manifest = null;
+        this.pages = [];
+        this.loadedPages = 0;
+        this.shardCache = new Map();
+        this.facetCache = new Map();
     }
 
     // 加载数据
     async loadData() {
         try {
-            // 并行加载职位数据和统计数据
-            const [jobsResponse, statsResponse] = await Promise.all([
-                fetch(this.dataUrl).catch(() => null),
+            // 并行加载分片清单和统计数据
+            const [manifestResponse, statsResponse] = await Promise.all([
+                fetch(`${this.shardsUrl}manifest.json`, { cache: 'no-cache' }).catch(() => null),
                 fetch(this.statsUrl).catch(() => null)
             ]);
 
-            // 加载职位数据
-            if (jobsResponse && jobsResponse.ok) {
-                this.jobs = await jobsResponse.json();
-                console.log(`已加载 ${this.jobs.length} 个职位数据`);
+            this.jobs = [];
+            this.loadedPages = 0;
+            this.shardCache.clear();
+            this.facetCache.clear();
+
+            if (manifestResponse && manifestResponse.ok) {
+                // 有分片时只加载第一个分片，其余分片在需要显示时再加载
+                this.manifest = await manifestResponse.json();
+                this.pages = this.manifest.dates.flatMap(entry => entry.pages);
+                await this.loadJobs(1);
+                console.log(`已加载 ${this.jobs.length}/${this.manifest.total} 个职位数据`);
             } else {
-                console.warn('无法加载职位数据，使用示例数据');
-                this.jobs = this.generateSampleData();
+                this.manifest = null;
+                this.pages = [];
+                const jobsResponse = await fetch(this.dataUrl).catch(() => null);
+                if (jobsResponse && jobsResponse.ok) {
+                    this.jobs = await jobsResponse.json();
+                    console.log(`已加载 ${this.jobs.length} 个职位数据`);
+                } else {
+                    console.warn('无法加载职位数据，使用示例数据');
+                    this.jobs = this.generateSampleData();
+                }
             }
 
             // 加载统计数据
@@ -39,12 +64,177 @@ class DataManager {
             return this.jobs;
         } catch (error) {
             console.error('数据加载失败:', error);
+            this.manifest = null;
             this.jobs = this.generateSampleData();
             this.generateStatistics();
             return this.jobs;
         }
     }
 
+    // 加载一个分片，URL 带内容哈希，内容不变时浏览器缓存一直有效
+    async fetchShard(entry) {
+        const key = `${entry.file}?v=${entry.hash}`;
+        if (!this.shardCache.has(key)) {
+            const request = fetch(this.shardsUrl + key).then(response => {
+                if (!response.ok) {
+                    throw new Error(`分片加载失败: ${entry.file}`);
+                }
+                return response.json();
+            });
+            // 失败的请求不缓存，下次重试
+            request.catch(() => this.shardCache.delete(key));
+            this.shardCache.set(key, request);
+        }
+        return this.shardCache.get(key);
+    }
+
+    // 按日期顺序加载分片，直到至少有 count 个职位或全部加载完
+    async loadJobs(count) {
+        while (this.manifest && this.jobs.length < count && this.loadedPages < this.pages.length) {
+            const jobs = await this.fetchShard(this.pages[this.loadedPages]);
+            this.jobs.push(...jobs);
+            this.loadedPages++;
+        }
+        return this.jobs;
+    }
+
+    // 加载全部分片（全文搜索和非日期排序需要完整数据）
+    async loadAllJobs() {
+        return this.loadJobs(Infinity);
+    }
+
+    // 是否还有未加载的分片
+    hasMoreJobs() {
+        return this.manifest !== null && this.loadedPages < this.pages.length;
+    }
+
+    // 加载分类索引: 取值 -> 日期 -> 职位ID
+    async fetchFacet(facet) {
+        const entry = this.manifest.facets[facet];
+        if (!this.facetCache.has(facet)) {
+            const request = this.fetchShard(entry);
+            request.catch(() => this.facetCache.delete(facet));
+            this.facetCache.set(facet, request);
+        }
+        return this.facetCache.get(facet);
+    }
+
+    // 查询前 limit 个符合条件的职位，返回 { jobs, total }
+    // 只按类型/方向/来源筛选时用分类索引找到职位所在的日期，只加载这些日期的分片
+    async queryJobs(filters, limit = Infinity, sortBy = 'date') {
+        // 服务器提供 /api/jobs 时由服务器端索引查询，静态部署时在浏览器中筛选
+        if (this.apiAvailable !== false) {
+            const result = await this.queryApi(filters, limit, sortBy);
+            if (result) return result;
+        }
+
+        const active = ['source', 'type', 'direction'].filter(facet => filters[facet] && filters[facet] !== 'all');
+
+        if (this.manifest && !filters.search && sortBy === 'date') {
+            if (active.length === 0) {
+                await this.loadJobs(limit);
+                return { jobs: this.jobs.slice(0, limit), total: this.manifest.total };
+            }
+            try {
+                return await this.queryFacets(filters, active, limit);
+            } catch (error) {
+                console.warn('分类索引不可用，加载全部分片后筛选:', error);
+            }
+        }
+
+        if (this.manifest) {
+            await this.loadAllJobs();
+        }
+        const matched = this.sortJobs(this.filterJobs(filters), sortBy);
+        return { jobs: matched.slice(0, limit), total: matched.length };
+    }
+
+    // 搜索建议：有查询接口时从服务器端的全部职位中匹配；
+    // 静态部署时用分类索引中的公司和方向，加上已加载职位的标题
+    async getSearchSuggestions(query, limit = 8) {
+        query = query.toLowerCase();
+        const suggestions = new Set();
+        const add = value => {
+            if (value && value.toLowerCase().includes(query)) suggestions.add(value);
+        };
+        const addJob = job => {
+            add(job.company);
+            add(job.title);
+            add(job.direction);
+        };
+
+        if (this.apiAvailable !== false) {
+            const result = await this.queryApi({ search: query }, 50, 'date');
+            if (result) {
+                result.jobs.forEach(addJob);
+                return Array.from(suggestions).slice(0, limit);
+            }
+        }
+
+        if (this.manifest) {
+            const facets = ['company', 'direction'].filter(facet => this.manifest.facets[facet]);
+            try {
+                const indexes = await Promise.all(facets.map(facet => this.fetchFacet(facet)));
+                indexes.forEach(index => Object.keys(index).forEach(add));
+            } catch (error) {
+                console.warn('分类索引不可用，只用已加载的职位生成搜索建议:', error);
+            }
+        }
+        this.jobs.forEach(addJob);
+        return Array.from(suggestions).slice(0, limit);
+    }
+
+    // 最新发布按ID从新到旧查询，返回的 nextBeforeId 作为 beforeId 传入即得到下一页
+    async queryApi(filters, limit, sortBy, beforeId = null) {
+        const params = new URLSearchParams({
+            sort: sortBy === 'date' ? 'id' : sortBy,
+            limit: Number.isFinite(limit) ? limit : 1000,
+            facets: 0
+        });
+        ['search', 'type', 'direction', 'source'].forEach(name => {
+            if (filters[name] && filters[name] !== 'all') params.set(name, filters[name]);
+        });
+        if (beforeId !== null) params.set('before_id', beforeId);
+
+        try {
+            const response = await fetch(`${this.apiUrl}?${params}`);
+            if (!response.ok) {
+                // 静态部署没有查询接口，之后不再尝试
+                if (response.status === 404) this.apiAvailable = false;
+                return null;
+            }
+            const { jobs, total, next_before_id: nextBeforeId = null } = await response.json();
+            this.apiAvailable = true;
+            return { jobs, total, nextBeforeId };
+        } catch (error) {
+            this.apiAvailable = false;
+            return null;
+        }
+    }
+
+    async queryFacets(filters, active, limit) {
+        const indexes = await Promise.all(active.map(facet => this.fetchFacet(facet)));
+        const byDate = indexes.map((index, i) => index[filters[active[i]]] || {});
+
+        // 每个日期上各条件ID的交集
+        const matches = this.manifest.dates.map(entry => {
+            const [first, ...rest] = byDate.map(dates => dates[entry.date] || []);
+            const others = rest.map(ids => new Set(ids));
+            return { entry, ids: new Set(first.filter(id => others.every(ids => ids.has(id)))) };
+        }).filter(match => match.ids.size > 0);
+        const total = matches.reduce((sum, match) => sum + match.ids.size, 0);
+
+        const jobs = [];
+        for (const { entry, ids } of matches) {
+            if (jobs.length >= limit) break;
+            const pages = await Promise.all(entry.pages.map(page => this.fetchShard(page)));
+            pages.flat().forEach(job => {
+                if (ids.has(job.id)) jobs.push(job);
+            });
+        }
+        return { jobs: jobs.slice(0, limit), total };
+    }
+
     // 生成示例数据（当无法加载真实数据时使用）
     generateSampleData() {
         const companies = ['字节跳动', '腾讯', '阿里巴巴', '百度', '美团', '网易', '滴滴', '快手', '小红书', '蚂蚁集团'];
@@ -158,7 +348,7 @@ class DataManager {
     // 生成统计数据
     generateStatistics() {
         const stats = {
-            total_jobs: this.jobs.length,
+            total_jobs: this.manifest ? this.manifest.total : this.jobs.length,
             update_time: new Date().toLocaleString('zh-CN'),
             by_source: {},
             by_type: {},
@@ -207,11 +397,12 @@ class DataManager {
         return this.jobs.filter(job => {
             const typeMatch = !filters.type || filters.type === 'all' || job.type === filters.type;
             const directionMatch = !filters.direction || filters.direction === 'all' || job.direction === filters.direction;
-            const sourceMatch = !filters.source || filters.source === 'all' || job.source === filters.source;
+            // 跨平台合并后的职位在 sources 中记录全部来源
+            const sourceMatch = !filters.source || filters.source === 'all' || (job.sources || [job.source]).includes(filters.source);
             const searchMatch = !filters.search || 
                                job.title.toLowerCase().includes(filters.search.toLowerCase()) ||
                                job.company.toLowerCase().includes(filters.search.toLowerCase()) ||
-                               job.code.toLowerCase().includes(filters.search.toLowerCase());
+                               (job.codes || [job.code]).some(code => code.toLowerCase().includes(filters.search.toLowerCase()));
 
             return typeMatch && directionMatch && sourceMatch && searchMatch;
         });
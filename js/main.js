@@ -11,6 +11,13 @@ class JobManager {
             search: ''
         };
         this.sortBy = 'date';
+        // 每次多显示 pageSize 个职位，未显示的分片不加载
+        this.pageSize = 60;
+        this.visibleCount = this.pageSize;
+        this.totalMatches = 0;
+        // 服务器返回的下一页起点，没有时按 visibleCount 重新查询
+        this.nextBeforeId = null;
+        this.queryId = 0;
         this.init();
     }
 
@@ -18,7 +25,7 @@ class JobManager {
         this.showLoading(true);
         await this.loadJobs();
         this.bindEvents();
-        this.renderJobs();
+        await this.applyFilters();
         this.updateStats();
         this.showLoading(false);
     }
@@ -49,6 +56,7 @@ class JobManager {
         const searchInput = document.getElementById('searchInput');
         searchInput.addEventListener('input', (e) => {
             this.filters.search = e.target.value.toLowerCase();
+            this.visibleCount = this.pageSize;
             this.applyFilters();
         });
 
@@ -83,21 +91,49 @@ class JobManager {
 
         // 更新筛选条件
         this.filters[filterCategory] = filterType;
+        this.visibleCount = this.pageSize;
         this.applyFilters();
     }
 
     // 应用筛选
-    applyFilters() {
-        // 使用数据管理器的筛选功能
-        this.filteredJobs = this.dataManager.filterJobs(this.filters);
-        this.applySorting();
+    async applyFilters() {
+        // 使用数据管理器查询前 visibleCount 个职位，只加载需要的分片
+        const queryId = ++this.queryId;
+        const { jobs, total, nextBeforeId = null } = await this.dataManager.queryJobs(this.filters, this.visibleCount, this.sortBy);
+        // 输入较快时忽略已过期的查询结果
+        if (queryId !== this.queryId) return;
+
+        this.filteredJobs = jobs;
+        this.totalMatches = total;
+        this.nextBeforeId = nextBeforeId;
+        this.renderJobs();
     }
 
     // 应用排序
     applySorting() {
-        // 使用数据管理器的排序功能
-        this.filteredJobs = this.dataManager.sortJobs(this.filteredJobs, this.sortBy);
-        this.renderJobs();
+        // 按公司或职位排序需要完整数据，由数据管理器排序后再截取
+        this.visibleCount = this.pageSize;
+        this.applyFilters();
+    }
+
+    // 加载更多职位
+    async loadMoreJobs() {
+        // 服务器按ID分页时只请求下一页追加到列表，不重新查询已显示的职位
+        if (this.nextBeforeId !== null) {
+            const queryId = ++this.queryId;
+            const result = await this.dataManager.queryApi(this.filters, this.pageSize, this.sortBy, this.nextBeforeId);
+            if (queryId !== this.queryId) return;
+            if (result) {
+                this.visibleCount += this.pageSize;
+                this.filteredJobs = this.filteredJobs.concat(result.jobs);
+                this.totalMatches = result.total;
+                this.nextBeforeId = result.nextBeforeId;
+                this.renderJobs();
+                return;
+            }
+        }
+        this.visibleCount += this.pageSize;
+        this.applyFilters();
     }
 
     // 渲染职位列表
@@ -141,6 +177,19 @@ class JobManager {
             </div>
         `).join('');
 
+        const remaining = this.totalMatches - this.filteredJobs.length;
+        if (remaining > 0) {
+            jobsGrid.insertAdjacentHTML('beforeend', `
+                <button class="refresh-btn load-more-btn">
+                    <i class="fas fa-angle-down"></i>
+                    加载更多（还有 ${remaining} 个）
+                </button>
+            `);
+            jobsGrid.querySelector('.load-more-btn').addEventListener('click', () => {
+                this.loadMoreJobs();
+            });
+        }
+
         // 添加职位卡片点击事件
         jobsGrid.querySelectorAll('.job-card').forEach(card => {
             card.addEventListener('click', (e) => {
@@ -152,7 +201,7 @@ class JobManager {
 
     // 显示职位详情
     showJobDetail(jobId) {
-        const job = this.jobs.find(j => j.id === jobId);
+        const job = this.filteredJobs.find(j => j.id === jobId) || this.dataManager.getJobById(jobId);
         if (!job) return;
 
         // 创建模态框显示详情
@@ -169,9 +218,9 @@ class JobManager {
                         <p><strong>公司:</strong> ${job.company}</p>
                         <p><strong>职位类型:</strong> ${job.type}</p>
                         <p><strong>技术方向:</strong> ${job.direction}</p>
-                        <p><strong>数据来源:</strong> ${job.source}</p>
+                        <p><strong>数据来源:</strong> ${(job.sources || [job.source]).join('、')}</p>
                         <p><strong>发布时间:</strong> ${this.formatDate(job.date)}</p>
-                        <p><strong>内推码:</strong> <code>${job.code}</code></p>
+                        <p><strong>内推码:</strong> ${(job.codes || [job.code]).map(code => `<code>${code}</code>`).join(' ')}</p>
                     </div>
                     <div class="job-description">
                         <h3>职位描述</h3>
@@ -240,8 +289,8 @@ class JobManager {
         try {
             // 使用数据管理器刷新数据
             this.jobs = await this.dataManager.refreshData();
-            this.filteredJobs = [...this.jobs];
-            this.applyFilters();
+            this.visibleCount = this.pageSize;
+            await this.applyFilters();
             this.updateStats();
             this.showToast('数据已更新');
         } catch (error) {
@@ -352,9 +401,9 @@ document.addEventListener('DOMContentLoaded', () => {
 });
 
 // 扩展JobManager类以支持高级功能
-JobManager.prototype.applyAdvancedFilters = function(filterData) {
-    // 应用高级筛选逻辑
-    let filteredJobs = this.jobs;
+JobManager.prototype.applyAdvancedFilters = async function(filterData) {
+    // 应用高级筛选逻辑，条件涉及描述和要求，需要加载全部分片
+    let filteredJobs = await this.dataManager.loadAllJobs();
     
     // 薪资筛选
     if (filterData.salaryMin && filterData.salaryMax) {
@@ -391,7 +440,10 @@ JobManager.prototype.applyAdvancedFilters = function(filterData) {
     }
     
     // 更新显示
+    this.queryId++;
     this.filteredJobs = filteredJobs;
+    this.totalMatches = filteredJobs.length;
+    this.nextBeforeId = null;
     this.renderJobs();
     
     // 显示筛选结果统计
@@ -428,8 +480,8 @@ JobManager.prototype.clearFilters = function() {
         search: ''
     };
     
-    this.filteredJobs = [...this.jobs];
-    this.renderJobs();
+    this.visibleCount = this.pageSize;
+    this.applyFilters();
     
     // 移除筛选结果显示
     const resultDiv = document.querySelector('.filter-result');
@@ -604,6 +656,11 @@ const additionalStyles = `
     border-left: 4px solid var(--danger-color);
 }
 
+.load-more-btn {
+    grid-column: 1 / -1;
+    justify-self: center;
+}
+
 @media (max-width: 768px) {
     .modal-content {
         width: 95%;
@@ -8,8 +8,6 @@
 import os
 import sys
 import argparse
-import schedule
-import time
 from datetime import datetime
 from pathlib import Path
 
@@ -28,10 +26,10 @@ def run_crawler():
     
     try:
         crawler = MainCrawler()
-        jobs, stats = crawler.run()
+        total_jobs, stats = crawler.run()
         
         print(f"\n✅ 爬虫运行成功!")
-        print(f"📊 获取职位: {len(jobs)} 个")
+        print(f"📊 获取职位: {total_jobs} 个")
         print(f"🕐 今日新增: {stats.get('today_jobs', 0)} 个")
         print(f"📅 更新时间: {stats.get('update_time', '未知')}")
         
@@ -41,30 +39,64 @@ def run_crawler():
         print(f"\n❌ 爬虫运行失败: {e}")
         return False
 
-def setup_schedule():
-    """设置定时任务"""
-    # 每天早上9点运行
-    schedule.every().day.at("09:00").do(run_crawler)
+def run_backfill(since, until):
+    """回填历史数据"""
+    print(f"\n{'='*60}")
+    print(f"🕒 {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - 开始回填 {since} ~ {until or '最新'}")
+    print(f"{'='*60}")
     
-    # 每天下午2点运行
-    schedule.every().day.at("14:00").do(run_crawler)
+    try:
+        crawler = MainCrawler()
+        total_jobs, stats = crawler.backfill(since, until)
+        
+        print(f"\n✅ 回填完成!")
+        print(f"📊 网站职位: {total_jobs} 个")
+        print(f"📅 更新时间: {stats.get('update_time', '未知')}")
+        
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ 回填失败: {e}")
+        print("💡 提示: 使用相同的日期范围重新运行即可从检查点继续")
+        return False
+
+def date_arg(value):
+    """校验 YYYY-MM-DD 格式的日期参数"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        raise argparse.ArgumentTypeError(f'日期格式应为 YYYY-MM-DD: {value}')
+
+def setup_scheduler():
+    """创建按平台调度的爬虫，并显示各平台的运行节奏"""
+    crawler = MainCrawler()
+    scheduler = crawler.create_scheduler()
     
-    # 每天晚上8点运行
-    schedule.every().day.at("20:00").do(run_crawler)
+    print("📅 各平台调度设置:")
+    for task in scheduler.tasks.values():
+        max_runtime = f"{task.max_runtime / 60:.0f} 分钟" if task.max_runtime else "不限"
+        print(f"   - {task.platform}: 每 {task.interval / 60:.0f} 分钟 (±{task.jitter / 60:.0f} 分钟), "
+              f"最长运行 {max_runtime}, 优先级 {task.priority}")
     
-    print("📅 定时任务已设置:")
-    print("   - 每天 09:00 自动运行")
-    print("   - 每天 14:00 自动运行") 
-    print("   - 每天 20:00 自动运行")
+    return scheduler
 
 def main():
     parser = argparse.ArgumentParser(description='内推码爬虫系统')
-    parser.add_argument('--mode', choices=['once', 'schedule'], default='once',
-                       help='运行模式: once=单次运行, schedule=定时运行')
-    parser.add_argument('--interval', type=int, default=60,
-                       help='定时模式下的检查间隔(秒), 默认60秒')
+    parser.add_argument('--mode', choices=['once', 'schedule', 'backfill'], default='once',
+                       help='运行模式: once=单次运行, schedule=定时运行, backfill=回填历史数据')
+    parser.add_argument('--interval', type=int,
+                       help='已弃用: 调度器直接等待到下一个平台的运行时间，不再轮询')
+    parser.add_argument('--since', type=date_arg,
+                       help='回填模式下的起始日期 YYYY-MM-DD')
+    parser.add_argument('--until', type=date_arg,
+                       help='回填模式下的结束日期 YYYY-MM-DD（含当天）, 默认不限，回填到最新')
     
     args = parser.parse_args()
+    if args.mode == 'backfill':
+        if not args.since:
+            parser.error('回填模式需要指定 --since')
+        if args.until and args.since > args.until:
+            parser.error('--since 不能晚于 --until')
     
     print("🤖 内推码爬虫系统启动")
     print(f"📁 工作目录: {current_dir}")
@@ -76,20 +108,27 @@ def main():
         success = run_crawler()
         sys.exit(0 if success else 1)
         
+    elif args.mode == 'backfill':
+        # 回填历史数据
+        print(f"\n📚 开始回填历史数据: {args.since} ~ {args.until or '最新'}")
+        success = run_backfill(args.since, args.until)
+        sys.exit(0 if success else 1)
+        
     elif args.mode == 'schedule':
-        # 定时运行
-        print(f"\n⏰ 启动定时爬虫 (检查间隔: {args.interval}秒)")
-        setup_schedule()
+        # 定时运行：各平台按自己的间隔独立调度
+        print("\n⏰ 启动定时爬虫")
+        if args.interval is not None:
+            print("⚠️  --interval 已弃用，运行间隔在 crawler_config 的 platforms.<平台>.schedule 中设置")
+        scheduler = setup_scheduler()
         
         print(f"\n🔄 系统正在运行中... (按 Ctrl+C 停止)")
         print(f"💡 提示: 可以访问网站查看最新数据")
         
         try:
-            while True:
-                schedule.run_pending()
-                time.sleep(args.interval)
+            scheduler.run_forever()
                 
         except KeyboardInterrupt:
+            scheduler.stop()
             print(f"\n\n🛑 用户中断，系统停止运行")
             print("👋 再见!")
 
@@ -2,18 +2,152 @@
 # -*- coding: utf-8 -*-
 """
 本地开发服务器
-用于本地测试网站
+用于本地测试网站；--production 模式使用多线程服务器，适合直接对外提供服务
 """
 
+import io
 import os
+import posixpath
 import sys
+import gzip
+import json
+import time
+import logging
+import argparse
+import threading
+import email.utils
 import http.server
 import socketserver
 import webbrowser
+from collections import OrderedDict
 from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from job_index import get_index_holder, get_job_index
+
+DATA_DIR = Path(__file__).parent / 'data'
+
+# 按优先级排列的预压缩副本: (Content-Encoding, 文件后缀)，由爬虫导出数据时生成
+PRECOMPRESSED = (('br', '.br'), ('gzip', '.gz'))
+
+# 生产模式按路径设置 Cache-Control，按顺序取第一条匹配的规则: (路径前缀, 后缀, 带版本参数, 取值)
+CACHE_CONTROL_RULES = (
+    # 分片 URL 带内容哈希，内容变化时 URL 也会变化
+    ('/data/shards/', '', True, 'public, max-age=31536000, immutable'),
+    # 数据文件、页面和 Service Worker 每次都向服务器确认，未变化时返回 304
+    ('/api/', '', False, 'no-cache'),
+    ('/data/', '', False, 'no-cache'),
+    ('/', '.html', False, 'no-cache'),
+    ('/sw.js', '', False, 'no-cache'),
+    ('/', '.js', False, 'public, max-age=3600'),
+    ('/', '.css', False, 'public, max-age=3600'),
+    ('/', '', False, 'public, max-age=86400'),
+)
+
+def accepted_encodings(header):
+    """解析 Accept-Encoding，返回 q 值大于 0 的编码"""
+    accepted = set()
+    for part in header.split(','):
+        name, _, params = part.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if name and q > 0:
+            accepted.add(name.strip().lower())
+    if '*' in accepted:
+        accepted.update(encoding for encoding, _ in PRECOMPRESSED)
+    return accepted
+
+def make_etag(mtime_ns, size, encoding=None):
+    # 不同编码的副本内容不同，ETag 中带上编码
+    return f'"{mtime_ns:x}-{size:x}{"-" + encoding if encoding else ""}"'
+
+def cache_control(request_path):
+    """按路径取 Cache-Control 的值"""
+    url = urlsplit(request_path)
+    versioned = 'v=' in url.query
+    for prefix, suffix, needs_version, value in CACHE_CONTROL_RULES:
+        if url.path.startswith(prefix) and url.path.endswith(suffix) and (versioned or not needs_version):
+            return value
+    return 'no-cache'
+
+class CachedFile:
+    """缓存的文件内容，mtime 或大小变化后失效"""
+    
+    __slots__ = ('mtime_ns', 'size', 'body', 'etag')
+    
+    def __init__(self, mtime_ns, size, body, etag):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.body = body
+        self.etag = etag
+
+class FileCache:
+    """线程安全的 LRU 文件缓存
+    
+    每次读取都 stat 一次文件，mtime 或大小变化时重新读取；
+    超过 max_file_size 的文件不缓存，总大小超过 max_bytes 时淘汰最久未用的文件。
+    """
+    
+    def __init__(self, max_bytes=64 * 1024 * 1024, max_file_size=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.max_file_size = max_file_size
+        self.total = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, path, encoding=None):
+        """返回 CachedFile，文件太大时返回 None，文件不存在时抛出 OSError"""
+        fs = os.stat(path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry.mtime_ns == fs.st_mtime_ns and entry.size == fs.st_size:
+                self._entries.move_to_end(path)
+                return entry
+        
+        if fs.st_size > self.max_file_size:
+            return None
+        
+        # 在锁外读取文件，避免慢磁盘阻塞其他请求
+        with open(path, 'rb') as f:
+            body = f.read()
+        entry = CachedFile(fs.st_mtime_ns, len(body), body, make_etag(fs.st_mtime_ns, len(body), encoding))
+        
+        with self._lock:
+            previous = self._entries.pop(path, None)
+            if previous:
+                self.total -= previous.size
+            self._entries[path] = entry
+            self.total += entry.size
+            while self.total > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.total -= evicted.size
+        return entry
+
+# 生产模式只对外提供网站资源，仓库中的其他文件（爬虫代码、数据库、日志、.git）一律返回 404
+PUBLIC_FILES = ('/', '/index.html', '/sw.js', '/manifest.json')
+PUBLIC_DIRS = ('/css/', '/js/', '/png/', '/icons/', '/data/')
+
+def is_public_path(request_path):
+    """请求路径是否属于网站资源；隐藏文件和目录列表都不对外提供"""
+    path = unquote(urlsplit(request_path).path)
+    normalized = posixpath.normpath(path)
+    if path.endswith('/') and normalized != '/':
+        return False
+    if any(part.startswith('.') for part in normalized.split('/') if part):
+        return False
+    return normalized in PUBLIC_FILES or normalized.startswith(PUBLIC_DIRS)
 
 class HTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
-    """自定义HTTP请求处理器"""
+    """自定义HTTP请求处理器
+    
+    文件旁有 .br/.gz 预压缩副本时按 Accept-Encoding 返回压缩副本，
+    所有文件带 ETag，If-None-Match 命中时返回 304。
+    """
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=str(Path(__file__).parent), **kwargs)
@@ -25,49 +159,291 @@ class HTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
         super().end_headers()
     
+    def do_GET(self):
+        if urlsplit(self.path).path == '/api/jobs':
+            self.send_jobs_query()
+            return
+        super().do_GET()
+    
+    def send_jobs_query(self):
+        """/api/jobs?search=&type=&direction=&source=&sort=date&offset=0&limit=20&facets=1&before_id=
+        
+        返回 {total, offset, limit, jobs, facets, generation, took_ms}，facets 为各分类取值的职位数，
+        generation 为索引对应的数据代数。sort=id 时按ID从新到旧，另返回 next_before_id，
+        下一页以 before_id 传入
+        """
+        params = {name: values[0] for name, values in parse_qs(urlsplit(self.path).query).items()}
+        started = time.perf_counter()
+        try:
+            index = get_job_index(DATA_DIR)
+        except (OSError, ValueError, KeyError):
+            self.send_json(503, {'error': '职位数据尚未生成，请先运行爬虫'})
+            return
+        
+        try:
+            result = index.query(
+                {name: params.get(name) for name in ('search', 'type', 'direction', 'source')},
+                sort=params.get('sort', 'date'),
+                offset=int(params.get('offset', 0)),
+                limit=int(params.get('limit', 20)),
+                with_facets=params.get('facets', '1') != '0',
+                before_id=int(params['before_id']) if params.get('before_id') else None
+            )
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+            return
+        result['generation'] = index.generation
+        result['took_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        self.send_json(200, result)
+    
+    def send_json(self, status, data):
+        body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        # 查询结果无法预压缩，较大时按请求即时压缩
+        encoding = None
+        if len(body) > 4096 and 'gzip' in accepted_encodings(self.headers.get('Accept-Encoding', '')):
+            body = gzip.compress(body, compresslevel=5)
+            encoding = 'gzip'
+        
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) or not os.path.isfile(path):
+            # 目录列表、重定向和 404 仍由默认实现处理
+            return super().send_head()
+        
+        source_mtime = os.stat(path).st_mtime_ns
+        siblings = [
+            (encoding, path + suffix) for encoding, suffix in PRECOMPRESSED
+            # 早于原文件的副本已过期，不再使用
+            if os.path.isfile(path + suffix) and os.stat(path + suffix).st_mtime_ns >= source_mtime
+        ]
+        accepted = accepted_encodings(self.headers.get('Accept-Encoding', ''))
+        for encoding, compressed_path in siblings:
+            if encoding in accepted:
+                return self.send_file(compressed_path, self.guess_type(path), encoding, vary=True)
+        return self.send_file(path, self.guess_type(path), vary=bool(siblings))
+    
+    def etag_matches(self, etag):
+        tags = [tag.strip() for tag in self.headers.get('If-None-Match', '').split(',')]
+        return '*' in tags or etag in tags or f'W/{etag}' in tags
+    
+    def send_not_modified(self, etag, vary):
+        self.send_response(304)
+        self.send_header('ETag', etag)
+        if vary:
+            self.send_header('Vary', 'Accept-Encoding')
+        self.end_headers()
+    
+    def send_file_headers(self, content_type, encoding, vary, length, mtime, etag):
+        self.send_header('Content-Type', content_type)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        if vary:
+            self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('Content-Length', str(length))
+        self.send_header('Last-Modified', email.utils.formatdate(mtime, usegmt=True))
+        self.send_header('ETag', etag)
+    
+    def send_file(self, path, content_type, encoding=None, vary=False):
+        """发送文件头并返回打开的文件，正文由 do_GET 复制"""
+        try:
+            f = open(path, 'rb')
+        except OSError:
+            self.send_error(404, 'File not found')
+            return None
+        
+        try:
+            fs = os.fstat(f.fileno())
+            etag = make_etag(fs.st_mtime_ns, fs.st_size, encoding)
+            if self.etag_matches(etag):
+                f.close()
+                self.send_not_modified(etag, vary)
+                return None
+            
+            self.send_response(200)
+            self.send_file_headers(content_type, encoding, vary, fs.st_size, fs.st_mtime, etag)
+            self.end_headers()
+            return f
+        except Exception:
+            f.close()
+            raise
+    
     def do_OPTIONS(self):
         # 处理预检请求
         self.send_response(200)
+        self.send_header('Content-Length', '0')
         self.end_headers()
     
     def log_message(self, format, *args):
         # 自定义日志格式
         print(f"[{self.log_date_time_string()}] {format % args}")
 
+class ProductionRequestHandler(HTTPRequestHandler):
+    """生产模式请求处理器
+    
+    使用 HTTP/1.1 长连接，文件内容从内存缓存读取，支持单段 Range 请求，
+    并按路径设置 Cache-Control。
+    """
+    
+    protocol_version = 'HTTP/1.1'
+    file_cache = FileCache()
+    
+    def end_headers(self):
+        self.send_header('Cache-Control', cache_control(self.path))
+        super().end_headers()
+    
+    def send_head(self):
+        # 只允许网站资源，不提供目录列表（根路径仍返回 index.html）
+        path = self.translate_path(self.path)
+        if not is_public_path(self.path) or (os.path.isdir(path) and urlsplit(self.path).path != '/'):
+            self.send_error(404, 'File not found')
+            return None
+        return super().send_head()
+    
+    def requested_range(self, size, etag):
+        """解析 Range 头，返回 (起点, 终点)；没有或不支持时返回 None，返回完整内容"""
+        header = self.headers.get('Range', '').strip()
+        if not header.startswith('bytes=') or ',' in header:
+            return None
+        # If-Range 与当前版本不一致时，按规范返回完整的新内容
+        if_range = self.headers.get('If-Range')
+        if if_range and if_range.strip() != etag:
+            return None
+        
+        first, _, last = header[len('bytes='):].strip().partition('-')
+        try:
+            if first:
+                start = int(first)
+                end = min(int(last), size - 1) if last else size - 1
+            else:
+                start = max(size - int(last), 0) if int(last) > 0 else size
+                end = size - 1
+        except ValueError:
+            return None
+        return start, end
+    
+    def send_file(self, path, content_type, encoding=None, vary=False):
+        try:
+            entry = self.file_cache.get(path, encoding)
+        except OSError:
+            self.send_error(404, 'File not found')
+            return None
+        if entry is None:
+            # 超出缓存上限的大文件直接从磁盘发送
+            return super().send_file(path, content_type, encoding, vary)
+        
+        if self.etag_matches(entry.etag):
+            self.send_not_modified(entry.etag, vary)
+            return None
+        
+        body = entry.body
+        mtime = entry.mtime_ns / 1e9
+        requested = self.requested_range(len(body), entry.etag)
+        if requested is None:
+            self.send_response(200)
+            self.send_header('Accept-Ranges', 'bytes')
+            self.send_file_headers(content_type, encoding, vary, len(body), mtime, entry.etag)
+            self.end_headers()
+            return io.BytesIO(body)
+        
+        start, end = requested
+        if start >= len(body) or start > end:
+            self.send_response(416)
+            self.send_header('Content-Range', f'bytes */{len(body)}')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return None
+        
+        self.send_response(206)
+        self.send_header('Content-Range', f'bytes {start}-{end}/{len(body)}')
+        self.send_file_headers(content_type, encoding, vary, end - start + 1, mtime, entry.etag)
+        self.end_headers()
+        return io.BytesIO(body[start:end + 1])
+    
+    def log_message(self, format, *args):
+        # 并发请求的日志一次写出整行，避免交错
+        sys.stderr.write(f"[{self.log_date_time_string()}] {self.address_string()} {format % args}\n")
+
+class ProductionServer(http.server.ThreadingHTTPServer):
+    """每个连接一个线程，慢客户端不会阻塞其他访问者"""
+    
+    daemon_threads = True
+    allow_reuse_address = True
+    # 突发连接在内核队列中等待，而不是直接被拒绝
+    request_queue_size = 256
+
+def warm_job_index():
+    try:
+        index = get_job_index(DATA_DIR)
+        print(f"🔎 查询索引已建立: {len(index)} 个职位")
+    except (OSError, ValueError):
+        print(f"⚠️  职位数据尚未生成，/api/jobs 暂不可用")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='内推宝典网站服务器')
+    parser.add_argument('--production', action='store_true',
+                        help='生产模式: 多线程、内存缓存、Range 请求和 Cache-Control')
+    parser.add_argument('--host', default=None, help='监听地址，默认开发模式 localhost、生产模式 0.0.0.0')
+    parser.add_argument('--port', type=int, default=8000, help='监听端口，默认 8000')
+    return parser.parse_args()
+
 def main():
+    args = parse_args()
+    
     # 默认配置
-    PORT = 8000
-    HOST = 'localhost'
+    PORT = args.port
+    HOST = args.host or ('0.0.0.0' if args.production else 'localhost')
+    if args.production:
+        server_class, handler_class = ProductionServer, ProductionRequestHandler
+    else:
+        server_class, handler_class = socketserver.TCPServer, HTTPRequestHandler
     
     # 检查端口是否被占用
     original_port = PORT
     max_attempts = 10
     
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s] %(message)s')
+    if args.production:
+        # 启动时在后台建立查询索引，第一个查询不必等待
+        threading.Thread(target=warm_job_index, daemon=True).start()
+    # 爬虫发布新数据后自动重建索引，不需要重启服务器
+    get_index_holder(DATA_DIR).watch()
+    
     for attempt in range(max_attempts):
         try:
-            with socketserver.TCPServer((HOST, PORT), HTTPRequestHandler) as httpd:
-                print(f"🌐 内推宝典网站启动成功!")
+            with server_class((HOST, PORT), handler_class) as httpd:
+                print(f"🌐 内推宝典网站启动成功!{' (生产模式)' if args.production else ''}")
                 print(f"📍 访问地址: http://{HOST}:{PORT}")
                 print(f"📁 服务目录: {Path(__file__).parent}")
                 print(f"🔄 按 Ctrl+C 停止服务器")
                 
                 # 自动打开浏览器
-                try:
-                    webbrowser.open(f"http://{HOST}:{PORT}")
-                    print(f"🚀 浏览器已自动打开")
-                except:
-                    print(f"💡 请手动在浏览器中打开: http://{HOST}:{PORT}")
+                if not args.production:
+                    try:
+                        webbrowser.open(f"http://{HOST}:{PORT}")
+                        print(f"🚀 浏览器已自动打开")
+                    except:
+                        print(f"💡 请手动在浏览器中打开: http://{HOST}:{PORT}")
                 
                 print(f"\n{'='*50}")
                 print(f"🎯 使用说明:")
                 print(f"   1. 运行爬虫: python run_crawler.py")
                 print(f"   2. 定时爬虫: python run_crawler.py --mode schedule")
                 print(f"   3. 安装依赖: pip install -r requirements.txt")
+                print(f"   4. 生产模式: python start_server.py --production --port 80")
                 print(f"{'='*50}\n")
                 
                 # 启动服务器
                 httpd.serve_forever()
-                
+        
         except OSError as e:
             if "Address already in use" in str(e):
                 PORT += 1
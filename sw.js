@@ -5,7 +5,7 @@
 
 const CACHE_NAME = 'referral-jobs-v1.0.0';
 const STATIC_CACHE = 'static-v1.0.0';
-const DATA_CACHE = 'data-v1.0.0';
+const DATA_CACHE = 'data-v1.1.0';
 
 // 需要缓存的静态资源
 const STATIC_FILES = [
@@ -22,9 +22,8 @@ const STATIC_FILES = [
     'https://cdn.jsdelivr.net/npm/chart.js'
 ];
 
-// 需要缓存的数据文件
+// 需要缓存的数据文件；职位数据有分片时只缓存清单，没有分片时才缓存完整的 jobs.json
 const DATA_FILES = [
-    '/data/jobs.json',
     '/data/statistics.json'
 ];
 
@@ -42,7 +41,10 @@ self.addEventListener('install', event => {
             // 缓存数据文件
             caches.open(DATA_CACHE).then(cache => {
                 console.log('[SW] 缓存数据文件');
-                return cache.addAll(DATA_FILES.map(url => new Request(url, { credentials: 'same-origin' })));
+                return Promise.all([
+                    cache.addAll(DATA_FILES.map(url => new Request(url, { credentials: 'same-origin' }))),
+                    cacheJobData(cache)
+                ]);
             })
         ]).then(() => {
             console.log('[SW] 安装完成');
@@ -79,6 +81,11 @@ self.addEventListener('activate', event => {
 self.addEventListener('fetch', event => {
     const requestUrl = new URL(event.request.url);
     
+    // 查询接口的结果随条件变化，不经过缓存
+    if (requestUrl.pathname.startsWith('/api/')) {
+        return;
+    }
+    
     // 只处理同源请求和CDN资源
     if (requestUrl.origin === location.origin || isCDNResource(requestUrl.href)) {
         event.respondWith(handleRequest(event.request));
@@ -90,6 +97,11 @@ async function handleRequest(request) {
     const url = new URL(request.url);
     
     try {
+        // 带内容哈希的数据分片内容不会变化，命中缓存直接返回
+        if (isVersionedShard(url)) {
+            return await cacheVersioned(request);
+        }
+        
         // 对于数据文件，使用网络优先策略
         if (isDataFile(url.pathname)) {
             return await networkFirst(request);
@@ -175,6 +187,29 @@ async function networkFirst(request) {
     }
 }
 
+// 带版本的分片：缓存命中即返回，写入新版本时删除同一分片的旧版本
+async function cacheVersioned(request) {
+    const cache = await caches.open(DATA_CACHE);
+    const cachedResponse = await cache.match(request);
+    
+    if (cachedResponse) {
+        return cachedResponse;
+    }
+    
+    const networkResponse = await fetch(request);
+    
+    if (networkResponse && networkResponse.status === 200) {
+        const pathname = new URL(request.url).pathname;
+        const staleRequests = (await cache.keys()).filter(cached => 
+            new URL(cached.url).pathname === pathname
+        );
+        await Promise.all(staleRequests.map(cached => cache.delete(cached)));
+        await cache.put(request, networkResponse.clone());
+    }
+    
+    return networkResponse;
+}
+
 // 后台更新缓存
 async function updateCache(request) {
     try {
@@ -261,6 +296,10 @@ function isDataFile(pathname) {
     return pathname.startsWith('/data/') || pathname.endsWith('.json');
 }
 
+function isVersionedShard(url) {
+    return url.pathname.startsWith('/data/shards/') && url.searchParams.has('v');
+}
+
 function isStaticFile(pathname) {
     return pathname.endsWith('.css') || 
            pathname.endsWith('.js') || 
@@ -300,17 +339,26 @@ self.addEventListener('sync', event => {
     }
 });
 
+// 缓存分片清单，清单中哈希变化的分片在页面请求时重新下载；
+// 没有分片时缓存完整的职位数据
+async function cacheJobData(cache) {
+    const manifestResponse = await fetch('/data/shards/manifest.json');
+    if (manifestResponse.ok) {
+        await cache.put('/data/shards/manifest.json', manifestResponse);
+        return;
+    }
+    const jobsResponse = await fetch('/data/jobs.json');
+    if (jobsResponse.ok) {
+        await cache.put('/data/jobs.json', jobsResponse);
+    }
+}
+
 // 同步数据
 async function syncData() {
     try {
         console.log('[SW] 同步数据中...');
         
-        // 更新职位数据
-        const jobsResponse = await fetch('/data/jobs.json');
-        if (jobsResponse.ok) {
-            const cache = await caches.open(DATA_CACHE);
-            await cache.put('/data/jobs.json', jobsResponse);
-        }
+        await cacheJobData(await caches.open(DATA_CACHE));
         
         // 更新统计数据
         const statsResponse = await fetch('/data/statistics.json');